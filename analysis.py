@@ -0,0 +1,142 @@
+import gc
+import os
+import queue
+import tempfile
+import threading
+
+import semantic
+from gramma import iter_ast_chunks
+from incremental import IncrementalParser
+
+# GUI 的后台分析：解析、生成 AST 文本、渲染 AST 图都放在工作线程上做，
+# Tk 主线程只负责用 root.after 轮询 results 队列并把结果分批放进界面。
+#
+# 每次 submit()/cancel() 都会让之前的任务作废。解析过程中每隔
+# check_every 个记号检查一次，过期的任务直接抛出 Cancelled 中止。
+# 解析走 IncrementalParser，编辑后只重新解析改动过的语句。
+#
+# 任务执行期间关掉自动的分代回收：一万行的文件建树时，完整回收要扫描整棵正在长大的树，每次几十到几百毫秒，
+# 回收期间一直占着 GIL，主线程的事件循环跟着卡住。AST 节点之间没有环，不需要的靠引用计数就能释放；
+# 任务结束后把留下来的对象（缓存里的树）freeze 掉，之后的完整回收不再扫描它们。
+
+
+class Cancelled(Exception):
+    pass
+
+
+class AnalysisWorker:
+    def __init__(self, cache, render=None, chunk_size=16384, check_every=512, progress_every=20000):
+        self.cache = cache
+        self.render = render
+        self.chunk_size = chunk_size
+        self.check_every = check_every
+        self.progress_every = progress_every
+        self.generation = 0
+        self.incremental = IncrementalParser()
+        self.results = queue.Queue()
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='analysis', daemon=True)
+        self._thread.start()
+
+    def submit(self, kind, text, **options):
+        # kind: 'analyze' | 'show' | 'save'
+        self.generation += 1
+        self._jobs.put((self.generation, kind, text, options))
+        return self.generation
+
+    def cancel(self):
+        self.generation += 1
+
+    def stale(self, generation):
+        return generation != self.generation
+
+    def progress(self, generation, message):
+        self.results.put(('progress', generation, None, message))
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            # 积压的任务只做最新的一个
+            while not self._jobs.empty():
+                job = self._jobs.get_nowait()
+            generation, kind, text, options = job
+            if self.stale(generation):
+                continue
+            gc.disable()
+            try:
+                result = ('done', generation, kind, getattr(self, '_' + kind)(generation, text, **options))
+            except Cancelled:
+                continue
+            except Exception as e:
+                result = ('error', generation, kind, e)
+            finally:
+                gc.freeze()
+                gc.enable()
+            self.results.put(result)
+
+    def _check(self, generation):
+        if self.stale(generation):
+            raise Cancelled
+
+    def _parse(self, generation, text):
+        checks = 0
+
+        def check():
+            nonlocal checks
+            checks += 1
+            self._check(generation)
+            if checks % (self.progress_every // self.check_every) == 0:
+                self.progress(generation, f"正在解析… 已读入约 {checks * self.check_every} 个记号")
+
+        return self.incremental.parse(text, check=check, check_every=self.check_every)
+
+    def _entry(self, generation, text):
+        self.progress(generation, "正在解析…")
+        entry = self.cache.entry(text, parse=lambda t: self._parse(generation, t))
+        self._check(generation)
+        return entry
+
+    def _analyze(self, generation, text):
+        entry = self._entry(generation, text)
+        if not entry.tree:
+            return entry, []
+        if entry.semantics is None:
+            self.progress(generation, "正在做语义分析…")
+            entry.semantics = semantic.analyze(entry.tree)
+            self._check(generation)
+        self.progress(generation, "正在生成AST文本…")
+        chunks = []
+        for chunk in iter_ast_chunks(entry.tree, self.chunk_size):
+            chunks.append(chunk)
+            if len(chunks) % 16 == 0:
+                self._check(generation)
+        return entry, chunks
+
+    def _image(self, generation, text):
+        entry = self._entry(generation, text)
+        if not entry.tree:
+            return entry, None
+        if 'png' not in entry.images:
+            self.progress(generation, "正在渲染AST图…")
+        image = self.render(entry)
+        self._check(generation)
+        return entry, image
+
+    def _show(self, generation, text):
+        entry, image = self._image(generation, text)
+        if image is None:
+            return None
+        # 同一内容的图片只写盘一次
+        file_path = os.path.join(tempfile.gettempdir(), f"ast-{entry.key.hex()}.png")
+        if not os.path.exists(file_path):
+            with open(file_path, 'wb') as f:
+                f.write(image)
+        return file_path
+
+    def _save(self, generation, text, path):
+        entry, image = self._image(generation, text)
+        if image is None:
+            return None
+        with open(path, 'wb') as f:
+            f.write(image)
+        return path
@@ -0,0 +1,174 @@
+import hashlib
+import os
+import subprocess
+import tempfile
+from collections import OrderedDict, deque, namedtuple
+
+import binast
+
+# AST 图：DOT 文本按块直接写进文件，不在内存里逐个节点地构造 graphviz.Digraph；
+# 大树按选项折叠，dot 只需要布局有限个节点，渲染出的图片按 AST 的哈希和选项缓存。
+#
+#   write_dot(tree, f.write)                                  # 流式写出 DOT 文本
+#   image = render(tree, 'png', GraphOptions(max_depth=6), cache=RenderCache())
+#
+# 节点按层序编号为 n0、n1 ...，同一棵树、同样的选项得到的 DOT 文本完全相同。
+# 折叠规则（GraphOptions）：
+#   collapse_chains  没有值、只有一个子节点的节点与子节点合成一个框，标签为 A → B → C
+#   max_depth        超过这一层（根为第 0 层）的子树合成一个虚线的摘要节点，写明折叠了多少个节点
+#   max_nodes        按层序画满这么多个框之后，其余的子树同样折叠；摘要节点不计入，每个框至多带一个
+# 两项上限为 None 时不限制。
+
+GraphOptions = namedtuple('GraphOptions', ['max_depth', 'max_nodes', 'collapse_chains'],
+                          defaults=(None, 2000, True))
+
+
+def _escape(label):
+    return label.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label(node):
+    return node.node_type if node.value is None else f"{node.node_type}\n{node.value}"
+
+
+def _chain(node, collapse):
+    # 返回 (标签, 链上最后一个节点)
+    if not collapse:
+        return _label(node), node
+    types = []
+    while node.value is None:
+        children = [c for c in node.children if c is not None]
+        if len(children) != 1:
+            break
+        types.append(node.node_type)
+        node = children[0]
+    types.append(_label(node))
+    return ' → '.join(types), node
+
+
+def _count(nodes):
+    n = 0
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            n += 1
+            stack.extend(node.children)
+    return n
+
+
+def iter_dot_lines(tree, options=None):
+    options = options or GraphOptions()
+    max_depth, max_nodes, collapse = options
+    yield 'digraph AST {'
+    yield '  ordering=out;'
+    if tree is None:
+        yield '}'
+        return
+    label, last = _chain(tree, collapse)
+    yield f'  n0 [label="{_escape(label)}"];'
+    boxes = 1
+    queue = deque([(last, 'n0', 0)])
+    while queue:
+        node, node_id, depth = queue.popleft()
+        children = [c for c in node.children if c is not None]
+        if max_depth is not None and depth >= max_depth:
+            rest = children
+        else:
+            rest = []
+            for i, child in enumerate(children):
+                if max_nodes is not None and boxes >= max_nodes:
+                    rest = children[i:]
+                    break
+                child_id = f'n{boxes}'
+                boxes += 1
+                label, last = _chain(child, collapse)
+                yield f'  {child_id} [label="{_escape(label)}"];'
+                yield f'  {node_id} -> {child_id};'
+                queue.append((last, child_id, depth + 1))
+        if rest:
+            summary_id = f'{node_id}_more'
+            subtrees = f"{len(rest)} 棵子树，" if len(rest) > 1 else ""
+            yield f'  {summary_id} [label="… {subtrees}折叠了 {_count(rest)} 个节点", style=dashed];'
+            yield f'  {node_id} -> {summary_id} [style=dashed];'
+    yield '}'
+
+
+def iter_dot_chunks(tree, options=None, chunk_size=65536):
+    lines = []
+    size = 0
+    for line in iter_dot_lines(tree, options):
+        lines.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            lines.append("")
+            yield "\n".join(lines)
+            lines = []
+            size = 0
+    if lines:
+        lines.append("")
+        yield "\n".join(lines)
+
+
+def write_dot(tree, write, options=None, chunk_size=65536):
+    # write 为接收字符串的函数，例如 file.write
+    for chunk in iter_dot_chunks(tree, options, chunk_size):
+        write(chunk)
+
+
+def ast_digest(tree):
+    # 按结构而不是源码文本：只改了空白、换行的代码得到同一张图
+    return hashlib.blake2b(binast.encode(tree), digest_size=16).digest()
+
+
+class RenderCache:
+    # 渲染结果的 LRU，键为 (AST 哈希, 选项, 格式, 引擎)
+    def __init__(self, maxsize=16):
+        self._entries = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        image = self._entries.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def put(self, key, image):
+        self._entries[key] = image
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return f"渲染缓存命中 {self.hits} / 未命中 {self.misses}"
+
+
+def render(tree, format='png', options=None, cache=None, engine='dot'):
+    # DOT 文本先流式写进临时文件，再交给 dot 子进程；返回渲染出的字节
+    options = options or GraphOptions()
+    if cache is not None:
+        key = (ast_digest(tree), options, format, engine)
+        image = cache.get(key)
+        if image is not None:
+            return image
+    fd, path = tempfile.mkstemp(suffix='.gv')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            write_dot(tree, f.write, options)
+        image = subprocess.run([engine, f'-T{format}', path], check=True, capture_output=True).stdout
+    finally:
+        os.unlink(path)
+    if cache is not None:
+        cache.put(key, image)
+    return image
@@ -0,0 +1,192 @@
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import define
+import gramma
+import streamlex
+from disk_cache import DiskCache
+
+# 批量语法检查：把大量源文件分给进程池解析，每个文件输出一行 JSON。
+#
+#   python batch.py src/ more.c -j 8 --output results.jsonl
+#
+# 调度：按文件大小从大到小排序，大文件单独成块，小文件凑成总字节数接近
+# chunk_bytes 的块，避免一个进程拿到一堆大文件、其它进程早早空闲。
+#
+# --cache DIR：解析结果按源码哈希和 --tables 存进磁盘缓存（disk_cache），没改动的文件下次直接读回，
+# 结果多一个 cached 字段；所有 worker 共用同一个目录。--stream 模式不保留 AST，不使用缓存。
+#
+# 一个文件出了任何异常（读不了、解码失败、解析器内部出错）都只记为这个文件失败，同一块里的其它文件照常检查。
+
+_tables = 'parsetab'
+_stream = False
+_cache = None
+
+
+def _init_worker(tables, stream=False, cache_dir=None, cache_bytes=None):
+    # 每个工作进程只构建一次 lexer / parser
+    global _tables, _stream, _cache
+    _tables = tables
+    _stream = stream
+    _cache = DiskCache(cache_dir, cache_bytes, tables=tables) if cache_dir and not stream else None
+    define.get_lexer()
+    gramma.get_parser(tables)
+    if stream:
+        streamlex.StreamLexer()
+
+
+def check_file(path, tables=None, stream=None):
+    lexer = define.get_lexer()
+    parser = gramma.get_parser(tables or _tables)
+    stream = _stream if stream is None else stream
+    start = time.perf_counter()
+    record = {'file': path}
+    try:
+        # p_error / t_error 直接 print，这里把它们收集成错误列表
+        out = io.StringIO()
+        if stream:
+            # 逐条语句解析、不保留 AST，内存占用与文件大小无关
+            with contextlib.redirect_stdout(out):
+                statements, failed = streamlex.check_file(path, parser)
+            errors = out.getvalue().splitlines()
+        else:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            key = _cache.key(text) if _cache is not None else None
+            hit = _cache.get(key) if key is not None else None
+            if hit is not None:
+                # 命中时只读二进制 AST 的根节点，不还原整棵树
+                view, errors = hit
+                statements = view.child_count[0] if len(view) else 0
+                failed = not len(view)
+            else:
+                with contextlib.redirect_stdout(out):
+                    lexer.lineno = 1
+                    tree = parser.parse(text, lexer=lexer)
+                errors = out.getvalue().splitlines()
+                if key is not None:
+                    _cache.put(key, tree, errors)
+                statements = len(tree.children) if tree is not None else 0
+                failed = tree is None
+            if key is not None:
+                record['cached'] = hit is not None
+        record['ok'] = not failed and not errors
+        record['errors'] = errors
+        record['statements'] = statements
+    except Exception as e:
+        record['ok'] = False
+        record['errors'] = [str(e) if isinstance(e, (OSError, ValueError)) else f"{type(e).__name__}: {e}"]
+        record['statements'] = 0
+    record['seconds'] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def check_chunk(paths):
+    return [check_file(path) for path in paths]
+
+
+def collect_files(paths, pattern='*'):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if fnmatch.fnmatch(name, pattern):
+                        files.append(os.path.join(dirpath, name))
+        else:
+            files.append(path)
+    return files
+
+
+def make_chunks(files, jobs, chunk_bytes=None, max_files=256):
+    sized = []
+    for path in files:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        sized.append((size, path))
+    sized.sort(reverse=True)
+    total = sum(size for size, _ in sized)
+    if chunk_bytes is None:
+        # 每个进程大约分到 8 块，块太大负载不均，太小进程间通信开销变大
+        chunk_bytes = max(total // (jobs * 8), 1)
+
+    chunks = []
+    current = []
+    current_bytes = 0
+    for size, path in sized:
+        if current and (current_bytes + size > chunk_bytes or len(current) >= max_files):
+            chunks.append(current)
+            current = []
+            current_bytes = 0
+        current.append(path)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def run(files, jobs=None, tables='parsetab', chunk_bytes=None, stream=False, cache_dir=None, cache_bytes=256 << 20):
+    # 按完成顺序逐个产出每个文件的结果
+    jobs = jobs or os.cpu_count() or 1
+    initargs = (tables, stream, cache_dir, cache_bytes)
+    if jobs == 1:
+        _init_worker(*initargs)
+        for path in files:
+            yield check_file(path, tables, stream)
+        return
+    chunks = make_chunks(files, jobs, chunk_bytes)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        futures = [pool.submit(check_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="批量语法检查，每个文件输出一行 JSON")
+    ap.add_argument('paths', nargs='+', help='源文件或目录')
+    ap.add_argument('-j', '--jobs', type=int, default=None, help='进程数，默认为 CPU 核数')
+    ap.add_argument('--pattern', default='*', help='目录中文件名的匹配模式，默认 *')
+    ap.add_argument('--tables', choices=['parsetab', 'binary', 'pratt'], default='parsetab')
+    ap.add_argument('--chunk-bytes', type=int, default=None)
+    ap.add_argument('--stream', action='store_true', help='流式读取、逐条语句检查，适合特别大的文件')
+    ap.add_argument('--cache', metavar='DIR', help='解析结果的磁盘缓存目录，没改动的文件不再解析')
+    ap.add_argument('--cache-size', type=int, default=256, metavar='MB', help='磁盘缓存的大小上限，默认 256 MB')
+    ap.add_argument('-o', '--output', help='结果写入该文件，默认标准输出')
+    args = ap.parse_args(argv)
+
+    files = collect_files(args.paths, args.pattern)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    start = time.perf_counter()
+    failed = 0
+    cached = 0
+    cache_bytes = args.cache_size << 20
+    try:
+        for record in run(files, args.jobs, args.tables, args.chunk_bytes, args.stream, args.cache, cache_bytes):
+            failed += not record['ok']
+            cached += record.get('cached', False)
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{len(files)} 个文件，失败 {failed} 个，用时 {elapsed:.2f} s"
+          f"（{len(files) / elapsed if elapsed else 0:.1f} 文件/s）", file=sys.stderr)
+    if args.cache and not args.stream:
+        # worker 各自写入，最后在主进程里统一按大小上限淘汰一次
+        evicted = DiskCache(args.cache, cache_bytes).trim()
+        print(f"磁盘缓存命中 {cached} / 未命中 {len(files) - cached}，淘汰 {evicted}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
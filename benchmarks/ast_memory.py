@@ -0,0 +1,94 @@
+# AST 内存基准：同一棵树分别用
+#   dict   旧的带 __dict__ 的节点类
+#   slots  现在的 gramma.ASTNode
+#   compact.compact()  运算符折叠进父节点的 CompactNode
+#   compact.Arena      平行数组
+# 表示时所占字节数（tracemalloc 统计，节点上的值对象不计入）。
+#
+#   python benchmarks/ast_memory.py [--statements N]
+
+import argparse
+import tracemalloc
+
+from corpus import source
+
+import compact
+import define
+import gramma
+
+
+class DictNode:
+    def __init__(self, node_type, children=None, value=None):
+        self.node_type = node_type
+        self.children = children if children is not None else []
+        self.value = value
+
+
+def clone(tree, cls):
+    done = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node is None or id(node) in done:
+            continue
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((c, False) for c in node.children)
+            continue
+        children = [None if c is None else done[id(c)] for c in node.children]
+        value = clone(node.value, cls) if hasattr(node.value, 'node_type') else node.value
+        done[id(node)] = cls(node.node_type, children, value)
+    return done[id(tree)]
+
+
+def count(tree):
+    # 有些节点的 value 本身是一棵子树，一并计入
+    n = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            n += 1
+            stack.extend(node.children)
+            if hasattr(node.value, 'node_type'):
+                stack.append(node.value)
+    return n
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--statements', type=int, default=400)
+    args = ap.parse_args()
+
+    text = source(args.statements, seed=1)
+    tree = gramma.get_parser().parse(text, lexer=define.get_lexer())
+    nodes = count(tree)
+
+    rows = []
+    _, size = measure(lambda: clone(tree, DictNode))
+    rows.append(('dict', nodes, size))
+    _, size = measure(lambda: clone(tree, gramma.ASTNode))
+    rows.append(('slots', nodes, size))
+    small, size = measure(lambda: compact.compact(tree))
+    rows.append(('compact', count(small), size))
+    arena, size = measure(lambda: compact.Arena(tree))
+    rows.append(('arena', count(small), size))
+
+    print(f"source: {len(text.encode('utf-8'))} bytes, {nodes} AST nodes")
+    print(f"{'mode':<8} {'nodes':>7} {'bytes':>10} {'B/node':>8} {'B/src node':>11} {'x source':>9}")
+    for name, n, size in rows:
+        print(f"{name:<8} {n:>7} {size:>10} {size / n:>8.1f} {size / nodes:>11.1f} "
+              f"{size / len(text.encode('utf-8')):>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# AST 文本输出基准：旧的递归字符串拼接（ASTNode.__str__ / ui.print_ast）
+# 与 str()、gramma.write_ast（同一个分块写出器）的对比，并检查两者输出一致。每项取 --runs 次中最好的一次。
+#
+#   python benchmarks/ast_printer.py [--sizes 1000 4000 16000] [--runs N]
+
+import argparse
+import gc
+import io
+import sys
+import time
+
+from corpus import source
+
+import define
+import gramma
+
+
+def old_str(node, indent=0):
+    result = "  " * indent + f"{node.node_type}"
+    if node.value is not None:
+        result += f"\n{'  ' * (indent + 1)}Value: {node.value}"
+    for child in node.children:
+        result += "\n" + old_str(child, indent + 1)
+    return result
+
+
+def old_print_ast(node, indent=0):
+    result = ""
+    if node:
+        result += "  " * indent + f"{node.node_type}"
+        if node.value is not None:
+            result += f"\n{'  ' * (indent + 1)}Value: {node.value}"
+        for child in node.children:
+            result += "\n" + old_print_ast(child, indent + 1)
+    return result
+
+
+def nested(depth):
+    # 深度为 depth 的一元表达式链，用来观察递归版本的栈深度问题
+    node = gramma.ASTNode("PrimaryExpression", value="a")
+    for _ in range(depth):
+        node = gramma.ASTNode("UnaryExpression", [gramma.ASTNode("Operator", value="-"), node])
+    return node
+
+
+def write(tree):
+    out = io.StringIO()
+    gramma.write_ast(tree, out.write)
+    return out.getvalue()
+
+
+def timed(fn):
+    t = time.perf_counter()
+    try:
+        result = fn()
+    except RecursionError:
+        return None, time.perf_counter() - t
+    return result, time.perf_counter() - t
+
+
+def compare(fns, runs):
+    # 交替运行，各取最好的一次，返回 [(结果, 秒)]；计时期间与 timeit 一样关掉 gc
+    best = [(None, float('inf'))] * len(fns)
+    gc.disable()
+    try:
+        for _ in range(runs):
+            for i, fn in enumerate(fns):
+                result, elapsed = timed(fn)
+                if elapsed < best[i][1]:
+                    best[i] = (result, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--sizes', type=int, nargs='+', default=[1000, 4000, 16000])
+    ap.add_argument('--runs', type=int, default=5)
+    args = ap.parse_args()
+
+    lexer = define.get_lexer()
+    print(f"{'statements':>10} {'output':>10} {'old __str__':>12} {'old print_ast':>14} "
+          f"{'str()':>8} {'write_ast':>10}")
+    for n in args.sizes:
+        tree = gramma.get_parser().parse(source(n, seed=n), lexer=lexer)
+        (expected, t_old), (_, t_old_print), (text, t_str), (out, t_write) = compare(
+            [lambda: old_str(tree), lambda: old_print_ast(tree), lambda: str(tree), lambda: write(tree)], args.runs)
+        assert text == expected and out == expected + "\n"
+        print(f"{n:>10} {len(text):>10} {t_old:>11.3f}s {t_old_print:>13.3f}s "
+              f"{t_str:>7.3f}s {t_write:>9.3f}s")
+
+    # 递归上限以内的深链：旧版本每一层都要复制一遍整个子树的字符串
+    depth = sys.getrecursionlimit() - 100
+    tree = nested(depth)
+    _, t_old = timed(lambda: old_str(tree))
+    _, t_new = timed(lambda: str(tree))
+    print(f"unary chain depth {depth}: old {t_old:.3f}s, new {t_new:.3f}s")
+
+    depth = sys.getrecursionlimit() * 2
+    tree = nested(depth)
+    old, _ = timed(lambda: old_str(tree))
+    new, t_new = timed(lambda: str(tree))
+    print(f"unary chain depth {depth}: old {'RecursionError' if old is None else 'ok'}, "
+          f"new {'RecursionError' if new is None else 'ok'} ({t_new:.3f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# AST 图渲染的基准：不同大小的程序分别
+#   写出不折叠的完整 DOT 文本、写出按默认选项（2000 个框）折叠后的 DOT 文本、用 dot 渲染折叠后的图、
+#   以及渲染缓存命中时的耗时；
+# 并检查节点编号唯一、同一棵树两次输出的 DOT 完全相同、每个 AST 节点恰好出现在一个框或摘要里、
+# 框数不超过上限。没有安装 graphviz 的 dot 命令时只统计 DOT 文本。
+#
+#   python benchmarks/astgraph.py [--sizes 10,100,1000,10000] [--full-render N]
+
+import argparse
+import io
+import re
+import shutil
+import time
+
+from corpus import source
+
+import astgraph
+import define
+import gramma
+
+NODE = re.compile(r'^  (n\d+(?:_more)?) \[label="(.*)"(, style=dashed)?\];$')
+FOLDED = re.compile(r'折叠了 (\d+) 个节点')
+
+
+def count(tree):
+    n = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            n += 1
+            stack.extend(node.children)
+    return n
+
+
+def dot_text(tree, options):
+    out = io.StringIO()
+    astgraph.write_dot(tree, out.write, options)
+    return out.getvalue()
+
+
+def check(tree, text, options):
+    # 返回 (框数, 摘要节点数)
+    assert text == dot_text(tree, options), "DOT output is not deterministic"
+    ids = set()
+    boxes = summaries = represented = 0
+    for line in text.splitlines():
+        m = NODE.match(line)
+        if m is None:
+            continue
+        node_id, label, dashed = m.groups()
+        assert node_id not in ids, node_id
+        ids.add(node_id)
+        if dashed:
+            summaries += 1
+            represented += int(FOLDED.search(label).group(1))
+        else:
+            boxes += 1
+            represented += label.count(' → ') + 1
+    assert represented == count(tree), (represented, count(tree))
+    if options.max_nodes is not None:
+        assert boxes <= options.max_nodes
+    return boxes, summaries
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--sizes', default='10,100,1000,10000')
+    ap.add_argument('--full-render', type=int, default=3000, help='节点数不超过它的树也渲染不折叠的完整图')
+    args = ap.parse_args()
+
+    dot = shutil.which('dot')
+    if dot is None:
+        print("dot not found, rendering skipped; DOT text only")
+    parser = gramma.get_parser()
+    full = astgraph.GraphOptions(max_nodes=None, collapse_chains=False)
+    folded = astgraph.GraphOptions()
+    cache = astgraph.RenderCache()
+
+    print(f"{'statements':>10}{'nodes':>9}{'full DOT ms':>13}{'folded DOT ms':>15}{'boxes':>7}{'summaries':>11}"
+          f"{'render full s':>15}{'render folded s':>17}{'cached ms':>11}")
+    for statements in [int(n) for n in args.sizes.split(',')]:
+        tree = parser.parse(source(statements, seed=25), lexer=define.get_lexer())
+        nodes = count(tree)
+        text, full_time = timed(lambda: dot_text(tree, full))
+        assert check(tree, text, full) == (nodes, 0)
+        text, folded_time = timed(lambda: dot_text(tree, folded))
+        boxes, summaries = check(tree, text, folded)
+        check(tree, dot_text(tree, astgraph.GraphOptions(max_depth=2)), astgraph.GraphOptions(max_depth=2))
+
+        render_full = render_folded = cached = float('nan')
+        if dot is not None:
+            if nodes <= args.full_render:
+                _, render_full = timed(lambda: astgraph.render(tree, 'png', full))
+            image, render_folded = timed(lambda: astgraph.render(tree, 'png', folded, cache=cache))
+            again, cached = timed(lambda: astgraph.render(tree, 'png', folded, cache=cache))
+            assert again is image
+        print(f"{statements:>10}{nodes:>9}{full_time * 1e3:>13.1f}{folded_time * 1e3:>15.1f}{boxes:>7}{summaries:>11}"
+              f"{render_full:>15.2f}{render_folded:>17.2f}{cached * 1e3:>11.3f}")
+    if dot is not None:
+        print(cache.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# 批量编译基准：生成一批大小不均的源文件（含少量语法错误），
+# 分别用 1/2/4/8 个进程检查，要求各次结果一致，并比较吞吐量；
+# 再用磁盘缓存（--cache）比较冷启动、全部命中、改动 10% 的文件之后三种情况，结果也必须一致。
+#
+#   python benchmarks/batch.py [--files N] [--jobs 1,2,4,8] [--cache-jobs N]
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from corpus import source
+
+import batch
+from disk_cache import DiskCache
+
+
+def make_files(directory, count, seed=0):
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        # 大小呈长尾分布：多数文件很小，少数很大
+        statements = min(int(rng.paretovariate(1.2) * 20), 20000)
+        text = source(statements, seed=i)
+        if rng.random() < 0.05:
+            text += "int = ;\n"
+        path = os.path.join(directory, f"f{i:05d}.c")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        paths.append(path)
+    return paths
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--files', type=int, default=400)
+    ap.add_argument('--jobs', default='1,2,4,8')
+    ap.add_argument('--cache-jobs', type=int, default=4)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_files(directory, args.files)
+        total = sum(os.path.getsize(p) for p in paths)
+        files = batch.collect_files([directory], '*.c')
+        assert sorted(files) == sorted(paths)
+        print(f"{len(files)} files, {total / 1e6:.1f} MB, {os.cpu_count()} CPUs")
+
+        baseline = None
+        print(f"{'jobs':>4}  {'seconds':>8}  {'files/s':>8}  {'MB/s':>6}  {'failed':>6}")
+        for jobs in [int(j) for j in args.jobs.split(',')]:
+            start = time.perf_counter()
+            records = list(batch.run(files, jobs))
+            elapsed = time.perf_counter() - start
+            result = {r['file']: (r['ok'], r['errors']) for r in records}
+            assert len(result) == len(files)
+            if baseline is None:
+                baseline = result
+            assert result == baseline, f"jobs={jobs} 的结果与单进程不一致"
+            failed = sum(not ok for ok, _ in result.values())
+            print(f"{jobs:>4}  {elapsed:>8.2f}  {len(files) / elapsed:>8.1f}  "
+                  f"{total / 1e6 / elapsed:>6.2f}  {failed:>6}")
+
+        # 出错的文件必须带着错误信息返回
+        assert all(errors for ok, errors in baseline.values() if not ok)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cached_runs(files, paths, baseline, cache_dir, args.cache_jobs)
+
+
+def cached_runs(files, paths, baseline, cache_dir, jobs):
+    print(f"\ndisk cache, {jobs} jobs")
+    print(f"{'run':<16}{'seconds':>8}{'files/s':>9}{'hits':>7}{'misses':>8}")
+    rng = random.Random(1)
+    for label in ('cold', 'warm', '10% edited', 'warm'):
+        if label == '10% edited':
+            for path in rng.sample(paths, len(paths) // 10):
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write("int edited;\n")
+        start = time.perf_counter()
+        records = list(batch.run(files, jobs, cache_dir=cache_dir))
+        elapsed = time.perf_counter() - start
+        hits = sum(r['cached'] for r in records)
+        result = {r['file']: (r['ok'], r['errors']) for r in records}
+        if label != 'cold':
+            # 追加的是合法声明，结果不变，只是要重新解析
+            assert result == baseline, f"{label}: 缓存的结果与直接解析不一致"
+            expected = {'warm': len(files), '10% edited': len(files) - len(paths) // 10}[label]
+            assert hits == expected, (label, hits, expected)
+        else:
+            assert hits == 0 and result == baseline
+        print(f"{label:<16}{elapsed:>8.2f}{len(files) / elapsed:>9.1f}{hits:>7}{len(files) - hits:>8}")
+
+    cache = DiskCache(cache_dir)
+    count, size = cache.size()
+    print(f"{count} entries, {size / 1e6:.1f} MB on disk")
+    # 上限压到一半，最久没用到的先淘汰
+    cache.max_bytes = size // 2
+    assert cache.trim() > 0 and cache.size()[1] <= size // 2
+    # 换了签名（相当于改了文法）的缓存一项也不命中
+    other = DiskCache(cache_dir, signature=b'changed grammar')
+    with open(files[0], encoding='utf-8') as f:
+        assert other.get(other.key(f.read())) is None
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# 二进制 AST 编码（binast）与 pickle 的对比：
+#   编码后的字节数、编码和解码耗时，以及不还原节点、直接在 memoryview 上统计语句数的耗时；
+#   每种输入都检查解码出的树与原树逐节点相同（节点类型、值及其类型、子节点个数）。
+# 输入：声明为主的程序、表达式为主的程序，以及一条嵌套很深的表达式（pickle 会超出递归上限）。
+#
+#   python benchmarks/binast.py [--statements N] [--depth N] [--runs N]
+
+import argparse
+import contextlib
+import io
+import pickle
+import random
+import time
+
+from corpus import expression, source
+
+import binast
+import gramma
+
+
+def identical(a, b):
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if x is None or y is None:
+            assert x is y
+            continue
+        assert x.node_type == y.node_type and len(x.children) == len(y.children)
+        assert type(x.value) is type(y.value) and repr(x.value) == repr(y.value), (x.value, y.value)
+        stack.extend(zip(x.children, y.children))
+
+
+def timed(fn, runs):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def pickled(tree):
+    try:
+        return pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+    except RecursionError:
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--statements', type=int, default=5000)
+    ap.add_argument('--depth', type=int, default=5000)
+    ap.add_argument('--runs', type=int, default=5)
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = gramma.get_parser()
+    rng = random.Random(24)
+    inputs = {
+        'declarations': source(args.statements, seed=24),
+        'expressions': '\n'.join(f"x = {expression(rng, 6)};" for _ in range(args.statements)),
+        'deep': f"x = {'(' * args.depth}a{')' * args.depth} + {' || '.join(['b'] * args.depth)};",
+    }
+
+    print(f"{'input':<14}{'nodes':>8}{'format':>8}{'bytes':>10}{'encode ms':>11}{'decode ms':>11}{'count ms':>10}")
+    for name, text in inputs.items():
+        tree = parser.parse(text)
+        data = binast.encode(tree)
+        view = binast.BinaryAST(data)
+        identical(tree, binast.decode(data))
+        assert view.node_type(0) == 'Program' and view.child_count[0] == len(tree.children)
+        last = list(view.children(0))[-1]
+        identical(tree.children[-1], view.to_ast(last))
+
+        rows = [('binast', len(data),
+                 timed(lambda: binast.encode(tree), args.runs),
+                 timed(lambda: binast.decode(data), args.runs),
+                 timed(lambda: binast.BinaryAST(data).child_count[0], args.runs))]
+        blob = pickled(tree)
+        if blob is not None:
+            identical(tree, pickle.loads(blob))
+            rows.append(('pickle', len(blob),
+                         timed(lambda: pickled(tree), args.runs),
+                         timed(lambda: pickle.loads(blob), args.runs),
+                         timed(lambda: len(pickle.loads(blob).children), args.runs)))
+        for label, size, encode, decode, count in rows:
+            print(f"{name:<14}{len(view):>8}{label:>8}{size:>10}{encode * 1e3:>11.2f}{decode * 1e3:>11.2f}{count * 1e3:>10.3f}")
+        if blob is None:
+            print(f"{name:<14}{len(view):>8}{'pickle':>8}  RecursionError")
+    print("(count: statements in the program; binast reads the root of the memoryview, pickle loads the whole tree)")
+
+
+if __name__ == '__main__':
+    main()
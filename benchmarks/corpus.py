@@ -0,0 +1,368 @@
+# 基准脚本和 tests/ 共用的输入生成器、AST 比较工具和对照用的树遍历解释器
+
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import define  # noqa: E402  仓库根目录加入 sys.path 之后才能导入
+import evaluator  # noqa: E402
+from incremental import split_statements  # noqa: E402
+
+NAMES = ['a', 'b', 'c', 'd', 'x', 'y', 'i', 'n']
+BINARY = ['+', '-', '*', '/', '%', '<', '>', '<=', '>=', '==', '!=',
+          '&&', '||', '&', '|', '^', '<<', '>>']
+TYPES = ['int', 'char', 'float', 'double']
+PREFIX = ['-', '+', '!', '&', '++', '--', '*']
+
+# typed_program 用的变量：名字与 C 类型
+VARIABLES = [('a', 'int'), ('b', 'int'), ('c', 'char'), ('f', 'float'), ('g', 'double')]
+COUNTERS = [('i', 'int'), ('k', 'char'), ('h', 'float')]      # 只出现在 ++ 中，每条语句最多一次
+ARRAY = 'x'
+ARRAY_SIZE = 4
+INT_OPS = ['+', '-', '*', '&', '|', '^', '<', '>', '<=', '>=', '==', '!=', '&&', '||']
+FLOAT_OPS = ['+', '-', '*', '<', '>', '<=', '>=', '==', '!=', '&&', '||']
+
+
+def expression(rng, depth=3):
+    if depth == 0 or rng.random() < 0.25:
+        if rng.random() < 0.5:
+            return rng.choice(NAMES)
+        return str(rng.randint(0, 99))
+    kind = rng.random()
+    if kind < 0.6:
+        return f"{expression(rng, depth - 1)} {rng.choice(BINARY)} {expression(rng, depth - 1)}"
+    if kind < 0.7:
+        return f"({expression(rng, depth - 1)})"
+    if kind < 0.8:
+        return f"{rng.choice(['-', '!', '++', '--'])}{rng.choice(NAMES)}"
+    if kind < 0.9:
+        return f"{rng.choice(NAMES)}[{rng.randint(0, 9)}]"
+    return f"{expression(rng, depth - 1)} ? {expression(rng, depth - 1)} : {expression(rng, depth - 1)}"
+
+
+def statement(rng):
+    if rng.random() < 0.4:
+        items = []
+        for _ in range(rng.randint(1, 4)):
+            name = rng.choice(NAMES)
+            r = rng.random()
+            if r < 0.4:
+                items.append(name)
+            elif r < 0.6:
+                items.append(f"{name}[{rng.randint(1, 16)}]")
+            else:
+                items.append(f"{name} = {expression(rng, 2)}")
+        return f"{rng.choice(TYPES)} {', '.join(items)};"
+    return f"{rng.choice(NAMES)} = {expression(rng)};"
+
+
+def source(statements, seed=0):
+    rng = random.Random(seed)
+    return '\n'.join(statement(rng) for _ in range(statements)) + '\n'
+
+
+def edit(rng, text):
+    # 随机改写、插入或删除一条语句（增量解析用）
+    segments = split_statements(text)
+    start, end, _ = segments[rng.randrange(len(segments))]
+    kind = rng.random()
+    if kind < 0.6:
+        return text[:start] + '\n' + statement(rng) + text[end:]       # 改写一条语句
+    if kind < 0.8:
+        return text[:end] + '\n' + statement(rng) + text[end:]         # 插入一条语句
+    if len(segments) > 1:
+        return text[:start] + text[end:]                               # 删除一条语句
+    return text
+
+
+class Generator:
+    # typed=False 时只生成 int 变量、不含浮点、++ 和数组，树遍历解释器也能执行。
+    # 二元运算和 ?: 随机省略括号（概率 1 - parens），按 C 的优先级和结合性重新组合；
+    # 除数、移位、下标、-(..) !(..) 和浮点比较的括号总是保留，怎样重新组合都没有未定义行为、不会除以 0，
+    # 整数表达式的类型也总是整数
+    def __init__(self, rng, typed=True, names=None, parens=0.5):
+        self.rng = rng
+        self.typed = typed
+        self.names = names or [n for n, _ in VARIABLES]
+        self.parens = parens
+        self.incremented = False
+
+    def group(self, text):
+        return f"({text})" if self.rng.random() < self.parens else text
+
+    def leaf(self, floating):
+        rng = self.rng
+        r = rng.random()
+        if r < 0.35:
+            return str(rng.randint(0, 300))
+        if floating and r < 0.5:
+            return f"{rng.randint(0, 20)}.{rng.randint(0, 99):02d}"
+        if self.typed and r < 0.6:
+            return f"{ARRAY}[({self.int_expr(1)}) & {ARRAY_SIZE - 1}]"
+        if self.typed and not self.incremented and r < 0.7:
+            self.incremented = True
+            name, ctype = rng.choice(COUNTERS)
+            if ctype == 'float' and not floating:
+                name = 'i'
+            return rng.choice([f"{name}++", f"++{name}"])
+        if not self.typed:
+            return rng.choice(self.names)
+        return rng.choice([n for n, t in VARIABLES if floating or t in ('int', 'char')])
+
+    def int_expr(self, depth):
+        # 整数类型的表达式；浮点只出现在比较和逻辑运算的操作数里
+        rng = self.rng
+        if depth == 0 or rng.random() < 0.2:
+            return self.leaf(False)
+        r = rng.random()
+        left, right = self.int_expr(depth - 1), self.int_expr(depth - 1)
+        if r < 0.1:
+            return self.group(f"{left} {rng.choice(['/', '%'])} ((({right}) & 255) | 1)")
+        if r < 0.2:
+            # 后面的 + - * / % 比移位结合得紧，会并进移位位数，所以整个移位总是加括号
+            return f"({left} {rng.choice(['<<', '>>'])} (({right}) & 15))"
+        if self.typed and r < 0.3:
+            return f"(({self.float_expr(depth - 1)}) {rng.choice(['<', '>', '==', '!=', '&&', '||'])} {right})"
+        if r < 0.4:
+            return self.group(f"{left} ? {right} : {self.int_expr(depth - 1)}")
+        if r < 0.5:
+            return f"{rng.choice(['-', '!'])}({left})"
+        return self.group(f"{left} {rng.choice(INT_OPS)} {right}")
+
+    def float_expr(self, depth):
+        rng = self.rng
+        if depth == 0 or rng.random() < 0.2:
+            return self.leaf(True)
+        r = rng.random()
+        left, right = self.float_expr(depth - 1), self.float_expr(depth - 1)
+        if r < 0.15:
+            # 除数不会是 0；right 写了两遍，其中的 ++ 会变成未定义行为，换成常数
+            if '++' in right:
+                right = str(rng.randint(1, 9))
+            return self.group(f"{left} / ((({right}) * ({right})) + 1)")
+        if r < 0.25:
+            return self.group(f"{self.int_expr(depth - 1)} ? {left} : {right}")
+        if r < 0.35:
+            return f"-({left})"
+        return self.group(f"{left} {rng.choice(FLOAT_OPS)} {right}")
+
+    def statement(self):
+        rng = self.rng
+        self.incremented = False
+        if rng.random() < 0.15:
+            return f"{ARRAY}[{rng.randrange(ARRAY_SIZE)}] = {self.int_expr(3)};"
+        name, ctype = rng.choice(VARIABLES)
+        expr = self.float_expr(3) if ctype in ('float', 'double') else self.int_expr(3)
+        return f"{name} = {expr};"
+
+
+class SyntaxGenerator:
+    # 只管语法、不管语义的程序（Pratt 与 LALR 对照用）：覆盖 gramma 的全部表达式写法，
+    # 包括后缀、成员访问、函数调用、字符串、浮点和 ?: 的逗号写法
+    def __init__(self, rng):
+        self.rng = rng
+
+    def primary(self):
+        rng = self.rng
+        r = rng.random()
+        if r < 0.45:
+            return rng.choice(NAMES)
+        if r < 0.75:
+            return str(rng.randint(0, 99))
+        if r < 0.85:
+            return f"{rng.randint(0, 9)}.{rng.randint(0, 9)}"
+        if r < 0.95:
+            return '"s"'
+        return 'float'
+
+    def postfix(self, depth):
+        rng = self.rng
+        node = self.primary() if depth == 0 or rng.random() < 0.8 else f"({self.expr(depth - 1)})"
+        while rng.random() < 0.2:
+            node += rng.choice(['++', '--', '()', f'[{self.expr(max(depth - 1, 0))}]', '.m', '->m'])
+        return node
+
+    def unary(self, depth):
+        rng = self.rng
+        prefix = ''
+        while rng.random() < 0.15:
+            prefix += rng.choice(PREFIX[:-1]) + rng.choice(['', ' '])
+        return prefix + self.postfix(depth)
+
+    def expr(self, depth):
+        rng = self.rng
+        if depth == 0 or rng.random() < 0.2:
+            return self.unary(depth)
+        r = rng.random()
+        if r < 0.2:
+            return f"{self.expr(depth - 1)} ? {self.expr(depth - 1)} {rng.choice([':', ':', ','])} {self.expr(depth - 1)}"
+        return f"{self.expr(depth - 1)} {rng.choice(BINARY)} {self.expr(depth - 1)}"
+
+    def item(self):
+        rng = self.rng
+        name = rng.choice(NAMES)
+        if rng.random() < 0.3:
+            name += f"[{rng.randint(1, 9)}]"
+        if rng.random() < 0.7:
+            name += f" = {self.expr(rng.randint(0, 4))}"
+        return name
+
+    def statement(self):
+        rng = self.rng
+        if rng.random() < 0.4:
+            items = ', '.join(self.item() for _ in range(rng.randint(1, 3)))
+            return f"{rng.choice(TYPES)} {items};"
+        return f"{self.item()};"
+
+    def program(self, statements):
+        return '\n'.join(self.statement() for _ in range(statements))
+
+# 手写的不加括号的表达式，按 C 的优先级和结合性求值，evaluator 和各个后端都拿它们与 gcc 对照；
+# 第二项是交给 gcc 的写法（?: 的逗号写法 C 里没有），None 表示相同
+C_CASES = [
+    ("a = 10; b = 20; c = a < 40 ? a + b, a - b;", "a = 10; b = 20; c = a < 40 ? a + b : a - b;"),
+    ("a = 0; b = 0; c = 1; i = a && b || c; k = c || b && a;", None),
+    ("i = 1 - 2 < 3 == 4; k = 1 < 2 ? 5 : 6;", None),
+    ("i = 1 ? 2 : 0 ? 3 : 4; k = 0 ? 2 : 1 ? 3 : 4; a = 1 ? 0 ? 7 : 8 : 9;", None),
+    ("i = 10 - 3 - 2; k = 100 / 10 / 5; a = 7 % 4 * 3; b = 2 * 7 % 4;", None),
+    ("a = 1 << 2 + 1; b = 1 | 6 ^ 3 & 5; i = a == 8 != b < 3; k = 64 >> 1 >> 2;", None),
+    ("a = 5; b = -a * 2 + !a - 3; g = 1 + 2.5 * 2 - 1 / 2; f = 7 / 2 * 2.0;", None),
+    ("a = 5; f = a > 3 ? 1.5 : 2; g = a < 3 ? 1 : 2.5; h = a > 3 ? 7 : 2.5;", None),
+    ("x[1] = 2; a = x[1] * 3 + x[0 + 1] << 1; b = x[1]++ + 2 * 3 > 7 && a;", None),
+    ("a = 2 + 3 ? 0 ? 4 : 5 : 6 || 7; b = a - 1 ? a * 2 : a + 1 ? 8 : 9; c = a & 1 == 1;", None),
+]
+
+
+def case_programs():
+    # (程序, 交给 gcc 的程序)：每条前面补上 typed_program 的全部变量的声明
+    decls = [f"{t} {n} = 1;" for n, t in VARIABLES + COUNTERS] + [f"int {ARRAY}[{ARRAY_SIZE}] = 0;"]
+    programs = ['\n'.join(decls + [text]) for text, _ in C_CASES]
+    c_programs = ['\n'.join(decls + [c_text or text]) for text, c_text in C_CASES]
+    return programs, c_programs
+
+
+def typed_program(rng, statements=6):
+    # 带类型的程序：先声明全部变量，再做几条赋值，不含未定义行为，可以直接交给 C 编译器
+    gen = Generator(rng)
+    decls = [f"{t} {n} = {rng.randint(-50, 300)};" for n, t in VARIABLES + COUNTERS]
+    decls.append(f"int {ARRAY}[{ARRAY_SIZE}] = {rng.randint(0, 9)};")
+    return '\n'.join(decls + [gen.statement() for _ in range(statements)])
+
+
+def walk(node, env):
+    # 对照组：每次求值都按 node_type 分派的树遍历解释器，只支持整数运算
+    kind = node.node_type
+    if kind == 'PrimaryExpression':
+        v = node.value
+        return env[v] if isinstance(v, str) else v
+    if kind == 'UnaryExpression':
+        v = walk(node.children[1], env)
+        return evaluator.wrap_int(-v) if node.children[0].value == '-' else int(not v)
+    if kind == 'ConditionalExpression':
+        return walk(node.children[2] if walk(node.children[0], env) else node.children[3], env)
+    if kind == 'ArrayAccess':
+        return env[node.children[0].value][walk(node.children[1], env)]
+    op = node.children[1].value
+    a = walk(node.children[0], env)
+    if op == '&&':
+        return int(bool(a) and bool(walk(node.children[2], env)))
+    if op == '||':
+        return int(bool(a) or bool(walk(node.children[2], env)))
+    b = walk(node.children[2], env)
+    if op in ('/', '%'):
+        return evaluator.c_div(a, b) if op == '/' else evaluator.c_mod(a, b)
+    if op in ('<<', '>>'):
+        return evaluator.c_shl(a, b) if op == '<<' else evaluator.c_shr(a, b)
+    return evaluator.wrap_int({
+        '+': a + b, '-': a - b, '*': a * b, '&': a & b, '|': a | b, '^': a ^ b,
+        '<': a < b, '>': a > b, '<=': a <= b, '>=': a >= b, '==': a == b, '!=': a != b,
+    }[op])
+
+
+def walk_program(tree):
+    # 语句只能是 int 变量、int 数组的带初值声明，以及给数组元素赋值
+    env = {}
+    for stmt in tree.children:
+        if stmt.node_type == 'ArrayDeclarationWithoutTypeWithAssignment':
+            name, index, value = stmt.children
+            env[name.value][index.value] = evaluator.wrap_int(walk(value, env))
+            continue
+        for item in (stmt.children[1].children if stmt.children[1].node_type == 'DeclarationList'
+                     else [stmt.children[1]]):
+            value = evaluator.wrap_int(walk(item.children[-1], env))
+            if item.node_type == 'ArrayDeclarationWithAssignment':
+                env[item.children[0].value] = [value] * item.children[1].value
+            else:
+                env[item.children[0].value] = value
+    return env
+
+
+def int_program(rng, statements, inputs=False):
+    # 只有 int 的程序，三种方式都能执行；inputs 为真时变量的初值从数组 in[] 里读出来，
+    # 优化时当作未知数，不会整个程序都被常量折叠掉
+    names = ['a', 'b', 'c', 'd']
+    if inputs:
+        lines = [f"int in[{len(names)}] = {rng.randint(0, 99)};"]
+        lines += [f"in[{i}] = {rng.randint(-99, 99)};" for i in range(1, len(names))]
+        lines += [f"int {n} = in[{i}];" for i, n in enumerate(names)]
+    else:
+        lines = [f"int {n} = {rng.randint(0, 99)};" for n in names]
+    for _ in range(statements):
+        lines.append(f"int v{len(lines)} = {Generator(rng, typed=False, names=names).int_expr(3)};")
+    return '\n'.join(lines)
+
+
+def shape(node):
+    # 把 AST 转成可直接比较的嵌套列表（显式栈，不受递归深度限制）
+    root = []
+    stack = [(node, root)]
+    while stack:
+        n, sink = stack.pop()
+        if n is None:
+            sink.append(None)
+            continue
+        value = shape(n.value) if hasattr(n.value, 'node_type') else n.value
+        children = []
+        sink.append([n.node_type, value, children])
+        for child in reversed(n.children):
+            stack.append((child, children))
+    return root[0]
+
+
+def tokens(text):
+    lexer = define.get_lexer().clone()
+    lexer.input(text)
+    return list(iter(lexer.token, None))
+
+
+def replay(parser, toks):
+    # 从事先切好的 token 列表解析，计时只包括解析本身
+    it = iter(toks)
+    return parser.parse(lexer=define.get_lexer(), tokenfunc=lambda: next(it, None))
+
+
+def count_reductions(parser, text):
+    # 给 ply 的每条产生式的规则函数套一层计数，返回解析 text 时的归约次数
+    count = 0
+    saved = [p.callable for p in parser.productions]
+
+    def counted(fn):
+        def reduce(p):
+            nonlocal count
+            count += 1
+            fn(p)
+        return reduce
+
+    for p in parser.productions:
+        if p.callable:
+            p.callable = counted(p.callable)
+    try:
+        parser.parse(text, lexer=define.get_lexer())
+    finally:
+        for p, fn in zip(parser.productions, saved):
+            p.callable = fn
+    return count
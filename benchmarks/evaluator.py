@@ -0,0 +1,134 @@
+# 表达式求值检查与基准：
+#   1. 下面几条手写的不加括号的表达式，以及随机生成的带类型的程序（随机省略括号，按 C 的优先级和结合性组合），
+#      用 gcc 编译运行，逐个变量比较结果（没有 gcc 时跳过）；
+#   2. 比较每秒求值次数：编译一次反复执行 / 每次重新编译 / 逐节点分派的树遍历解释器。
+#
+#   python benchmarks/evaluator.py [--programs N] [--runs N]
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+from corpus import (ARRAY, ARRAY_SIZE, C_CASES, COUNTERS, VARIABLES, case_programs, int_program, source,
+                    typed_program, walk_program)
+
+import evaluator
+import gramma
+
+FORMATS = {'int': '%d', 'char': '%d', 'float': '%.9g', 'double': '%.17g'}
+
+
+def c_function(index, text):
+    prints = [f'    printf("{index} {n}={FORMATS[t]}\\n", {"(double)" if t == "float" else ""}{n});'
+              for n, t in VARIABLES + COUNTERS]
+    prints += [f'    printf("{index} {ARRAY}{k}=%d\\n", {ARRAY}[{k}]);' for k in range(ARRAY_SIZE)]
+    # int x[4] = 5; 在 C 里写不出来，这里展开成逐个赋值
+    body = []
+    for line in text.split('\n'):
+        if line.startswith(f"int {ARRAY}["):
+            value = line.split('=')[1].strip(' ;')
+            line = f"int {ARRAY}[{ARRAY_SIZE}]; " + ' '.join(f"{ARRAY}[{k}] = {value};" for k in range(ARRAY_SIZE))
+        body.append('    ' + line)
+    return f"static void t{index}(void) {{\n" + '\n'.join(body + prints) + "\n}\n"
+
+
+def expected_output(index, values):
+    lines = []
+    for n, t in VARIABLES + COUNTERS:
+        v = values[n]
+        lines.append(f"{index} {n}={v if t in ('int', 'char') else format(v, '.9g' if t == 'float' else '.17g')}")
+    lines += [f"{index} {ARRAY}{k}={v}" for k, v in enumerate(values[ARRAY])]
+    return lines
+
+
+def normalize(line):
+    return line.replace('-nan', 'nan')
+
+
+def check_against_gcc(programs, parser, c_programs=None):
+    gcc = shutil.which('gcc') or shutil.which('cc')
+    if gcc is None:
+        print("no C compiler found, skipping the gcc cross-check")
+        return
+    expected = []
+    functions = []
+    for index, text in enumerate(programs):
+        compiled = evaluator.Program(parser.parse(text))
+        _, storage = compiled.run()
+        values = compiled.values(storage)
+        expected += expected_output(index, values)
+        functions.append(c_function(index, c_programs[index] if c_programs else text))
+    calls = ''.join(f"    t{i}();\n" for i in range(len(programs)))
+    code = "#include <stdio.h>\n\n" + '\n'.join(functions) + "\nint main(void) {\n" + calls + "    return 0;\n}\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'check.c')
+        exe = os.path.join(tmp, 'check')
+        with open(path, 'w') as f:
+            f.write(code)
+        subprocess.run([gcc, '-O0', '-fwrapv', '-ffp-contract=off', '-o', exe, path], check=True)
+        got = subprocess.run([exe], check=True, capture_output=True, text=True).stdout.splitlines()
+    mismatches = [(e, g) for e, g in zip(expected, got) if normalize(e) != normalize(g)]
+    for e, g in mismatches[:10]:
+        index = int(e.split()[0])
+        print(f"mismatch: evaluator {e!r}, gcc {g!r}\n{programs[index]}\n")
+    assert len(expected) == len(got) and not mismatches, f"{len(mismatches)} mismatches"
+    print(f"gcc cross-check: {len(programs)} programs, {len(expected)} values identical")
+
+
+def bench(label, fn, runs, evaluations):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{runs * evaluations / elapsed:>14,.0f} evals/s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--programs', type=int, default=400)
+    ap.add_argument('--runs', type=int, default=200)
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = gramma.get_parser()
+    rng = random.Random(14)
+    programs, c_programs = case_programs()
+    programs += [typed_program(rng) for _ in range(args.programs)]
+    c_programs += programs[len(C_CASES):]
+    for text in programs:
+        assert parser.parse(text) is not None, text
+    check_against_gcc(programs, parser, c_programs)
+    print()
+
+    text = int_program(random.Random(15), 40)
+    tree = parser.parse(text)
+    statements = len(tree.children)
+    compiled = evaluator.Program(tree)
+    _, storage = compiled.run()
+    values = compiled.values(storage)
+    assert walk_program(tree) == values
+    print(f"{statements} statements per evaluation")
+    bench('compiled once', compiled.run, args.runs, statements)
+    bench('compiled every time', lambda: evaluator.Program(tree).run(), args.runs, statements)
+    bench('tree walker', lambda: walk_program(tree), args.runs, statements)
+
+    # 解析器生成的随机语句里常有未声明的变量和浮点下标，只统计能编译的部分
+    corpus = parser.parse(source(2000, seed=1))
+    ok = failed = 0
+    for stmt in corpus.children:
+        try:
+            evaluator.Program(gramma.ASTNode("Program", [stmt]), implicit_int=True).run()
+            ok += 1
+        except evaluator.EvalError:
+            failed += 1
+    print(f"\ncorpus statements: {ok} evaluated, {failed} rejected with EvalError")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# gramma 文法的度量：用 ply 在临时目录里重新生成 LALR 表，报告
+#   产生式数、状态数、冲突数、无用规则，action / goto 表项数，parsetab.py、parsetab.bin、parser.out 的字节数，
+#   以及声明为主和表达式为主两种输入上每个 token 的平均归约次数和解析耗时。
+# 改动文法前后各跑一次，对比分析表大小和解析速度的变化。
+# 另外检查不加括号的表达式按 C 的优先级和结合性建树：与按 C 的规则加满括号的写法得到同一棵树。
+#
+#   python benchmarks/grammar.py [--statements N] [--runs N]
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import tempfile
+import time
+
+from corpus import count_reductions, expression, replay, source, tokens
+
+import bintab
+import gramma
+
+
+class Messages:
+    # 收集 ply 的警告（冲突数、未使用的规则和符号）
+    def __init__(self):
+        self.lines = []
+
+    def warning(self, msg, *args, **kwargs):
+        self.lines.append(msg % args if args else msg)
+
+    debug = info = error = critical = warning
+
+    def count(self, pattern):
+        return sum(int(m.group(1)) for line in self.lines for m in [re.search(pattern, line)] if m)
+
+
+def build():
+    import ply.yacc as yacc
+    with tempfile.TemporaryDirectory() as tmp:
+        messages = Messages()
+        with contextlib.redirect_stdout(io.StringIO()):
+            lr = yacc.yacc(module=gramma, debug=True, outputdir=tmp, tabmodule='metrics_parsetab',
+                           debugfile='parser.out', errorlog=messages)
+        binary = os.path.join(tmp, 'parsetab.bin')
+        bintab.write_tables(binary, lr.action, lr.goto, lr.productions, bintab.grammar_signature(gramma))
+        sizes = {name: os.path.getsize(os.path.join(tmp, name))
+                 for name in ('metrics_parsetab.py', 'parsetab.bin', 'parser.out')}
+    return lr, messages, sizes
+
+
+# 不加括号的写法 -> 按 C 的优先级和结合性加满括号的写法（括号不产生节点）
+C_SHAPES = [
+    ("a && b || c", "(a && b) || c"),
+    ("a || b && c", "a || (b && c)"),
+    ("1 - 2 < 3 == 4", "((1 - 2) < 3) == 4"),
+    ("a - b - c", "(a - b) - c"),
+    ("a / b * c % d", "((a / b) * c) % d"),
+    ("a << b + c", "a << (b + c)"),
+    ("a | b ^ c & d", "a | (b ^ (c & d))"),
+    ("a == b != c < d", "(a == b) != (c < d)"),
+    ("-a * b", "(-a) * b"),
+    ("a++ + b[i] * c", "(a++) + ((b[i]) * c)"),
+    ("1 < 2 ? 5 : 6", "(1 < 2) ? 5 : 6"),
+    ("a ? b : c ? d : e", "a ? b : (c ? d : e)"),
+    ("a ? b ? c : d : e", "a ? (b ? c : d) : e"),
+    ("a < 40 ? a + b, a - b", "(a < 40) ? (a + b) : (a - b)"),
+    ("a || b ? c && d : e | f", "(a || b) ? (c && d) : (e | f)"),
+]
+
+
+def check_shapes(parser):
+    for plain, grouped in C_SHAPES:
+        got = str(parser.parse(f"x = {plain};"))
+        assert got == str(parser.parse(f"x = {grouped};")), (plain, got)
+
+
+def timed(fn, runs):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--statements', type=int, default=2000)
+    ap.add_argument('--runs', type=int, default=5)
+    args = ap.parse_args()
+
+    lr, messages, sizes = build()
+    unused = [line for line in messages.lines if 'defined, but not used' in line or 'unreachable' in line]
+    rows = [
+        ('productions', len(lr.productions) - 1),
+        ('states', len(lr.action)),
+        ('shift/reduce conflicts', messages.count(r'(\d+) shift/reduce conflict')),
+        ('reduce/reduce conflicts', messages.count(r'(\d+) reduce/reduce conflict')),
+        ('unused tokens / rules', len(unused)),
+        ('action entries', sum(len(row) for row in lr.action.values())),
+        ('goto entries', sum(len(row) for row in lr.goto.values())),
+        ('parsetab.py bytes', sizes['metrics_parsetab.py']),
+        ('parsetab.bin bytes', sizes['parsetab.bin']),
+        ('parser.out bytes', sizes['parser.out']),
+    ]
+    for label, value in rows:
+        print(f"{label:<28}{value:>10}")
+    for line in unused:
+        print(f"  {line}")
+
+    parser = gramma.get_parser()
+    check_shapes(parser)
+    print(f"\n{len(C_SHAPES)} expressions parsed with C precedence and associativity")
+    rng = random.Random(21)
+    inputs = {
+        'declarations': source(args.statements, seed=21),
+        'expressions': '\n'.join(f"x = {expression(rng, 6)};" for _ in range(args.statements)),
+    }
+    print(f"\n{'input':<14}{'tokens':>9}{'reductions/token':>18}{'parse us/token':>16}")
+    for name, text in inputs.items():
+        toks = tokens(text)
+        reductions = count_reductions(parser, text)
+        elapsed = timed(lambda: replay(parser, toks), args.runs)
+        print(f"{name:<14}{len(toks):>9}{reductions / len(toks):>18.2f}{elapsed / len(toks) * 1e6:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# GUI 响应性检查：在编辑器中放入约 1 万行代码并触发分析，
+# 统计整个分析过程中 Tk 事件循环的最长卡顿，目标是不超过 50 ms。
+#
+# 没有显示环境时也先做一遍不用 Tk 的检查：主线程按 ui.HEARTBEAT_MS 的心跳睡眠、轮询 AnalysisWorker 的结果，
+# 记录每次醒来比预期晚了多久。卡顿来自后台线程长时间占着 GIL，与 Tk 无关，这一项在任何环境里都能跑；
+# 另外一轮在分析中途提交改过的文本，与 GUIApp.on_modified 一样作废正在做的分析。
+# Tk 那一项需要 tkinter 和可用的显示环境，没有时跳过。
+#
+#   python benchmarks/gui_latency.py [--lines N] [--budget-ms 50]
+
+import argparse
+import queue
+import sys
+import time
+
+from corpus import source
+
+import gramma
+from analysis import AnalysisWorker
+from parse_cache import ParseCache
+
+HEARTBEAT_MS = 10   # 与 ui.HEARTBEAT_MS 相同；ui 依赖 tkinter 和 graphviz，没有时这一项也要能跑，所以不导入它
+
+
+def headless(text, timeout, edit_after=None):
+    # 返回 (耗时, 最长卡顿 ms, 最后一个结果的状态)
+    worker = AnalysisWorker(ParseCache(gramma.get_parser().parse))
+    tick = HEARTBEAT_MS / 1000
+    started = time.perf_counter()
+    generation = worker.submit('analyze', text)
+    expected = started + tick
+    stall = 0.0
+    status = None
+    while status is None:
+        time.sleep(max(expected - time.perf_counter(), 0))
+        now = time.perf_counter()
+        stall = max(stall, now - expected)
+        expected = now + tick
+        if edit_after is not None and now - started > edit_after:
+            # 省去防抖的等待，直接提交改过的文本
+            generation = worker.submit('analyze', text + "\nint edited;")
+            edit_after = None
+        while True:
+            try:
+                kind, done, _, _ = worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if done == generation and kind != 'progress':
+                status = kind
+        if now - started > timeout:
+            status = 'timeout'
+    return time.perf_counter() - started, stall * 1000, status
+
+
+def with_tk(root, text, timeout):
+    import ui
+
+    app = ui.GUIApp(root)
+    app.code_entry.insert("1.0", text)
+    app.code_entry.edit_modified(False)
+
+    started = time.perf_counter()
+    root.after(100, app.run_syntax_analysis)
+
+    def wait():
+        if not app.busy and app.debounce_id is None and time.perf_counter() - started > 0.2:
+            root.quit()
+        elif time.perf_counter() - started > timeout:
+            print("超时")
+            root.quit()
+        else:
+            root.after(50, wait)
+
+    root.after(200, wait)
+    root.mainloop()
+    elapsed = time.perf_counter() - started
+    stall = app.max_stall * 1000
+    root.destroy()
+    return elapsed, stall
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--lines', type=int, default=10_000)
+    ap.add_argument('--budget-ms', type=float, default=50.0)
+    ap.add_argument('--timeout', type=float, default=600.0)
+    args = ap.parse_args()
+
+    text = source(args.lines, seed=7)
+    worst = 0.0
+    for label, edit_after in (('headless', None), ('headless, edit midway', 0.5)):
+        elapsed, stall, status = headless(text, args.timeout, edit_after)
+        assert status == 'done', status
+        worst = max(worst, stall)
+        print(f"{label:<24}lines {args.lines}, analysis {elapsed:.2f} s, max heartbeat stall {stall:.1f} ms "
+              f"(budget {args.budget_ms:.0f} ms)")
+
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:  # 没有 tkinter 或没有显示环境
+        print(f"跳过 Tk：无法创建 Tk 窗口（{e}）")
+    else:
+        elapsed, stall = with_tk(root, text, args.timeout)
+        worst = max(worst, stall)
+        print(f"{'tk':<24}lines {args.lines}, analysis {elapsed:.2f} s, max event-loop stall {stall:.1f} ms "
+              f"(budget {args.budget_ms:.0f} ms)")
+    if worst > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# hash-consing 的基准：在子表达式大量重复的语料上比较普通解析和 hash_consing() 下的解析
+#   节点数（按树展开计 / 实际对象数）、树占用的字节数（tracemalloc，连同节点表与否）、解析耗时；
+# 并检查两种树的形状、evaluator 的执行结果完全相同，结构哈希相同的子树就是同一个对象。
+#
+#   python benchmarks/hashcons.py [--statements N] [--pool N] [--runs N]
+
+import argparse
+import contextlib
+import io
+import random
+import time
+import tracemalloc
+
+from corpus import NAMES, expression, shape
+
+import define
+import evaluator
+import gramma
+import hashcons
+
+OPS = ['+', '-', '*', '<', '==', '&&', '|']
+
+
+def repetitive(rng, statements, pool):
+    # 从一个不大的子表达式池里拼出每条语句，模拟生成的输入里 a+b、x[i]、常量的反复出现
+    exprs = [expression(rng, 2) for _ in range(pool)]
+    lines = [f"int {', '.join(NAMES)};", "int x[10];"]
+    for _ in range(statements):
+        parts = [f"({rng.choice(exprs)})" for _ in range(rng.randint(2, 4))]
+        rhs = parts[0]
+        for part in parts[1:]:
+            rhs = f"{rhs} {rng.choice(OPS)} {part}"
+        lines.append(f"{rng.choice(NAMES)} = {rhs};")
+    return '\n'.join(lines)
+
+
+def objects(tree):
+    # (按树展开的节点数, 不同对象数)；展开的节点数按对象记忆，共享的子树不必重复遍历
+    size = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in size:
+            continue
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((c, False) for c in node.children if c is not None)
+            continue
+        size[id(node)] = 1 + sum(size[id(c)] for c in node.children if c is not None)
+    return size[id(tree)], len(size)
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def outcome(tree):
+    try:
+        program = evaluator.Program(tree)
+        storage = program.storage()
+        program.run(storage)
+    except evaluator.EvalError as e:
+        return repr(str(e))
+    return repr(program.values(storage))
+
+
+def check(tree, shared):
+    assert shape(shared) == shape(tree)
+    assert outcome(shared) == outcome(tree)
+    by_hash = {}
+    stack = [shared]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, hashcons.SharedNode):
+            other = by_hash.setdefault(node.hash, node)
+            assert other is node or shape(other) != shape(node), "structurally equal subtrees not shared"
+        stack.extend(node.children)
+
+
+def parse_shared(parser, text):
+    with hashcons.hash_consing() as table:
+        return parser.parse(text, lexer=define.get_lexer()), table
+
+
+def measure_shared(parser, text):
+    # 树连同节点表的字节数，以及清空节点表、只留下树之后的字节数
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree, table = parse_shared(parser, text)
+    with_table = tracemalloc.get_traced_memory()[0] - before
+    table.clear()
+    without_table = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return tree, with_table, without_table
+
+
+def timed(fn, runs):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--statements', type=int, default=5000)
+    ap.add_argument('--pool', type=int, default=200)
+    ap.add_argument('--runs', type=int, default=3)
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parsers = {'parsetab': gramma.get_parser(), 'pratt': gramma.get_parser('pratt')}
+    text = repetitive(random.Random(22), args.statements, args.pool)
+    print(f"{args.statements} statements from a pool of {args.pool} subexpressions, {len(text)} bytes")
+
+    for name, parser in parsers.items():
+        tree, plain = measure(lambda: parser.parse(text, lexer=define.get_lexer()))
+        shared, with_table, without_table = measure_shared(parser, text)
+        check(tree, shared)
+        total, distinct = objects(tree)
+        _, shared_objects = objects(shared)
+        assert objects(hashcons.NodeTable().share(tree)) == (total, shared_objects)
+        plain_time = timed(lambda: parser.parse(text, lexer=define.get_lexer()), args.runs)
+        shared_time = timed(lambda: parse_shared(parser, text), args.runs)
+        print(f"\n{name}: {total} nodes in the tree")
+        print(f"{'':<22}{'objects':>10}{'bytes':>12}{'parse ms':>10}")
+        print(f"{'plain':<22}{distinct:>10}{plain:>12}{plain_time * 1e3:>10.1f}")
+        print(f"{'hash-consed + table':<22}{shared_objects:>10}{with_table:>12}{shared_time * 1e3:>10.1f}")
+        print(f"{'hash-consed, no table':<22}{shared_objects:>10}{without_table:>12}")
+    print("\ntrees identical in shape and evaluator results; equal structural hashes are the same object")
+
+
+if __name__ == '__main__':
+    main()
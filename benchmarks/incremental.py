@@ -0,0 +1,50 @@
+# 增量解析基准：在一份大源码上做一系列随机编辑，每次编辑后分别做增量解析和整段解析，比较耗时。
+# 两者的 AST 完全一致由 tests/test_incremental.py 检查。
+#
+#   python benchmarks/incremental.py [--statements N] [--edits N]
+
+import argparse
+import random
+import time
+
+from corpus import edit, source
+
+import define
+import gramma
+from incremental import IncrementalParser
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--statements', type=int, default=5000)
+    ap.add_argument('--edits', type=int, default=30)
+    args = ap.parse_args()
+
+    rng = random.Random(42)
+    lexer = define.get_lexer()
+    parser = gramma.get_parser()
+    text = source(args.statements, seed=5)
+    inc = IncrementalParser(parser, lexer)
+    inc.parse(text)
+
+    t_inc = t_full = 0.0
+    for _ in range(args.edits):
+        text = edit(rng, text)
+
+        t = time.perf_counter()
+        inc.parse(text)
+        t_inc += time.perf_counter() - t
+
+        t = time.perf_counter()
+        lexer.lineno = 1
+        parser.parse(text, lexer=lexer)
+        t_full += time.perf_counter() - t
+
+    print(f"{args.statements} statements, {args.edits} edits")
+    print(f"full parse   {t_full / args.edits * 1000:9.2f} ms/edit")
+    print(f"incremental  {t_inc / args.edits * 1000:9.2f} ms/edit   "
+          f"(reused {inc.reused}, reparsed {inc.reparsed}, full {inc.full_parses})")
+
+
+if __name__ == '__main__':
+    main()
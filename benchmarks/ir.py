@@ -0,0 +1,138 @@
+# 三地址码检查与基准：翻译、优化后的代码执行结果与 evaluator 一致，紧凑形式可以还原；
+# 统计各语料上优化前后的指令条数（静态条数和实际执行的条数），以及每个优化单独的效果。
+#
+#   python benchmarks/ir.py [--programs N]
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from corpus import C_CASES, Generator, case_programs, typed_program
+
+import evaluator
+import gramma
+import ir
+
+
+def inputs(rng, names):
+    # 变量的初值从数组里读出来，优化时当作未知数，不会整个程序都被常量折叠掉
+    lines = [f"int in[{len(names)}] = {rng.randint(0, 99)};"]
+    lines += [f"in[{i}] = {rng.randint(-99, 99)};" for i in range(1, len(names))]
+    lines += [f"int {n} = in[{i}];" for i, n in enumerate(names)]
+    return lines
+
+
+def redundant_program(rng, statements=8):
+    # 几个子表达式在多条语句里反复出现，公共子表达式消除的典型场景
+    names = ['a', 'b', 'c', 'd']
+    gen = Generator(rng, typed=False, names=names)
+    pool = [gen.int_expr(2) for _ in range(3)]
+    lines = inputs(rng, names)
+    for i in range(statements):
+        left, right = rng.choice(pool), rng.choice(pool)
+        lines.append(f"int v{i} = ({left} {rng.choice(['+', '-', '*', '^'])} {right});")
+    return '\n'.join(lines)
+
+
+def constant_program(rng, statements=8):
+    # 表达式里大多是常量（宏展开后的代码常见这种情况）
+    gen = Generator(rng, typed=False, names=['n'])
+    lines = inputs(rng, ['n'])
+    lines += [f"int v{i} = {gen.int_expr(3)};" for i in range(statements)]
+    return '\n'.join(lines)
+
+
+# 运行时一定出错、出错的指令结果又没人用（乘 0、与 0 被化简掉）的程序：删除无用临时变量不能删掉它们
+TRAPS = [
+    "int in[2] = 0; int a = in[1]; int v = a / a * 0;",
+    "int in[2] = 0; int a = in[1]; int v = 0 * (7 % a);",
+    "int x[4] = 1; int in[2] = 9; int i = in[1]; int v = x[i] & 0;",
+    "int in[2] = 40; int s = in[1]; int v = (1 << s) * 0;",
+]
+
+CORPORA = {
+    'typed': typed_program,
+    'redundant': redundant_program,
+    'constants': constant_program,
+}
+PASS_SETS = [
+    ('none', frozenset()),
+    # 其它优化大多是把指令换成 copy，要配合复写传播和删除无用临时变量才看得出效果
+    ('fold', frozenset({'fold', 'jumps', 'dead'})),
+    ('propagate', frozenset({'propagate', 'dead'})),
+    ('cse', frozenset({'cse', 'propagate', 'dead'})),
+    ('all', ir.PASSES),
+]
+
+
+def check(tree, lowered, optimized):
+    # 求值出错（除以零、下标越界等未定义行为）的程序，翻译和优化后执行同样报错；返回是否正常结束
+    program = evaluator.Program(tree)
+    try:
+        _, storage = program.run()
+    except evaluator.EvalError:
+        for code in (lowered, optimized):
+            try:
+                ir.run(code)
+            except evaluator.EvalError:
+                continue
+            raise AssertionError("evaluator raised EvalError but the three-address code did not")
+        return False
+    expected = repr(program.values(storage))
+    assert repr(ir.run(lowered)[0]) == expected
+    assert repr(ir.run(optimized)[0]) == expected
+    for code in (lowered, optimized):
+        words, operands = code.pack()
+        assert repr(ir.unpack(words, operands)) == repr(code.code)
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--programs', type=int, default=300)
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = gramma.get_parser()
+
+    for text in case_programs()[0]:
+        tree = parser.parse(text)
+        code = ir.lower(tree)
+        assert check(tree, code, ir.optimize(code)), text
+    for text in TRAPS:
+        tree = parser.parse(text)
+        code = ir.lower(tree)
+        for passes in [ir.PASSES] + [passes for _, passes in PASS_SETS]:
+            assert not check(tree, code, ir.optimize(code, passes)), text
+    print(f"{len(C_CASES)} hand-written programs checked against evaluator, "
+          f"{len(TRAPS)} that raise EvalError raise it after every pass set\n")
+
+    print(f"{'corpus':<12}{'passes':<12}{'static':>10}{'executed':>12}{'run ms':>10}")
+    for corpus, make in CORPORA.items():
+        rng = random.Random(16)
+        trees = [parser.parse(make(rng)) for _ in range(args.programs)]
+        lowered = [ir.lower(tree) for tree in trees]
+        checked = 0
+        for tree, code in zip(trees, lowered):
+            checked += check(tree, code, ir.optimize(code))
+            for passes in (frozenset({'dead'}), frozenset({'fold', 'dead'}), frozenset({'cse', 'dead'})):
+                check(tree, code, ir.optimize(code, passes))
+        for label, passes in PASS_SETS:
+            codes = [ir.optimize(code, passes) for code in lowered]
+            static = sum(len(code) for code in codes)
+            executed = 0
+            start = time.perf_counter()
+            for code in codes:
+                try:
+                    executed += ir.run(code)[1]
+                except evaluator.EvalError:
+                    pass
+            elapsed = time.perf_counter() - start
+            print(f"{corpus:<12}{label:<12}{static:>10}{executed:>12}{elapsed * 1000:>10.1f}")
+        print(f"{'':<12}{checked} programs checked against evaluator, {args.programs - checked} raised EvalError in all\n")
+
+
+if __name__ == '__main__':
+    main()
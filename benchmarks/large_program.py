@@ -0,0 +1,58 @@
+# 大输入基准：10 万条声明的文件解析、打印、生成 AST 图的耗时。
+# 不触发递归上限、Program 和声明列表都是平的由 tests/test_flat_lists.py 检查。
+#
+#   python benchmarks/large_program.py [--declarations N]
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import corpus  # noqa: F401  把仓库根目录加入 sys.path
+
+import astgraph
+import define
+import gramma
+
+
+def depth(tree):
+    best = 0
+    stack = [(tree, 1)]
+    while stack:
+        node, d = stack.pop()
+        if node is None:
+            continue
+        best = max(best, d)
+        stack.extend((c, d + 1) for c in node.children)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--declarations', type=int, default=100_000)
+    args = ap.parse_args()
+
+    text = ''.join(f"int v{i} = {i} + x{i % 7}, w{i}[4];\n" for i in range(args.declarations))
+
+    t = time.perf_counter()
+    tree = gramma.get_parser().parse(text, lexer=define.get_lexer())
+    print(f"parse        {time.perf_counter() - t:8.2f} s")
+    print(f"tree depth   {depth(tree):8d}   (recursion limit {sys.getrecursionlimit()})")
+
+    t = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        gramma.print_ast(tree)
+    print(f"print_ast    {time.perf_counter() - t:8.2f} s")
+
+    # 不折叠，整棵树的 DOT 文本都写出来
+    with tempfile.TemporaryDirectory() as tmp:
+        t = time.perf_counter()
+        path = gramma.generate_ast_graph(tree, os.path.join(tmp, 'ast.gv'), astgraph.GraphOptions(max_nodes=None))
+        print(f"ast graph    {time.perf_counter() - t:8.2f} s   ({os.path.getsize(path) / 1e6:.1f} MB DOT)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# 词法分析器基准：fastlex 与 define.lexer 每秒处理的 token 数。
+# 两者产生完全相同的 token 流由 tests/test_fastlex.py 检查。
+#
+#   python benchmarks/lexer.py [--statements N]
+
+import argparse
+import time
+
+from corpus import source
+
+import define
+import fastlex
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--statements', type=int, default=20000)
+    args = ap.parse_args()
+
+    text = source(args.statements, seed=1)
+    count = sum(1 for _ in fastlex.tokenize(text))
+    print(f"{count} tokens, {len(text) / 1e6:.1f} MB")
+    print(f"{'lexer':<10} {'seconds':>8} {'tokens/s':>12}")
+    for name, lexer in (('ply', define.get_lexer()), ('fastlex', fastlex.get_lexer())):
+        best = min(timed(lexer, text) for _ in range(5))
+        print(f"{name:<10} {best:>8.3f} {count / best:>12,.0f}")
+
+
+def timed(lexer, text):
+    lexer.lineno = 1
+    lexer.input(text)
+    token = lexer.token
+    start = time.perf_counter()
+    while token() is not None:
+        pass
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# 并行词法分析基准：1/2/4/8 个进程的扩展性。
+# 拼接结果与整段 TokenBuffer 逐字节相同由 tests/test_parlex.py 检查。
+#
+#   python benchmarks/parallel_lex.py [--megabytes N] [--workers 1,2,4,8]
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import source
+
+import parlex
+from tokbuf import TokenBuffer
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--megabytes', type=int, default=16)
+    ap.add_argument('--workers', default='1,2,4,8')
+    args = ap.parse_args()
+
+    block = source(2000, seed=6).encode()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'big.c')
+        with open(path, 'wb') as f:
+            for _ in range(args.megabytes * (1 << 20) // len(block)):
+                f.write(block)
+        with open(path, 'rb') as f:
+            data = f.read()
+        start = time.perf_counter()
+        count = len(TokenBuffer(data))
+        sequential = time.perf_counter() - start
+        print(f"{len(data) / 1e6:.1f} MB, {count} tokens, {os.cpu_count()} CPUs, "
+              f"sequential {sequential:.2f} s")
+
+        print(f"{'workers':>7}  {'bytes s':>8}  {'mmap s':>8}  {'speedup':>7}")
+        for workers in [int(w) for w in args.workers.split(',')]:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(abs, range(workers)))         # 先把进程都启动起来
+                start = time.perf_counter()
+                parlex.lex_parallel(data, workers, pool)
+                t_bytes = time.perf_counter() - start
+                start = time.perf_counter()
+                buffer = parlex.lex_file_parallel(path, workers, pool)
+                t_mmap = time.perf_counter() - start
+                buffer.close()
+            print(f"{workers:>7}  {t_bytes:>8.2f}  {t_mmap:>8.2f}  {sequential / min(t_bytes, t_mmap):>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
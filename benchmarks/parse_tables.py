@@ -0,0 +1,114 @@
+# parsetab.py 与 bintab 二进制表的对比：
+#   1. 全新进程中加载分析表、得到可用 parser 的耗时。只加载表的两项把 import gramma 之类的准备工作放在计时之外，
+#      两者可以直接比较；get_parser 两项是完整的冷启动
+#   2. 同一批输入上两种驱动的解析结果逐一比对，以及解析吞吐（含词法分析的文件数/秒，和只解析的每 token 耗时）
+#
+#   python benchmarks/parse_tables.py [--runs N] [--files N]
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from corpus import ROOT, replay, shape, source, tokens
+
+import define
+import gramma
+
+PROBE = """
+import time
+{setup}
+t = time.perf_counter()
+{stmt}
+print(time.perf_counter() - t)
+"""
+
+# 名字 -> (不计时的准备, 计时的语句)
+LOAD_CASES = {
+    'import parsetab': ("", "import parsetab"),
+    'mmap parsetab.bin': ("import bintab, gramma; path = bintab.default_path(gramma); "
+                          "signature = bintab.grammar_signature(gramma)",
+                          "bintab.BinaryTables(path, signature)"),
+    # BinaryParser 直接用 mmap 里的表，只多了终结符编号和产生式两张小表
+    'mmap + BinaryParser': ("import bintab, gramma; path = bintab.default_path(gramma); "
+                            "signature = bintab.grammar_signature(gramma)",
+                            "bintab.BinaryParser(bintab.BinaryTables(path, signature), gramma)"),
+    "get_parser('parsetab')": ("", "import gramma; gramma.get_parser('parsetab')"),
+    "get_parser('binary')": ("", "import gramma; gramma.get_parser('binary')"),
+}
+
+
+def cold(setup, stmt, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(setup=setup, stmt=stmt)],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(samples) * 1000, statistics.median(samples) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--runs', type=int, default=20)
+    ap.add_argument('--files', type=int, default=200)
+    args = ap.parse_args()
+
+    # 确保 parsetab.bin 已生成，冷启动测量只计加载
+    gramma.get_parser('binary')
+    print(f"parsetab.py  {os.path.getsize(os.path.join(ROOT, 'parsetab.py')):>8} bytes")
+    print(f"parsetab.bin {os.path.getsize(os.path.join(ROOT, 'parsetab.bin')):>8} bytes")
+    print()
+    for name, (setup, stmt) in LOAD_CASES.items():
+        best, median = cold(setup, stmt, args.runs)
+        print(f"{name:<26} min {best:8.2f} ms   median {median:8.2f} ms")
+    print()
+
+    # 两种驱动交替运行，取最好的一次，少受机器负载波动的影响；计时期间与 timeit 一样关掉 gc
+    lexer = define.get_lexer()
+    sources = [source(100, seed) for seed in range(args.files)]
+    parsers = {tables: gramma.get_parser(tables) for tables in ('parsetab', 'binary')}
+    best = dict.fromkeys(parsers, float('inf'))
+    gc.disable()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(3):
+            for tables, parser in parsers.items():
+                t = time.perf_counter()
+                for text in sources:
+                    lexer.lineno = 1
+                    parser.parse(text, lexer=lexer)
+                best[tables] = min(best[tables], time.perf_counter() - t)
+    for tables, elapsed in best.items():
+        print(f"parse {tables:<9} {len(sources) / elapsed:10.1f} files/s")
+
+    # 只解析：事先切好 token
+    toks = tokens('\n'.join(sources[:20]))
+    best = dict.fromkeys(parsers, float('inf'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(args.runs):
+            for tables, parser in parsers.items():
+                t = time.perf_counter()
+                replay(parser, toks)
+                best[tables] = min(best[tables], time.perf_counter() - t)
+    gc.enable()
+    for tables, elapsed in best.items():
+        print(f"parse only {tables:<9} {elapsed / len(toks) * 1e6:6.2f} us/token")
+
+    mismatches = 0
+    for text in sources:
+        results = []
+        for tables in ('parsetab', 'binary'):
+            lexer.lineno = 1
+            results.append(shape(gramma.get_parser(tables).parse(text, lexer=lexer)))
+        mismatches += results[0] != results[1]
+    print(f"mismatches: {mismatches} / {len(sources)}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
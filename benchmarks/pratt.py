@@ -0,0 +1,93 @@
+# Pratt 表达式后端与 LALR 分析表的基准：以表达式为主的输入上，每个 token 的归约次数
+# （LALR 的规则函数调用 / Pratt 构造的节点）和耗时。两者的 AST 一致由 tests/test_pratt.py 检查。
+#
+#   python benchmarks/pratt.py [--statements N] [--runs N]
+
+import argparse
+import contextlib
+import gc
+import io
+import random
+import time
+
+from corpus import NAMES, SyntaxGenerator, count_reductions, replay, tokens
+
+import define
+import gramma
+
+
+def syntax_errors(parser, text):
+    lexer = define.get_lexer()
+    lexer.lineno = 1
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        parser.parse(text, lexer=lexer)
+    return out.getvalue()
+
+
+def nodes(tree):
+    total = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        total += 1
+        stack.extend(node.children)
+    return total
+
+
+def timed(fns, runs):
+    # 几个函数交替运行，各取最好的一次：机器负载的波动对它们的影响相同；
+    # 与 timeit 一样关掉 gc，否则哪一次碰上全量回收就算在哪一个头上
+    best = [float('inf')] * len(fns)
+    gc.disable()
+    try:
+        for _ in range(runs):
+            for i, fn in enumerate(fns):
+                start = time.perf_counter()
+                fn()
+                best[i] = min(best[i], time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--statements', type=int, default=2000)
+    ap.add_argument('--runs', type=int, default=10)
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        lalr = gramma.get_parser()
+        binary = gramma.get_parser('binary')
+        pratt = gramma.get_parser('pratt')
+
+    # 以表达式为主：赋值语句，右边是深度 4~6 的表达式；-> 会被切成 - >，这样的语句不要
+    rng = random.Random(200)
+    gen = SyntaxGenerator(rng)
+    lines = []
+    while len(lines) < args.statements:
+        line = f"{rng.choice(NAMES)} = {gen.expr(rng.randint(4, 6))};"
+        if not syntax_errors(lalr, line):
+            lines.append(line)
+    text = '\n'.join(lines)
+    toks = tokens(text)
+    ntokens = len(toks)
+    tree = replay(pratt, toks)
+    reductions = count_reductions(lalr, text)
+    built = nodes(tree)
+    print(f"{args.statements} assignments, {ntokens} tokens, {built} AST nodes")
+    print(f"{'':<18}{'reductions/token':>18}{'lex+parse us/token':>20}{'parse us/token':>16}")
+    rows = (('parsetab (LALR)', lalr, reductions), ('binary (LALR)', binary, reductions), ('pratt', pratt, built))
+    fns = []
+    for _, parser, _ in rows:
+        fns.append(lambda parser=parser: parser.parse(text, lexer=define.get_lexer()))
+        fns.append(lambda parser=parser: replay(parser, toks))
+    times = timed(fns, args.runs)
+    for (label, parser, steps), total, parsing in zip(rows, times[::2], times[1::2]):
+        print(f"{label:<18}{steps / ntokens:>18.2f}{total / ntokens * 1e6:>20.2f}{parsing / ntokens * 1e6:>16.2f}")
+    print("(pratt reductions: AST nodes built, one step per node)")
+
+
+if __name__ == '__main__':
+    main()
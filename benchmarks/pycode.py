@@ -0,0 +1,175 @@
+# Python 代码对象后端的检查与基准：
+#   1. 随机生成的带类型程序、解析器语料里的语句，结果与 evaluator 完全一致
+#      （出错时两边都报 EvalError，出错前已经写入的变量也一样）；
+#   2. 比较每秒执行的语句数：evaluator 的闭包 / 编译成的 Python 函数；以及两者的编译耗时；
+#   3. 热点表达式反复求值（按 Zipf 分布抽取，空白写法随机变化）时 CodeCache 的命中率和吞吐量。
+#
+#   python benchmarks/pycode.py [--programs N] [--runs N] [--lookups N]
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from corpus import (ARRAY, ARRAY_SIZE, C_CASES, COUNTERS, VARIABLES, Generator, case_programs, int_program, source,
+                    typed_program)
+
+import evaluator
+import gramma
+import pycode
+
+
+def outcome(cls, tree):
+    # 返回 (是否出错, 用于比较的 repr)：编译错误，或者每条语句的结果、执行错误和变量的值；
+    # 用 repr 比较，nan、-0.0 也要一致
+    try:
+        program = cls(tree)
+    except evaluator.EvalError as e:
+        return True, repr(('compile', str(e)))
+    storage = program.storage()
+    try:
+        results, _ = program.run(storage)
+        error = None
+    except evaluator.EvalError as e:
+        results, error = None, str(e)
+    return error is not None, repr((results, error, program.values(storage)))
+
+
+def check(parser, programs):
+    rng = random.Random(18)
+    raised = 0
+    for text in case_programs()[0] + [typed_program(rng) for _ in range(programs)]:
+        tree = parser.parse(text)
+        expected = outcome(evaluator.Program, tree)
+        assert outcome(pycode.Program, tree) == expected, expected
+        raised += expected[0]
+    corpus = parser.parse(source(2000, seed=1))
+    rejected = 0
+    for stmt in corpus.children:
+        tree = gramma.ASTNode("Program", [stmt])
+        expected = outcome(evaluator.Program, tree)
+        assert outcome(pycode.Program, tree) == expected, expected
+        rejected += expected[0]
+    print(f"{len(C_CASES) + programs} typed programs ({len(C_CASES)} hand-written, {raised} raised EvalError) and {len(corpus.children)} corpus statements "
+          f"({rejected} rejected) identical to evaluator")
+
+
+def bench(label, fn, runs, statements):
+    fn()
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30}{runs * statements / elapsed:>16,.0f} statements/s")
+
+
+def compile_time(label, cls, trees):
+    start = time.perf_counter()
+    for tree in trees:
+        cls(tree)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30}{elapsed / len(trees) * 1e6:>16,.0f} us per program")
+
+
+def variables():
+    # 热点表达式用到的变量：与 typed_program 相同的名字和类型
+    table = {}
+    for name, ctype in VARIABLES + COUNTERS:
+        table[name] = evaluator.Variable(name, ctype, len(table))
+    table[ARRAY] = evaluator.Variable(ARRAY, 'int', len(table), ARRAY_SIZE)
+    return table
+
+
+def respace(rng, text):
+    # 同一个表达式的不同写法：规范化之后应该命中同一个缓存项
+    r = rng.random()
+    if r < 0.25:
+        return text.replace(' ', '')
+    if r < 0.5:
+        return text.replace(' ', '  ')
+    if r < 0.6:
+        return text.replace(' ', '\n', 1)
+    return text
+
+
+def cache_workload(parser, lookups, distinct, rng):
+    table = variables()
+    gen = Generator(rng)
+    texts = []
+    while len(texts) < distinct:
+        text = gen.int_expr(3)
+        try:
+            pycode.compile_expression(pycode.parse_expression(text, parser), table)
+        except evaluator.EvalError:
+            continue
+        texts.append(text)
+    weights = [1 / (rank + 1) for rank in range(distinct)]      # Zipf
+    return table, [respace(rng, text) for text in rng.choices(texts, weights, k=lookups)]
+
+
+def storage(table):
+    s = [None] * len(table)
+    for var in table.values():
+        zero = evaluator.STORE[var.ctype](0)
+        s[var.slot] = zero if var.length is None else evaluator.array(evaluator.TYPECODES[var.ctype], [zero]) * var.length
+    return s
+
+
+def run_workload(label, evaluate, workload):
+    start = time.perf_counter()
+    for text in workload:
+        try:
+            evaluate(text)
+        except evaluator.EvalError:
+            pass
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30}{len(workload) / elapsed:>16,.0f} evals/s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--programs', type=int, default=300)
+    ap.add_argument('--runs', type=int, default=200)
+    ap.add_argument('--lookups', type=int, default=20000)
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = gramma.get_parser()
+    check(parser, args.programs)
+
+    rng = random.Random(18)
+    tree = parser.parse(int_program(rng, 200, inputs=True))
+    statements = len(tree.children)
+    closures = evaluator.Program(tree)
+    native = pycode.Program(tree)
+    assert repr(native.run()) == repr(closures.run())
+    print(f"\n{statements} statements, int arithmetic")
+    bench('evaluator closures', closures.run, args.runs, statements)
+    bench('pycode', native.run, args.runs, statements)
+    trees = [parser.parse(typed_program(rng)) for _ in range(200)]
+    trees = [t for t in trees if not outcome(evaluator.Program, t)[0]]
+    typed = evaluator.Program(trees[0])
+    statements = len(trees[0].children)
+    print(f"\n{statements} statements, typed")
+    bench('evaluator closures', typed.run, args.runs * 10, statements)
+    bench('pycode', pycode.Program(trees[0]).run, args.runs * 10, statements)
+    compile_time('evaluator compile', evaluator.Program, trees)
+    compile_time('pycode compile', pycode.Program, trees)
+
+    # 热点表达式：每次都从源码开始（解析、编译、求值）
+    table, workload = cache_workload(parser, args.lookups, 500, rng)
+    s = storage(table)
+    print(f"\n{len(workload)} expression evaluations from source, 500 distinct expressions, Zipf popularity")
+    run_workload('evaluator, no cache', lambda text: evaluator.compile_expression(
+        pycode.parse_expression(text, parser), table)[0](s), workload[:args.lookups // 20])
+    run_workload('pycode, no cache', lambda text: pycode.compile_expression(
+        pycode.parse_expression(text, parser), table)[0](s), workload[:args.lookups // 20])
+    for maxsize in (16, 64, 256, 1024):
+        cache = pycode.CodeCache(parser, maxsize)
+        run_workload(f'pycode, cache of {maxsize}', lambda text: cache.expression(text, table)[0](s), workload)
+        print(f"{'':<30}{cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# 语义分析检查与基准：
+#   1. 解析器语料里的每条语句、随机的带类型程序：有没有错误与 evaluator 编译时是否报错一致；
+#      只有常量下标越界的语句，evaluator 执行时也报越界；手写的不加括号的表达式和随机程序里，
+#      每个赋值右边的表达式，分析出的类型与 evaluator 编译出的类型相同；
+#   2. 规模测试：声明数从一千到几十万，每条语句的分析耗时应当基本不变（线性）。
+#
+#   python benchmarks/semantic.py [--sizes 1000,10000,100000,300000]
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from corpus import C_CASES, case_programs, source, typed_program
+
+import evaluator
+import gramma
+import semantic
+
+TYPES = list(evaluator.TYPECODES)
+
+
+def compiles(tree):
+    try:
+        evaluator.Program(tree)
+    except evaluator.EvalError:
+        return False
+    return True
+
+
+def check_types(parser, texts):
+    checked = 0
+    for text in texts:
+        tree = parser.parse(text)
+        variables = evaluator.Program(tree).variables
+        analyzer = semantic.Analyzer()
+        for stmt in tree.children:
+            analyzer.run(stmt)
+            if stmt.node_type.startswith(('DeclarationWithoutType', 'ArrayDeclarationWithoutTypeWith')):
+                value = stmt.children[-1]
+                expected = evaluator.compile_expression(value, variables)[1]
+                assert analyzer.expression(value) == expected, (text, stmt)
+                checked += 1
+    return checked
+
+
+def check(parser):
+    corpus = parser.parse(source(2000, seed=1))
+    kinds = {}
+    for stmt in corpus.children:
+        tree = gramma.ASTNode("Program", [stmt])
+        result = semantic.analyze(tree)
+        errors = [d for d in result.errors if d.kind != 'bounds']
+        assert compiles(tree) == (not errors), [str(d) for d in result.diagnostics]
+        if result.errors and not errors:
+            try:
+                evaluator.Program(tree).run()
+                raise AssertionError("constant subscript out of bounds not raised by evaluator")
+            except evaluator.EvalError as e:
+                assert 'out of bounds' in str(e), e
+        for d in result.diagnostics:
+            kinds[d.kind] = kinds.get(d.kind, 0) + 1
+    rng = random.Random(19)
+    texts = case_programs()[0] + [typed_program(rng) for _ in range(300)]
+    for text in texts:
+        result = semantic.analyze(parser.parse(text))
+        assert not result.diagnostics, [str(d) for d in result.diagnostics]
+    expressions = check_types(parser, texts)
+    sample = semantic.analyze(parser.parse("int a=10, b=20, c; c=a<40? A+b,a-b;"))
+    assert [str(d) for d in sample.diagnostics] == ["statement 2: error: 'A' undeclared"]
+    print(f"{len(corpus.children)} corpus statements agree with evaluator; diagnostics by kind: {kinds}")
+    print(f"{len(texts)} typed programs ({len(C_CASES)} hand-written) without diagnostics, "
+          f"{expressions} assigned expressions typed as in evaluator")
+
+
+def program(rng, statements):
+    # 以声明为主的大文件：大约 1% 的语句有错（未声明、重复声明、常量下标越界）
+    names = []
+    arrays = []
+    lines = []
+    for i in range(statements):
+        r = rng.random()
+        if r < 0.005 and names:
+            lines.append(f"{rng.choice(names)} = undeclared{i} + 1;")
+        elif r < 0.01 and names:
+            lines.append(f"int {rng.choice(names)};")
+        elif r < 0.015 and arrays:
+            name, length = rng.choice(arrays)
+            lines.append(f"{name}[{length}] = 1;")
+        elif r < 0.1:
+            name, length = f"arr{i}", rng.randint(1, 64)
+            arrays.append((name, length))
+            lines.append(f"{rng.choice(TYPES)} {name}[{length}];")
+        elif r < 0.3 and names and arrays:
+            name, length = rng.choice(arrays)
+            lines.append(f"{rng.choice(names)} = {name}[{rng.randrange(length)}] * 2;")
+        elif r < 0.4 and names:
+            lines.append(f"{rng.choice(names)} = ({rng.choice(names)} + {rng.choice(names)}) < {rng.randint(0, 99)};")
+        else:
+            ctype = rng.choice(TYPES)
+            name = f"v{i}"
+            value = f"({rng.choice(names)} * {rng.randint(1, 9)})" if names else "1"
+            lines.append(f"{ctype} {name} = {value};")
+            names.append(name)
+    return '\n'.join(lines)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--sizes', default='1000,10000,100000,300000')
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = gramma.get_parser()
+    check(parser)
+
+    print(f"\n{'statements':>12}{'symbols':>10}{'diagnostics':>13}{'parse s':>10}{'analyze s':>11}{'us/stmt':>9}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        text = program(random.Random(size), size)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            tree = parser.parse(text)
+        parsed = time.perf_counter() - start
+        start = time.perf_counter()
+        result = semantic.analyze(tree)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>12}{len(result.symbols):>10}{len(result.diagnostics):>13}{parsed:>10.2f}{elapsed:>11.3f}"
+              f"{elapsed / size * 1e6:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# 冷启动基准：在全新的解释器进程中测量 import define / import gramma 的耗时，
+# 以及第一次 get_parser() + parse 的耗时。
+#
+#   python benchmarks/startup.py [--runs N] [--output startup.json]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE = "int a=10, b=20, c; c=a<40? A+b,a-b;"
+
+CASES = {
+    'import define': "import define",
+    'import gramma': "import gramma",
+    'first parse': "import gramma; gramma.get_parser().parse(%r)" % SAMPLE,
+}
+
+PROBE = """
+import time
+t = time.perf_counter()
+{stmt}
+print(time.perf_counter() - t)
+"""
+
+
+def measure(stmt, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', PROBE.format(stmt=stmt)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--runs', type=int, default=20)
+    ap.add_argument('--output', help='把结果追加写入 JSON 文件')
+    args = ap.parse_args()
+
+    results = {}
+    for name, stmt in CASES.items():
+        samples = measure(stmt, args.runs)
+        results[name] = {
+            'min_ms': min(samples) * 1000,
+            'median_ms': statistics.median(samples) * 1000,
+        }
+        print(f"{name:<16} min {results[name]['min_ms']:8.2f} ms   "
+              f"median {results[name]['median_ms']:8.2f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
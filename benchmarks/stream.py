@@ -0,0 +1,124 @@
+# 流式词法分析检查与基准：
+#   1. streamlex 的 token 流与 fastlex（对解码后的文本）一致，列号正确；
+#   2. parse_file / parse_statements 的结果与整段 parser.parse 一致；
+#   3. 在不同大小的生成文件上比较峰值内存：整段读入 vs 流式 token vs 流式逐条检查。
+#
+#   python benchmarks/stream.py [--sizes 4,16]   （单位 MB）
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from corpus import ROOT, shape, source
+
+import fastlex
+import gramma
+import streamlex
+
+
+def fuzz(rng, length):
+    pieces = [b"ab", b"_", b" ", b"19", b".", b"\t", b"\n", b"\r\n", b'"', b"-", b"<<", b">=",
+              b"=", b";", b",", b"(", b")", b"$", "é".encode(), "٣".encode(), b"\xff", b"\xe4\xb8"]
+    return b''.join(rng.choice(pieces) for _ in range(length))
+
+
+def stream_tokens(data):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        tokens = [(t.type, t.value, t.lineno, t.lexpos, t.column) for t in streamlex.tokens(data)]
+    return tokens, out.getvalue()
+
+
+def text_tokens(text):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        tokens = [(t.type, t.value, t.lineno, t.lexpos) for t in fastlex.tokenize(text)]
+    return tokens, out.getvalue()
+
+
+def check_tokens(data):
+    text = data.decode('utf-8', 'replace')
+    got, got_out = stream_tokens(data)
+    expected, expected_out = text_tokens(text)
+    assert got_out == expected_out, data
+    if data.isascii():
+        # 纯 ASCII 时字节位置就是字符位置，可以逐项比较，并验证列号
+        assert [t[:4] for t in got] == expected, data
+        for _, _, _, lexpos, column in got:
+            assert column == lexpos - (text.rfind('\n', 0, lexpos) + 1) + 1, data
+    else:
+        assert [t[:3] for t in got] == [t[:3] for t in expected], data
+
+
+def rss_run(mode, path):
+    # 在子进程里跑，ru_maxrss 才是这一种方式自己的峰值
+    code = f"""
+import resource, sys, time
+sys.path.insert(0, {ROOT!r})
+import fastlex, streamlex
+start = time.perf_counter()
+if {mode!r} == 'read':
+    with open({path!r}, encoding='utf-8') as f:
+        text = f.read()
+    n = sum(1 for _ in fastlex.tokenize(text))
+elif {mode!r} == 'stream':
+    n = sum(1 for _ in streamlex.tokens({path!r}))
+else:
+    n = streamlex.check_file({path!r})[0]
+print(n, time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    n, seconds, maxrss = out.split()
+    return int(n), float(seconds), int(maxrss) / 1024
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--sizes', default='4,16')
+    ap.add_argument('--fuzz', type=int, default=1000)
+    args = ap.parse_args()
+
+    rng = random.Random(9)
+    cases = [source(200, seed=s).encode() for s in range(10)]
+    cases += [b"", b"\n\n", b'a = "x\ny;\nz" b;\n c', b"int a;\r\nint b;\r\n"]
+    cases += [fuzz(rng, rng.randint(1, 60)) for _ in range(args.fuzz)]
+    for data in cases:
+        check_tokens(data)
+    print(f"{len(cases)} differential cases: identical")
+
+    parser = gramma.get_parser()
+    text = source(3000, seed=4)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'program.c')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        lexer = fastlex.get_lexer()
+        lexer.lineno = 1
+        expected = shape(parser.parse(text, lexer=lexer))
+        assert shape(streamlex.parse_file(path, parser)) == expected
+        children = [child for tree in streamlex.parse_statements(path, parser) for child in shape(tree)[2]]
+        assert children == expected[2]
+        assert streamlex.check_file(path, parser) == (len(expected[2]), 0)
+        print("parse_file / parse_statements: identical AST")
+
+        block = source(2000, seed=8).encode()
+        print(f"{'MB':>5}  {'mode':<7} {'seconds':>8} {'peak RSS MB':>12}")
+        for size in [int(s) for s in args.sizes.split(',')]:
+            with open(path, 'wb') as f:
+                for _ in range(size * (1 << 20) // len(block)):
+                    f.write(block)
+            counts = {}
+            for mode in ('read', 'stream', 'check'):
+                n, seconds, peak = rss_run(mode, path)
+                counts[mode] = n
+                print(f"{size:>5}  {mode:<7} {seconds:>8.2f} {peak:>12.1f}")
+            assert counts['read'] == counts['stream']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# token 缓冲区检查与基准：TokenBuffer 的 token 流与 streamlex 一致、解析结果一致，
+# 并比较每个 token 占用的内存（PLY LexToken / fastlex Token / 数组缓冲区）和扫描速度。
+#
+#   python benchmarks/token_buffer.py [--statements N]
+
+import argparse
+import contextlib
+import io
+import random
+import time
+import tracemalloc
+
+from corpus import shape, source
+from stream import fuzz
+
+import define
+import fastlex
+import gramma
+import streamlex
+from tokbuf import TokenBuffer
+
+
+def same_tokens(data):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        expected = [(t.type, t.value, t.lineno, t.lexpos) for t in streamlex.tokens(data)]
+    expected_out = out.getvalue()
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        buffer = TokenBuffer(data)
+    got = [(t.type, t.value, t.lineno, t.lexpos) for t in buffer]
+    assert got == expected and out.getvalue() == expected_out, data
+
+
+def allocated(build):
+    # 返回 (结果, 构建期间新分配并仍然存活的字节数)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def ply_tokens(text):
+    lexer = define.get_lexer()
+    lexer.lineno = 1
+    lexer.input(text)
+    return list(iter(lexer.token, None))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--statements', type=int, default=20000)
+    ap.add_argument('--fuzz', type=int, default=1000)
+    args = ap.parse_args()
+
+    rng = random.Random(12)
+    cases = [source(200, seed=s).encode() for s in range(10)]
+    cases += [fuzz(rng, rng.randint(1, 60)) for _ in range(args.fuzz)]
+    for data in cases:
+        same_tokens(data)
+    print(f"{len(cases)} differential cases: identical")
+
+    parser = gramma.get_parser()
+    text = source(3000, seed=2)
+    lexer = fastlex.get_lexer()
+    lexer.lineno = 1
+    expected = shape(parser.parse(text, lexer=lexer))
+    assert shape(parser.parse(lexer=TokenBuffer(text).lexer())) == expected
+    print("parser with TokenBuffer: identical AST")
+
+    text = source(args.statements, seed=1)
+    data = text.encode('utf-8')
+    rows = []
+    tokens, size = allocated(lambda: ply_tokens(text))
+    count = len(tokens)
+    rows.append(('ply LexToken', size))
+    del tokens
+    tokens, size = allocated(lambda: list(fastlex.tokenize(text)))
+    rows.append(('fastlex Token', size))
+    del tokens
+    buffer, size = allocated(lambda: TokenBuffer(data))
+    assert len(buffer) == count
+    rows.append(('TokenBuffer', size))
+    print(f"{count} tokens, source {len(data) / 1e6:.1f} MB "
+          f"(TokenBuffer arrays {buffer.nbytes() / count:.1f} bytes/token)")
+    print(f"{'storage':<14} {'bytes/token':>12}")
+    for name, size in rows:
+        print(f"{name:<14} {size / count:>12.1f}")
+
+    print(f"{'scan':<14} {'seconds':>8}")
+    for name, run in (('ply', lambda: ply_tokens(text)),
+                      ('fastlex', lambda: list(fastlex.tokenize(text))),
+                      ('TokenBuffer', lambda: TokenBuffer(data))):
+        best = min(timed(run) for _ in range(3))
+        print(f"{name:<14} {best:>8.3f}")
+
+
+def timed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
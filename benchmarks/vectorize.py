@@ -0,0 +1,162 @@
+# 批量求值检查与基准：随机表达式（二元运算和 ?: 随机不加括号）在随机列上批量求值，结果（包括 ++ 改过的列）
+# 与 evaluator 逐行求值完全一致；某一行会出错（例如被选中的除数为 0）时两边都报 EvalError。
+# 然后比较每秒处理的行数。
+#
+#   python benchmarks/vectorize.py [--expressions N] [--rows N]
+
+import argparse
+import contextlib
+import io
+import math
+import random
+import time
+
+import numpy as np
+
+import corpus  # noqa: F401  把仓库根目录加入 sys.path
+import evaluator
+import gramma
+import vectorize
+
+COLUMNS = [('a', 'int'), ('b', 'int'), ('c', 'char'), ('f', 'float'), ('g', 'double')]
+ARRAY = ('x', 'int', 4)
+
+
+def group(rng, text):
+    # 一半的二元运算和 ?: 不加括号，按 C 的优先级和结合性组合
+    return f"({text})" if rng.random() < 0.5 else text
+
+
+def expression(rng, depth, floating=False):
+    if depth == 0 or rng.random() < 0.2:
+        r = rng.random()
+        if r < 0.3:
+            return str(rng.randint(0, 40))
+        if floating and r < 0.4:
+            return f"{rng.randint(0, 9)}.{rng.randint(0, 99):02d}"
+        if r < 0.5:
+            return f"{ARRAY[0]}[({expression(rng, 1)}) & {rng.choice([3, 7])}]"     # & 7 可能越界
+        names = [n for n, t in COLUMNS if floating or t in ('int', 'char')]
+        return rng.choice(names)
+    left, right = expression(rng, depth - 1, floating), expression(rng, depth - 1, floating)
+    r = rng.random()
+    if not floating and r < 0.05:
+        return group(rng, f"{left} {rng.choice(['/', '%'])} {right}")         # 除数可能为 0
+    if not floating and r < 0.1:
+        # 只有被选中的行才做除法，其余行的除数为 0 也不算错
+        return f"(b ? ({left} {rng.choice(['/', '%'])} b) : {right})"
+    if not floating and r < 0.2:
+        return group(rng, f"{left} {rng.choice(['<<', '>>'])} ({right} & 31)")
+    if r < 0.35:
+        return group(rng, f"{expression(rng, depth - 1)} ? {left} : {right}")
+    if r < 0.45:
+        return group(rng, f"{left} {rng.choice(['&&', '||'])} {right}")
+    if r < 0.5:
+        return f"{rng.choice(['-', '!'])}({left})"
+    if r < 0.55:
+        name = rng.choice([n for n, t in COLUMNS if floating or t in ('int', 'char')])
+        return rng.choice([f"{name}++", f"++{name}"])
+    ops = ['+', '-', '*', '<', '>=', '==', '!='] + ([] if floating else ['&', '|', '^'])
+    return group(rng, f"{left} {rng.choice(ops)} {right}")
+
+
+def random_columns(rng, rows):
+    rs = np.random.default_rng(rng.randrange(1 << 30))
+    columns = {
+        'a': rs.integers(-(1 << 31), 1 << 31, rows, dtype=np.int64).astype(np.int32),
+        'b': rs.integers(-3, 4, rows).astype(np.int32),        # 经常为 0，用来检查掩码
+        'c': rs.integers(-128, 128, rows).astype(np.int8),
+        'f': (rs.standard_normal(rows) * 100).astype(np.float32),
+        'g': rs.standard_normal(rows) * 1e6,
+    }
+    columns[ARRAY[0]] = rs.integers(-100, 100, (rows, ARRAY[2])).astype(np.int32)
+    return columns
+
+
+def scalar_rows(node, columns, rows):
+    # 逐行用 evaluator 求值；返回 (每行结果, 每行求值后的变量)，任何一行出错返回 None
+    variables = {}
+    for slot, (name, ctype) in enumerate(COLUMNS):
+        variables[name] = evaluator.Variable(name, ctype, slot)
+    variables[ARRAY[0]] = evaluator.Variable(ARRAY[0], ARRAY[1], len(COLUMNS), ARRAY[2])
+    fn, _ = evaluator.compile_expression(node, variables)
+    results = []
+    states = []
+    for row in range(rows):
+        storage = [columns[name][row].item() for name, _ in COLUMNS]
+        storage.append(evaluator.array('i', columns[ARRAY[0]][row].tolist()))
+        try:
+            results.append(fn(storage))
+        except evaluator.EvalError:
+            return None
+        states.append(storage)
+    return results, states
+
+
+def same(x, y):
+    return x == y or (isinstance(x, float) and math.isnan(x) and math.isnan(y))
+
+
+def cross_check(parser, expressions, rows, rng):
+    checked = raised = 0
+    for _ in range(expressions):
+        text = expression(rng, 3, floating=rng.random() < 0.4)
+        node = vectorize.parse_expression(text, parser)
+        columns = random_columns(rng, rows)
+        try:
+            expected = scalar_rows(node, columns, rows)
+        except evaluator.EvalError:
+            # 类型错误在编译时就报，两边应该一致
+            expected = 'compile'
+        try:
+            result, after = vectorize.compile_batch(node).run(columns)
+        except evaluator.EvalError:
+            assert expected in (None, 'compile'), text
+            raised += 1
+            continue
+        assert expected not in (None, 'compile'), text
+        values, states = expected
+        got = result.tolist()
+        assert all(same(x, y) for x, y in zip(values, got)), (text, values, got)
+        for slot, (name, _) in enumerate(COLUMNS):
+            if name in after:
+                column = after[name].tolist()
+                assert all(same(state[slot], v) for state, v in zip(states, column)), (text, name)
+        checked += 1
+    print(f"cross-check: {checked} expressions identical on {rows} rows, {raised} raised EvalError in both")
+
+
+def bench(label, fn, rows):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<26}{rows / elapsed:>16,.0f} rows/s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--expressions', type=int, default=300)
+    ap.add_argument('--rows', type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = gramma.get_parser()
+    rng = random.Random(15)
+    cross_check(parser, args.expressions, 64, rng)
+
+    text = "(a * 3 + (b > 0 ? c : -c)) ^ ((b != 0 && a % b) << 2)"
+    node = vectorize.parse_expression(text, parser)
+    columns = random_columns(rng, args.rows)
+    batch = vectorize.compile_batch(node)
+    result = batch(columns)
+    sample = min(args.rows, 100_000)
+    values, _ = scalar_rows(node, columns, sample)
+    assert values == result[:sample].tolist()
+
+    print(f"\n{text}")
+    bench('vectorize', lambda: batch(columns), args.rows)
+    bench('evaluator, row by row', lambda: scalar_rows(node, columns, sample), sample)
+
+
+if __name__ == '__main__':
+    main()
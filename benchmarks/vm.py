@@ -0,0 +1,103 @@
+# 字节码虚拟机检查与基准：虚拟机的执行结果与 evaluator 一致（带类型的随机程序，开关优化和超级指令），
+# 然后在只有整数运算的长程序上比较吞吐量：树遍历解释器 / 闭包求值 / 三地址码解释 / 字节码虚拟机，
+# 最后给几千项的运算链计时编译和执行（正确性见 tests/test_vm.py）。
+#
+#   python benchmarks/vm.py [--programs N] [--statements N] [--runs N] [--chain N]
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from corpus import C_CASES, case_programs, int_program, typed_program, walk_program
+
+import evaluator
+import gramma
+import ir
+import vm
+
+
+def check(parser, programs):
+    rng = random.Random(17)
+    checked = 0
+    for text in case_programs()[0] + [typed_program(rng) for _ in range(programs)]:
+        tree = parser.parse(text)
+        program = evaluator.Program(tree)
+        try:
+            _, storage = program.run()
+        except evaluator.EvalError:
+            continue
+        expected = repr(program.values(storage))
+        for optimized in (False, True):
+            for superinstructions in (False, True):
+                bytecode = vm.compile_tree(tree, optimized, superinstructions)
+                assert repr(bytecode.values(bytecode.run())) == expected, (optimized, superinstructions)
+        checked += 1
+    print(f"{checked} typed programs ({len(C_CASES)} hand-written) identical to evaluator in all four VM configurations")
+
+
+def bench(label, fn, runs, statements, size=''):
+    fn()
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30}{size:>8}{runs * statements / elapsed:>16,.0f} statements/s")
+
+
+def deep_chain(parser, terms, runs):
+    # 左结合的长运算链：翻译、优化、生成字节码都不按层递归
+    # x 从数组里读出，优化后也不会被折叠成常量
+    text = f"int a[1] = 3; int x = a[0], y, z; y = {' + '.join(['x'] * terms)}; z = {' - '.join(['y * x'] * terms)};"
+    tree = parser.parse(text)
+    expected = evaluator.evaluate(text)
+    print(f"\nchains of {terms} terms")
+    for optimized in (False, True):
+        start = time.perf_counter()
+        bytecode = vm.compile_tree(tree, optimized)
+        elapsed = time.perf_counter() - start
+        assert bytecode.values(bytecode.run()) == expected
+        label = 'optimised IR' if optimized else 'plain IR'
+        print(f"{label:<30}{len(bytecode):>8}{elapsed * 1000:>12.1f} ms to compile")
+        bench(f'vm, {label}', bytecode.run, runs, 4, str(len(bytecode)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--programs', type=int, default=300)
+    ap.add_argument('--statements', type=int, default=200)
+    ap.add_argument('--runs', type=int, default=50)
+    ap.add_argument('--chain', type=int, default=3000)
+    args = ap.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = gramma.get_parser()
+    check(parser, args.programs)
+
+    tree = parser.parse(int_program(random.Random(17), args.statements, inputs=True))
+    statements = len(tree.children)
+    program = evaluator.Program(tree)
+    lowered = ir.lower(tree)
+    optimized = ir.optimize(lowered)
+    plain = vm.compile_ir(lowered, superinstructions=False)
+    fast = vm.compile_ir(optimized, superinstructions=False)
+    fused = vm.compile_ir(optimized)
+    expected = walk_program(tree)
+    for bytecode in (plain, fast, fused):
+        assert bytecode.values(bytecode.run()) == expected
+
+    print(f"\n{statements} statements, int arithmetic, inputs read from an array")
+    print(f"{'':<30}{'instrs':>8}")
+    bench('AST walker', lambda: walk_program(tree), args.runs, statements)
+    bench('evaluator closures', program.run, args.runs, statements)
+    bench('three-address interpreter', lambda: ir.run(optimized), args.runs, statements, str(len(optimized)))
+    bench('vm', plain.run, args.runs, statements, str(len(plain)))
+    bench('vm, optimised IR', fast.run, args.runs, statements, str(len(fast)))
+    bench(f'vm, + {fused.fused} superinstructions', fused.run, args.runs, statements, str(len(fused)))
+
+    deep_chain(parser, args.chain, args.runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+import struct
+import sys
+from array import array
+
+from gramma import ASTNode
+
+# AST 的二进制编码：在进程之间传递或写进磁盘缓存时代替 pickle。pickle 递归地遍历嵌套的 ASTNode，
+# 又慢又可能超出递归上限；这里编码是显式栈上的一次前序遍历，解码是对节点数组的一次倒序扫描。
+#
+#   data = encode(tree)             # bytes；tree 为 None 时得到 0 个节点
+#   tree = decode(data)             # 还原成 gramma.ASTNode，与原树逐节点相同
+#   view = BinaryAST(data)          # 不构造节点，直接在 memoryview 上按下标读
+#   view.node_type(0), view.value(0), view.child_count[0], list(view.children(0)), view.to_ast(i)
+#
+# 文件布局（小端）：
+#   header       MAGIC, VERSION, 三个节点数组的元素类型, 节点数、节点类型数、常量数、常量数据字节数
+#   types        节点类型名（长度前缀的 utf-8）
+#   kinds        每个常量一个字节：s 字符串、i int64、f 双精度浮点、n 超出 int64 的整数（十进制文本）
+#   offsets      uint32，常量 k 的内容是 data[offsets[k]:offsets[k + 1]]
+#   data         常量内容
+#   type_code    前序排列的节点：类型编号，等于类型数时表示 None 子节点
+#   child_count  子节点个数
+#   value_index  常量编号 + 1，0 表示没有值
+# 三个节点数组按各自的最大值选用 B / H / I。相同的常量只存一份，1、1.0、-0.0、0.0 各不相同。
+
+MAGIC = b'BAST'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sH3s3x4I')
+_MISSING = object()
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+
+
+def _width(values):
+    top = max(values, default=0)
+    return 'B' if top < 1 << 8 else 'H' if top < 1 << 16 else 'I'
+
+
+def _pack(typecode, values):
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _pad(blob):
+    return blob + b'\0' * (-len(blob) % 4)
+
+
+def _constant(value):
+    # (去重用的键, 类型字节, 内容)
+    kind = type(value)
+    if kind is str:
+        return (str, value), b's', value.encode('utf-8')
+    if kind is int:
+        if -1 << 63 <= value < 1 << 63:
+            return (int, value), b'i', _INT.pack(value)
+        return (int, value), b'n', str(value).encode('ascii')
+    if kind is float:
+        blob = _FLOAT.pack(value)
+        return (float, blob), b'f', blob
+    raise ValueError(f"无法编码 {kind.__name__} 类型的节点值：{value!r}")
+
+
+def encode(tree):
+    type_ids = {}
+    const_ids = {}
+    kinds = bytearray()
+    offsets = [0]
+    blobs = []
+    node_type = []
+    child_count = []
+    node_value = []
+
+    stack = [tree] if tree is not None else []
+    while stack:
+        node = stack.pop()
+        if node is None:
+            node_type.append(-1)
+            child_count.append(0)
+            node_value.append(0)
+            continue
+        code = type_ids.get(node.node_type)
+        if code is None:
+            code = type_ids[node.node_type] = len(type_ids)
+        node_type.append(code)
+        children = node.children
+        child_count.append(len(children))
+        value = node.value
+        if value is None:
+            node_value.append(0)
+        else:
+            key, kind, blob = _constant(value)
+            index = const_ids.get(key)
+            if index is None:
+                index = const_ids[key] = len(const_ids)
+                kinds += kind
+                blobs.append(blob)
+                offsets.append(offsets[-1] + len(blob))
+            node_value.append(index + 1)
+        stack.extend(reversed(children))
+
+    # None 子节点的类型编号放在所有类型之后
+    ntypes = len(type_ids)
+    node_type = [ntypes if code < 0 else code for code in node_type]
+    widths = (_width(node_type), _width(child_count), _width(node_value))
+    names = b''.join(struct.pack('<H', len(n.encode('utf-8'))) + n.encode('utf-8') for n in type_ids)
+    data = b''.join(blobs)
+    header = _HEADER.pack(MAGIC, VERSION, ''.join(widths).encode('ascii'),
+                          len(node_type), ntypes, len(const_ids), len(data))
+    return b''.join([
+        header,
+        _pad(names),
+        _pad(bytes(kinds)),
+        _pack('I', offsets),
+        _pad(data),
+        _pad(_pack(widths[0], node_type)),
+        _pad(_pack(widths[1], child_count)),
+        _pad(_pack(widths[2], node_value)),
+    ])
+
+
+class BinaryAST:
+    # data 可以是 bytes、bytearray、mmap 或 memoryview；只切片，不复制
+    def __init__(self, data):
+        buf = memoryview(data)
+        magic, version, widths, nnodes, ntypes, nconsts, ndata = _HEADER.unpack_from(buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("不是可识别的二进制 AST")
+        pos = _HEADER.size
+
+        types = []
+        for _ in range(ntypes):
+            (n,) = struct.unpack_from('<H', buf, pos)
+            types.append(sys.intern(str(buf[pos + 2:pos + 2 + n], 'utf-8')))
+            pos += 2 + n
+        pos += -pos % 4
+        self.types = types + [None]
+
+        def section(typecode, count, itemsize=None):
+            nonlocal pos
+            size = (itemsize or array(typecode).itemsize) * count
+            if pos + size > len(buf):
+                raise ValueError("二进制 AST 被截断")
+            view = buf[pos:pos + size]
+            pos += size + (-size % 4)
+            if typecode is None:
+                return view
+            if sys.byteorder == 'big':
+                data = array(typecode, view.tobytes())
+                data.byteswap()
+                return data
+            return view.cast(typecode)
+
+        self.kinds = section(None, nconsts, 1)
+        self.offsets = section('I', nconsts + 1)
+        self.data = section(None, ndata, 1)
+        type_width, count_width, value_width = widths.decode('ascii')
+        self.type_code = section(type_width, nnodes)
+        self.child_count = section(count_width, nnodes)
+        self.value_index = section(value_width, nnodes)
+        self.nbytes = pos
+        self._constants = [_MISSING] * nconsts
+        self._ends = None
+
+    def __len__(self):
+        return len(self.type_code)
+
+    def constant(self, k):
+        if self._constants[k] is _MISSING:
+            blob = self.data[self.offsets[k]:self.offsets[k + 1]]
+            kind = self.kinds[k]
+            if kind == ord('s'):
+                value = str(blob, 'utf-8')
+            elif kind == ord('i'):
+                (value,) = _INT.unpack(blob)
+            elif kind == ord('f'):
+                (value,) = _FLOAT.unpack(blob)
+            elif kind == ord('n'):
+                value = int(str(blob, 'ascii'))
+            else:
+                raise ValueError(f"未知的常量类型 {kind}")
+            self._constants[k] = value
+        return self._constants[k]
+
+    def node_type(self, i):
+        return self.types[self.type_code[i]]
+
+    def value(self, i):
+        v = self.value_index[i]
+        return self.constant(v - 1) if v else None
+
+    def children(self, i):
+        # 子节点在前序数组中的下标；需要每棵子树的结束位置，第一次调用时扫描一遍计算
+        ends = self.ends()
+        j = i + 1
+        for _ in range(self.child_count[i]):
+            yield j
+            j = ends[j]
+
+    def ends(self):
+        # ends[i]：以 i 为根的子树之后的第一个下标
+        if self._ends is None:
+            n = len(self)
+            ends = array('I', bytes(4 * n))
+            counts = self.child_count
+            stack = []
+            for i in range(n - 1, -1, -1):
+                end = i + 1
+                for _ in range(counts[i]):
+                    end = stack.pop()
+                stack.append(end)
+                ends[i] = end
+            self._ends = ends
+        return self._ends
+
+    def to_ast(self, i=0):
+        # 倒序扫描 [i, 子树结束)：子节点总是先于父节点构造好
+        n = len(self)
+        if i >= n:
+            return None
+        end = self.ends()[i] if i else n
+        types = self.types
+        type_code = self.type_code
+        counts = self.child_count
+        values = self.value_index
+        constant = self.constant
+        none = len(types) - 1
+        stack = []
+        for j in range(end - 1, i - 1, -1):
+            code = type_code[j]
+            if code == none:
+                stack.append(None)
+                continue
+            k = counts[j]
+            if k:
+                children = stack[-k:]
+                children.reverse()
+                del stack[-k:]
+            else:
+                children = []
+            v = values[j]
+            stack.append(ASTNode(types[code], children, constant(v - 1) if v else None))
+        return stack[0]
+
+
+def decode(data):
+    return BinaryAST(data).to_ast()
@@ -0,0 +1,405 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# parsetab.py 的二进制替代：把 _lr_action / _lr_goto 压成定长 int16 数组，
+# 用 mmap 打开后由 BinaryParser 直接按下标查表，加载时不构建任何字典。
+# 好处在加载：不执行 parsetab.py、不构建 action / goto 字典，适合频繁启动的短进程（batch 的 worker、
+# CI 里逐个文件检查）；BinaryParser 解析时也直接按下标读 mmap 里的表，不展开成 list，解析速度与 parsetab 相当，
+# 长时间运行的进程用哪种都一样。
+#
+# 文件布局（小端）：
+#   header       MAGIC, VERSION, 各段长度
+#   signature    _lr_signature 原文（utf-8），与 ply 一样按全文比较
+#   names        终结符、非终结符、动作函数名（长度前缀的 utf-8）
+#   action_base  int32，状态 -> 该状态 action 行在 action 中的起始下标
+#   goto_base    int32，状态 -> 该状态 goto 行在 goto 中的起始下标
+#   prod_lhs     每条产生式左部的非终结符编号
+#   prod_len     每条产生式右部长度
+#   prod_func    每条产生式动作函数在 names 中的编号（-1 表示无）
+#   defaulted    每个状态的默认归约（无则为 NO_ACTION）
+#   action       去重后的 action 行，每行 nterms 个格子
+#   goto         去重后的 goto 行，每行 nnonterms 个格子
+
+MAGIC = b'PLYB'
+VERSION = 1
+
+# action 格子：>0 移进到该状态，<0 按 -值 号产生式归约，0 接受
+NO_ACTION = -32768
+NO_GOTO = -1
+
+_HEADER = struct.Struct('<4sH2x9I')
+
+
+def grammar_signature(module):
+    # 与 ply.yacc.ParserReflect.signature() 的拼法一致，但不需要导入 ply.yacc
+    parts = []
+    start = getattr(module, 'start', None)
+    if start:
+        parts.append(start)
+    precedence = getattr(module, 'precedence', None)
+    if precedence:
+        parts.append(''.join(''.join(p) for p in precedence))
+    parts.append(' '.join(sorted(module.tokens)))
+    funcs = []
+    for name, item in vars(module).items():
+        if name.startswith('p_') and name != 'p_error' and callable(item):
+            funcs.append((item.__code__.co_firstlineno, name, item.__doc__))
+    funcs.sort(key=lambda f: (f[0], f[1]))
+    parts.extend(doc for _, _, doc in funcs if doc)
+    return ''.join(parts)
+
+
+def _dedup_rows(rows):
+    index = {}
+    row_of_state = []
+    for row in rows:
+        key = tuple(row)
+        if key not in index:
+            index[key] = len(index)
+        row_of_state.append(index[key])
+    flat = []
+    for key in index:
+        flat.extend(key)
+    return row_of_state, flat
+
+
+def _pack(typecode, values, what):
+    try:
+        data = array(typecode, values)
+    except OverflowError:
+        raise ValueError(f"{what} 超出 {typecode!r} 数组的取值范围") from None
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _pad(blob):
+    return blob + b'\0' * (-len(blob) % 4)
+
+
+def write_tables(path, lr_action, lr_goto, productions, signature):
+    # lr_action / lr_goto / productions 即 ply.yacc.LRParser 的 action / goto / productions
+    terms = {'$end', 'error'}
+    for row in lr_action.values():
+        terms.update(row)
+    terms = sorted(terms)
+    nonterms = set()
+    for row in lr_goto.values():
+        nonterms.update(row)
+    nonterms.update(p.name for p in productions)
+    nonterms = sorted(nonterms)
+    term_index = {name: i for i, name in enumerate(terms)}
+    nonterm_index = {name: i for i, name in enumerate(nonterms)}
+
+    nstates = max(max(lr_action), max(lr_goto, default=0)) + 1
+
+    funcs = sorted({p.func for p in productions if p.func})
+    names = terms + nonterms + funcs
+    func_index = {name: len(terms) + len(nonterms) + i for i, name in enumerate(funcs)}
+
+    action_rows = []
+    defaulted = []
+    for state in range(nstates):
+        row = [NO_ACTION] * len(terms)
+        actions = lr_action.get(state, {})
+        for term, t in actions.items():
+            row[term_index[term]] = t
+        action_rows.append(row)
+        only = list(actions.values())
+        defaulted.append(only[0] if len(only) == 1 and only[0] < 0 else NO_ACTION)
+
+    goto_rows = []
+    for state in range(nstates):
+        row = [NO_GOTO] * len(nonterms)
+        for nonterm, target in lr_goto.get(state, {}).items():
+            row[nonterm_index[nonterm]] = target
+        goto_rows.append(row)
+
+    action_row, action_flat = _dedup_rows(action_rows)
+    goto_row, goto_flat = _dedup_rows(goto_rows)
+
+    signature_blob = _pad(signature.encode('utf-8'))
+    name_blob = _pad(b''.join(struct.pack('<H', len(n.encode('utf-8'))) + n.encode('utf-8') for n in names))
+
+    sections = [
+        _pack('i', [r * len(terms) for r in action_row], 'action_base'),
+        _pack('i', [r * len(nonterms) for r in goto_row], 'goto_base'),
+        _pack('h', [nonterm_index[p.name] for p in productions], 'prod_lhs'),
+        _pack('h', [p.len for p in productions], 'prod_len'),
+        _pack('h', [func_index[p.func] if p.func else -1 for p in productions], 'prod_func'),
+        _pack('h', defaulted, 'defaulted'),
+        _pack('h', action_flat, 'action'),
+        _pack('h', goto_flat, 'goto'),
+    ]
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(signature.encode('utf-8')), len(signature_blob),
+        len(terms), len(nonterms), len(funcs), nstates, len(productions),
+        len(action_flat), len(goto_flat),
+    )
+
+    # 先写临时文件再替换，避免并发启动的 worker 读到写了一半的文件
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        f.write(signature_blob)
+        f.write(name_blob)
+        for section in sections:
+            f.write(section)
+    os.replace(tmp, path)
+
+
+class BinaryTables:
+    def __init__(self, path, signature=None):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        (magic, version, signature_len, signature_bytes, nterms, nnonterms, nfuncs,
+         nstates, nprods, naction, ngoto) = _HEADER.unpack_from(buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} 不是可识别的二进制分析表")
+        pos = _HEADER.size
+        if signature is not None and buf[pos:pos + signature_len] != signature.encode('utf-8'):
+            raise ValueError(f"{path} 与当前文法签名不一致")
+        pos += signature_bytes
+
+        names = []
+        for _ in range(nterms + nnonterms + nfuncs):
+            (n,) = struct.unpack_from('<H', buf, pos)
+            names.append(str(buf[pos + 2:pos + 2 + n], 'utf-8'))
+            pos += 2 + n
+        pos += -pos % 4
+
+        def section(typecode, count):
+            nonlocal pos
+            size = array(typecode).itemsize * count
+            view = buf[pos:pos + size]
+            pos += size
+            if sys.byteorder == 'big':
+                data = array(typecode, view.tobytes())
+                data.byteswap()
+                return data
+            return view.cast(typecode)
+
+        self.terms = names[:nterms]
+        self.nonterms = names[nterms:nterms + nnonterms]
+        self.funcs = names[nterms + nnonterms:]
+        self.nterms = nterms
+        self.nnonterms = nnonterms
+        self.nstates = nstates
+        self.action_base = section('i', nstates)
+        self.goto_base = section('i', nstates)
+        self.prod_lhs = section('h', nprods)
+        self.prod_len = section('h', nprods)
+        self.prod_func = section('h', nprods)
+        self.defaulted = section('h', nstates)
+        self.action = section('h', naction)
+        self.goto = section('h', ngoto)
+        self.size = len(self._mm)
+
+
+class _Symbol:
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value=None):
+        self.type = type
+        self.value = value
+
+
+class _Production:
+    # 与 ply.yacc.YaccProduction 相同的接口，供 p_* 动作函数使用
+    def __init__(self, lexer, parser):
+        self.slice = None
+        self.stack = None
+        self.lexer = lexer
+        self.parser = parser
+
+    def __getitem__(self, n):
+        if isinstance(n, slice):
+            return [s.value for s in self.slice[n]]
+        return self.slice[n].value if n >= 0 else self.stack[n].value
+
+    def __setitem__(self, n, v):
+        self.slice[n].value = v
+
+    def __len__(self):
+        return len(self.slice)
+
+    def lineno(self, n):
+        return getattr(self.slice[n], 'lineno', 0)
+
+    def lexpos(self, n):
+        return getattr(self.slice[n], 'lexpos', 0)
+
+
+class BinaryParser:
+    # 解析循环直接按下标读 BinaryTables 的 memoryview：action[action_base[状态] + 终结符]、
+    # goto[goto_base[状态] + 非终结符]，不展开成 list
+    def __init__(self, tables, module):
+        self.tables = tables
+        self.term_index = {name: i for i, name in enumerate(tables.terms)}
+        names = tables.terms + tables.nonterms + tables.funcs
+        self.callables = [getattr(module, names[f]) if f >= 0 else None for f in tables.prod_func]
+        self.errorfunc = getattr(module, 'p_error', None)
+        self.errorok = False
+
+        self.productions = [(tables.nonterms[lhs], lhs, n) for lhs, n in zip(tables.prod_lhs, tables.prod_len)]
+
+    def errok(self):
+        self.errorok = True
+
+    def parse(self, input=None, lexer=None, debug=False, tracking=False, tokenfunc=None):
+        # 逐行对应 ply.yacc.LRParser.parseopt_notrack，包括错误恢复的行为
+        tables = self.tables
+        action, action_base = tables.action, tables.action_base
+        goto, goto_base = tables.goto, tables.goto_base
+        defaulted = tables.defaulted
+        productions = self.productions
+        callables = self.callables
+        term_index = self.term_index
+
+        if not lexer:
+            import ply.lex as lex
+            lexer = lex.lexer
+        if input is not None:
+            lexer.input(input)
+        get_token = lexer.token if tokenfunc is None else tokenfunc
+        self.token = get_token
+
+        pslice = _Production(lexer, self)
+        lookahead = None
+        lookaheadstack = []
+        errorcount = 0
+        errtoken = None
+        statestack = [0]
+        symstack = [_Symbol('$end')]
+        pslice.stack = symstack
+        self.statestack = statestack
+        self.symstack = symstack
+        state = 0
+
+        while True:
+            t = defaulted[state]
+            if t == NO_ACTION:
+                if not lookahead:
+                    if not lookaheadstack:
+                        lookahead = get_token()
+                    else:
+                        lookahead = lookaheadstack.pop()
+                    if not lookahead:
+                        lookahead = _Symbol('$end')
+                ti = term_index.get(lookahead.type)
+                t = NO_ACTION if ti is None else action[action_base[state] + ti]
+
+            if t != NO_ACTION:
+                if t > 0:
+                    statestack.append(t)
+                    state = t
+                    symstack.append(lookahead)
+                    lookahead = None
+                    if errorcount:
+                        errorcount -= 1
+                    continue
+
+                if t < 0:
+                    name, lhs, plen = productions[-t]
+                    sym = _Symbol(name)
+                    if plen:
+                        targ = symstack[-plen - 1:]
+                        targ[0] = sym
+                    else:
+                        targ = [sym]
+                    pslice.slice = targ
+                    try:
+                        if plen:
+                            del symstack[-plen:]
+                        self.state = state
+                        callables[-t](pslice)
+                        if plen:
+                            del statestack[-plen:]
+                        symstack.append(sym)
+                        state = goto[goto_base[statestack[-1]] + lhs]
+                        statestack.append(state)
+                    except SyntaxError:
+                        lookaheadstack.append(lookahead)
+                        if plen:
+                            symstack.extend(targ[1:-1])
+                        statestack.pop()
+                        state = statestack[-1]
+                        sym.type = 'error'
+                        sym.value = 'error'
+                        lookahead = sym
+                        errorcount = 3
+                        self.errorok = False
+                    continue
+
+                return getattr(symstack[-1], 'value', None)
+
+            if errorcount == 0 or self.errorok:
+                errorcount = 3
+                self.errorok = False
+                errtoken = lookahead
+                if errtoken.type == '$end':
+                    errtoken = None
+                if self.errorfunc:
+                    if errtoken and not hasattr(errtoken, 'lexer'):
+                        errtoken.lexer = lexer
+                    self.state = state
+                    tok = self.errorfunc(errtoken)
+                    if self.errorok:
+                        lookahead = tok
+                        errtoken = None
+                        continue
+                elif errtoken:
+                    sys.stderr.write(f'yacc: Syntax error at line {getattr(errtoken, "lineno", 0)}, token={errtoken.type}\n')
+                else:
+                    sys.stderr.write('yacc: Parse error in input. EOF\n')
+                    return
+            else:
+                errorcount = 3
+
+            if len(statestack) <= 1 and lookahead.type != '$end':
+                lookahead = None
+                errtoken = None
+                state = 0
+                del lookaheadstack[:]
+                continue
+
+            if lookahead.type == '$end':
+                return
+
+            if lookahead.type != 'error':
+                if symstack[-1].type == 'error':
+                    lookahead = None
+                    continue
+                err = _Symbol('error', lookahead)
+                if hasattr(lookahead, 'lineno'):
+                    err.lineno = lookahead.lineno
+                if hasattr(lookahead, 'lexpos'):
+                    err.lexpos = lookahead.lexpos
+                lookaheadstack.append(lookahead)
+                lookahead = err
+            else:
+                symstack.pop()
+                statestack.pop()
+                state = statestack[-1]
+
+
+def default_path(module):
+    return os.path.join(os.path.dirname(os.path.abspath(module.__file__)), 'parsetab.bin')
+
+
+def load_parser(module, path=None):
+    # 签名一致时直接 mmap 现有文件；否则用 ply 生成一次 LALR 表并写出二进制文件
+    path = path or default_path(module)
+    signature = grammar_signature(module)
+    try:
+        tables = BinaryTables(path, signature)
+    except (OSError, ValueError):
+        import ply.yacc as yacc
+        lr = yacc.yacc(module=module, debug=False)
+        write_tables(path, lr.action, lr.goto, lr.productions, signature)
+        tables = BinaryTables(path, signature)
+    return BinaryParser(tables, module)
@@ -0,0 +1,227 @@
+import sys
+from array import array
+from enum import IntEnum
+
+from gramma import ASTNode
+
+# 紧凑 AST：运算符不再是单独的子节点，而是以一个字节的编码存在父节点上。
+#
+#   compact(tree)  ->  CompactNode 树（__slots__，children 为元组）
+#   Arena(tree)    ->  所有节点按层序排成若干平行数组，一个节点就是一行
+
+
+class Op(IntEnum):
+    NONE = 0
+    PLUS = 1
+    MINUS = 2
+    MUL = 3
+    DIV = 4
+    MOD = 5
+    INCREMENT = 6
+    DECREMENT = 7
+    LESS_THAN = 8
+    GREATER_THAN = 9
+    LESS_EQUALS = 10
+    GREATER_EQUALS = 11
+    EQUALS = 12
+    NOT_EQUALS = 13
+    LOGICAL_AND = 14
+    LOGICAL_OR = 15
+    LOGICAL_NOT = 16
+    BITWISE_AND = 17
+    BITWISE_OR = 18
+    BITWISE_XOR = 19
+    BITWISE_NOT = 20
+    SHIFT_LEFT = 21
+    SHIFT_RIGHT = 22
+    ASSIGN = 23
+    CONDITIONAL = 24
+
+
+OP_CODES = {
+    '+': Op.PLUS, '-': Op.MINUS, '*': Op.MUL, '/': Op.DIV, '%': Op.MOD,
+    '++': Op.INCREMENT, '--': Op.DECREMENT,
+    '<': Op.LESS_THAN, '>': Op.GREATER_THAN, '<=': Op.LESS_EQUALS, '>=': Op.GREATER_EQUALS,
+    '==': Op.EQUALS, '!=': Op.NOT_EQUALS,
+    '&&': Op.LOGICAL_AND, '||': Op.LOGICAL_OR, '!': Op.LOGICAL_NOT,
+    '&': Op.BITWISE_AND, '|': Op.BITWISE_OR, '^': Op.BITWISE_XOR, '~': Op.BITWISE_NOT,
+    '<<': Op.SHIFT_LEFT, '>>': Op.SHIFT_RIGHT,
+    '=': Op.ASSIGN, '?': Op.CONDITIONAL,
+}
+OP_SYMBOLS = {code: symbol for symbol, code in OP_CODES.items()}
+
+# 父节点类型 -> (运算符子节点的类型, 它在 children 中的位置)
+OPERATOR_SLOTS = {
+    'UnaryExpression': ('Operator', 0),
+    'PostfixExpression': ('Operator', 1),
+    'AssignmentExpression': ('AssignmentOperator', 1),
+    'ConditionalExpression': ('ConditionalOperator', 1),
+    'LogicalOrExpression': ('LogicalOrOperator', 1),
+    'LogicalAndExpression': ('LogicalAndOperator', 1),
+    'BitwiseOrExpression': ('BitwiseOrOperator', 1),
+    'BitwiseXorExpression': ('BitwiseXorOperator', 1),
+    'BitwiseAndExpression': ('BitwiseAndOperator', 1),
+    'EqualityExpression': ('EqualityOperator', 1),
+    'RelationalExpression': ('RelationalOperator', 1),
+    'ShiftExpression': ('ShiftOperator', 1),
+    'AdditiveExpression': ('AdditiveOperator', 1),
+    'MultiplicativeExpression': ('MultiplicativeOperator', 1),
+}
+
+
+class CompactNode:
+    __slots__ = ('node_type', 'children', 'value', 'op')
+
+    def __init__(self, node_type, children=(), value=None, op=Op.NONE):
+        self.node_type = sys.intern(node_type)
+        self.children = children
+        self.value = value
+        self.op = op
+
+    @property
+    def operator(self):
+        return OP_SYMBOLS.get(self.op)
+
+
+def _split_operator(node):
+    slot = OPERATOR_SLOTS.get(node.node_type)
+    if slot is None:
+        return Op.NONE, node.children
+    wrapper, index = slot
+    children = node.children
+    if index < len(children):
+        op_node = children[index]
+        if op_node is not None and op_node.node_type == wrapper and not op_node.children:
+            code = OP_CODES.get(op_node.value)
+            if code is not None:
+                return code, children[:index] + children[index + 1:]
+    return Op.NONE, children
+
+
+def compact(tree):
+    # 后序、显式栈，深树也不会触发递归上限
+    if tree is None:
+        return None
+    done = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node is None or id(node) in done:
+            continue
+        op, children = _split_operator(node)
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((c, False) for c in children)
+            continue
+        done[id(node)] = CompactNode(
+            node.node_type,
+            tuple(None if c is None else done[id(c)] for c in children),
+            compact(node.value) if isinstance(node.value, ASTNode) else node.value,
+            op,
+        )
+    return done[id(tree)]
+
+
+def expand(node):
+    # compact() 的逆过程，还原成 gramma.ASTNode
+    if node is None:
+        return None
+    done = {}
+    stack = [(node, False)]
+    while stack:
+        n, expanded = stack.pop()
+        if n is None or id(n) in done:
+            continue
+        if not expanded:
+            stack.append((n, True))
+            stack.extend((c, False) for c in n.children)
+            continue
+        children = [None if c is None else done[id(c)] for c in n.children]
+        if n.op:
+            wrapper, index = OPERATOR_SLOTS[n.node_type]
+            children.insert(index, ASTNode(wrapper, value=OP_SYMBOLS[n.op]))
+        value = expand(n.value) if isinstance(n.value, CompactNode) else n.value
+        done[id(n)] = ASTNode(n.node_type, children, value)
+    return done[id(node)]
+
+
+class Arena:
+    # 层序排列：同一父节点的子节点下标连续，children(i) 是一个 range。
+    # 值放在去重后的 values 表里，节点只记下标（-1 表示没有值）。
+    def __init__(self, tree):
+        self.types = []
+        self.values = []
+        self.type_code = array('B')
+        self.value_index = array('i')
+        self.op = array('B')
+        self.first_child = array('i')
+        self.child_count = array('i')
+
+        type_ids = {}
+        value_ids = {}
+        if tree is None:
+            return
+        queue = [tree]
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            op, children = _split_operator(node)
+            if node.node_type not in type_ids:
+                type_ids[node.node_type] = len(self.types)
+                self.types.append(node.node_type)
+            self.type_code.append(type_ids[node.node_type])
+
+            value = node.value
+            if value is None:
+                self.value_index.append(-1)
+            else:
+                if isinstance(value, ASTNode):
+                    value = Arena(value)
+                key = (type(value), value) if not isinstance(value, Arena) else id(value)
+                if key not in value_ids:
+                    value_ids[key] = len(self.values)
+                    self.values.append(value)
+                self.value_index.append(value_ids[key])
+
+            self.op.append(op)
+            children = [c for c in children if c is not None]
+            self.first_child.append(len(queue))
+            self.child_count.append(len(children))
+            queue.extend(children)
+
+    def __len__(self):
+        return len(self.type_code)
+
+    def node_type(self, i):
+        return self.types[self.type_code[i]]
+
+    def value(self, i):
+        v = self.value_index[i]
+        return None if v < 0 else self.values[v]
+
+    def operator(self, i):
+        return OP_SYMBOLS.get(self.op[i])
+
+    def children(self, i):
+        first = self.first_child[i]
+        return range(first, first + self.child_count[i])
+
+    def nbytes(self):
+        arrays = (self.type_code, self.value_index, self.op, self.first_child, self.child_count)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    def to_ast(self):
+        if not len(self):
+            return None
+        nodes = {}
+        for j in reversed(range(len(self))):
+            value = self.value(j)
+            if isinstance(value, Arena):
+                value = value.to_ast()
+            children = [nodes.pop(c) for c in self.children(j)]
+            if self.op[j]:
+                wrapper, index = OPERATOR_SLOTS[self.node_type(j)]
+                children.insert(index, ASTNode(wrapper, value=OP_SYMBOLS[self.op[j]]))
+            nodes[j] = ASTNode(self.node_type(j), children, value)
+        return nodes[0]
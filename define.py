@@ -1,4 +1,4 @@
-import ply.lex as lex
+import sys
 
 #define lexical unit
 
@@ -78,6 +78,13 @@ def t_IDENTIFIER(t):
     t.type = reserved.get(t.value, 'IDENTIFIER')
     return t
 
+# 浮点常量必须排在整数常量前面，否则 1.5 会被切成 1 . 5；
+# 负号总是由 t_MINUS 单独识别，这里不再包含
+def t_FLOAT(t):
+    r'\d+\.\d+'
+    t.value = float(t.value)
+    return t
+
 def t_CONSTANT(t):
     r'\d+'
     t.value = int(t.value)
@@ -87,11 +94,6 @@ def t_STRING_CONSTANT(t):
     r'"[^"]*"'
     return t
 
-def t_FLOAT(t):
-    r'-?\d+(\.\d+)?'
-    t.value = float(t.value)
-    return t
-
 def t_DOUBLE(t):
     r'double'
     return t
@@ -100,5 +102,19 @@ def t_error(t):
     print(f"Illegal character '{t.value[0]}' at line {t.lineno}")
     t.lexer.skip(1)
 
-lexer = lex.lex()
+_lexer = None
+
+def get_lexer():
+    # 词法分析器在首次使用时构建，import define 本身不做任何工作
+    global _lexer
+    if _lexer is None:
+        import ply.lex as lex
+        _lexer = lex.lex(module=sys.modules[__name__])
+    return _lexer
+
+def __getattr__(name):
+    if name == 'lexer':
+        return get_lexer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import struct
+import time
+
+import binast
+import bintab
+import define
+import gramma
+
+# 磁盘上的解析结果缓存：CI 每次都要检查大量没有改动过的文件，解析结果（AST 和错误信息）按源码的哈希
+# 存成文件，下次直接读回。多个进程（batch 的 worker、同时跑的几个 CI 任务）可以共用同一个目录。
+#
+#   cache = DiskCache('.parse_cache', max_bytes=256 << 20, tables='parsetab')
+#   key = cache.key(text)
+#   hit = cache.get(key)                 # (binast.BinaryAST, errors) 或 None；需要树时 hit[0].to_ast()
+#   if hit is None:
+#       cache.put(key, tree, errors)
+#   cache.trim()                         # 按最近使用时间淘汰，总大小不超过 max_bytes
+#   cache.stats()
+#
+# 键是以 parse_signature(tables) 为密钥的 blake2b(源码)：签名包含解析器后端（get_parser 的 tables）、
+# ply 的 _lr_signature、define 的词法规则、规则函数和 p_error / t_error 的字节码，文法、词法或建树方式一改，
+# 旧的缓存项自然都不再命中，由 trim() 淘汰；换一个后端检查时也不会读到别的后端的结果。
+#
+# 目录布局：<directory>/<键的前 2 个十六进制字符>/<其余字符>，每个文件是 header、错误信息（换行分隔的 utf-8，
+# 补齐到 4 字节）和 binast 编码的 AST。读出来的 AST 不还原成节点，只统计语句数之类的用法直接在 memoryview 上读。
+# 写入先写临时文件再 os.replace，读到的文件要么完整要么不存在；命中时更新 mtime，trim() 按 mtime 淘汰最旧的。
+# 别的进程正在淘汰的文件读不到，按未命中处理。
+
+MAGIC = b'PCDC'
+VERSION = 2
+
+_HEADER = struct.Struct('<4sH2x3I')
+_STALE_TMP = 3600               # 超过这么多秒的临时文件是写到一半崩溃的进程留下的
+
+
+def _code_key(fn):
+    # 字节码、常量和引用的名字；不含文件名和行号，换个目录检出也能命中
+    code = fn.__code__
+    consts = tuple(c for c in code.co_consts if not hasattr(c, 'co_code'))
+    return f"{code.co_code.hex()}{consts!r}{code.co_names}"
+
+
+def parse_signature(tables='parsetab'):
+    parts = [f"{MAGIC}{VERSION}{binast.MAGIC}{binast.VERSION}", tables, bintab.grammar_signature(gramma),
+             repr(sorted(define.reserved.items())), define.t_ignore]
+    for module in (define, gramma):
+        for name, item in sorted(vars(module).items()):
+            if name.startswith(('t_', 'p_')):
+                parts.append(f"{name}={item.__doc__}{_code_key(item)}" if callable(item) else f"{name}={item}")
+    return hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=32).digest()
+
+
+class DiskCache:
+    def __init__(self, directory, max_bytes=256 << 20, signature=None, tables='parsetab'):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.signature = signature if signature is not None else parse_signature(tables)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._written = 0           # 上次 trim() 以来写入的字节数
+
+    def key(self, text):
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16, key=self.signature).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            magic, version, nlines, nerrors, ntree = _HEADER.unpack_from(data)
+            start = _HEADER.size + nerrors + (-nerrors % 4)
+            if magic != MAGIC or version != VERSION or start + ntree != len(data):
+                raise ValueError("bad cache entry")
+            buf = memoryview(data)
+            text = str(buf[_HEADER.size:_HEADER.size + nerrors], 'utf-8')
+            tree = binast.BinaryAST(buf[start:])
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return tree, text.split('\n') if nlines else []
+
+    def put(self, key, tree, errors):
+        try:
+            encoded = binast.encode(tree)
+        except ValueError:
+            # 节点值不是字符串、整数或浮点（不是 gramma 解析出来的树），不缓存
+            return False
+        text = '\n'.join(errors).encode('utf-8')
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, len(errors), len(text), len(encoded)))
+                f.write(text + b'\0' * (-len(text) % 4))
+                f.write(encoded)
+            os.replace(tmp, path)
+        except OSError:
+            # 磁盘满、目录只读等：缓存写不进去不影响解析结果
+            _unlink(tmp)
+            return False
+        self.writes += 1
+        self._written += _HEADER.size + len(text) + len(encoded)
+        if self._written > self.max_bytes // 8:
+            self.trim()
+        return True
+
+    def _scan(self):
+        now = time.time()
+        entries = []
+        try:
+            subdirs = [d.path for d in os.scandir(self.directory) if d.is_dir()]
+        except FileNotFoundError:
+            return entries
+        for subdir in subdirs:
+            try:
+                files = list(os.scandir(subdir))
+            except FileNotFoundError:
+                continue
+            for entry in files:
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith('.tmp'):
+                    if now - st.st_mtime > _STALE_TMP:
+                        _unlink(entry.path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def trim(self):
+        # 按 mtime 从旧到新删除，直到总大小不超过 max_bytes；返回删除的文件数
+        self._written = 0
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if _unlink(path):
+                removed += 1
+            total -= size
+        self.evictions += removed
+        return removed
+
+    def size(self):
+        entries = self._scan()
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def clear(self):
+        for _, _, path in self._scan():
+            _unlink(path)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return (f"磁盘缓存命中 {self.hits} / 未命中 {self.misses}（命中率 {self.hit_rate:.1%}），"
+                f"写入 {self.writes}，淘汰 {self.evictions}")
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        return False
+    return True
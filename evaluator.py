@@ -0,0 +1,573 @@
+import math
+import struct
+from array import array
+from operator import itemgetter
+
+from gramma import ASTNode, get_parser
+
+# 表达式求值：按 C 的语义计算 AST 的结果。
+#
+# 每棵树只编译一次：compile_expression 把节点翻译成嵌套的闭包，类型在编译时就确定，
+# 需要的类型转换也在编译时插好；执行时只是调用闭包，不再按 node_type 分派。
+#
+#   program = Program(tree)        # 编译
+#   results, storage = program.run()
+#   program.values(storage)        # {'a': 10, 'b': 20, 'c': 30, ...}
+#
+# 语义：int 为 32 位、char 为有符号 8 位，溢出按补码回绕；float 每一步都舍入到单精度；
+# 整数除法向零取整，% 的符号跟被除数；&& || ?: 短路求值；关系和逻辑运算结果为 int 0/1。
+# C 中未定义的行为（整数除以零、移位位数越界、数组下标越界）抛出 EvalError。
+#
+# a+b+c+... 这样很长的左结合运算链，编译时沿左脊逐个节点处理，不按层递归；执行时闭包每嵌套 _SEGMENT 层
+# 截成一段，由一个循环依次调用，调用深度与链长无关。其它写法嵌套得太深（几百层括号）时报 EvalError。
+
+
+class EvalError(Exception):
+    pass
+
+
+TYPECODES = {'char': 'b', 'int': 'i', 'float': 'f', 'double': 'd'}
+_RANK = {'char': 0, 'int': 1, 'float': 2, 'double': 3}
+INTEGRAL = ('char', 'int')
+
+_F32 = struct.Struct('f')
+_SEGMENT = 100
+_DEEP = "expression nested too deeply"
+
+
+def wrap_int(x):
+    return ((x + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
+
+def wrap_char(x):
+    return ((x + 0x80) & 0xFF) - 0x80
+
+
+def to_float32(x):
+    try:
+        return _F32.unpack(_F32.pack(x))[0]
+    except OverflowError:
+        return math.copysign(math.inf, x)
+
+
+def truncate(x):
+    # 浮点转整数：向零取整，再按 int 回绕
+    if math.isnan(x) or math.isinf(x):
+        raise EvalError(f"cannot convert {x} to an integer")
+    return wrap_int(int(x))
+
+
+def c_div(a, b):
+    if b == 0:
+        raise EvalError("integer division by zero")
+    q = abs(a) // abs(b)
+    return wrap_int(q if (a < 0) == (b < 0) else -q)
+
+
+def c_mod(a, b):
+    if b == 0:
+        raise EvalError("integer division by zero")
+    r = abs(a) % abs(b)
+    return -r if a < 0 else r
+
+
+def c_fdiv(a, b):
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def c_shl(a, b):
+    if not 0 <= b < 32:
+        raise EvalError(f"shift count {b} out of range")
+    return wrap_int(a << b)
+
+
+def c_shr(a, b):
+    if not 0 <= b < 32:
+        raise EvalError(f"shift count {b} out of range")
+    return a >> b
+
+
+# 写入某类型变量时的转换
+STORE = {
+    'char': lambda v: wrap_char(truncate(v) if isinstance(v, float) else v),
+    'int': lambda v: truncate(v) if isinstance(v, float) else wrap_int(v),
+    'float': lambda v: to_float32(float(v)),
+    'double': float,
+}
+
+
+def common_type(a, b):
+    # 一般算术转换：char 先提升为 int，再取等级高的
+    t = a if _RANK[a] >= _RANK[b] else b
+    return 'int' if t == 'char' else t
+
+
+def promote(t):
+    return 'int' if t == 'char' else t
+
+
+def cast(fn, src, dst):
+    # 返回把 src 类型的值转换成 dst 类型的闭包；不需要转换时原样返回
+    if src == dst or (src == 'char' and dst == 'int') or (src == 'float' and dst == 'double'):
+        return fn
+    if dst == 'double':
+        return lambda s: float(fn(s))
+    if dst == 'float':
+        return lambda s: to_float32(fn(s))
+    if dst == 'int':
+        return lambda s: truncate(fn(s)) if src in ('float', 'double') else fn(s)
+    convert = STORE['char']
+    return lambda s: convert(fn(s))
+
+
+class Variable:
+    __slots__ = ('name', 'ctype', 'slot', 'length')
+
+    def __init__(self, name, ctype, slot, length=None):
+        self.name = name
+        self.ctype = ctype
+        self.slot = slot
+        self.length = length        # None 表示标量
+
+
+# 二元运算的闭包工厂：(左闭包, 右闭包) -> 闭包
+_INT_BINARY = {
+    '+': lambda l, r: lambda s: ((l(s) + r(s) + 0x80000000) & 0xFFFFFFFF) - 0x80000000,
+    '-': lambda l, r: lambda s: ((l(s) - r(s) + 0x80000000) & 0xFFFFFFFF) - 0x80000000,
+    '*': lambda l, r: lambda s: ((l(s) * r(s) + 0x80000000) & 0xFFFFFFFF) - 0x80000000,
+    '/': lambda l, r: lambda s: c_div(l(s), r(s)),
+    '%': lambda l, r: lambda s: c_mod(l(s), r(s)),
+    '&': lambda l, r: lambda s: l(s) & r(s),
+    '|': lambda l, r: lambda s: l(s) | r(s),
+    '^': lambda l, r: lambda s: l(s) ^ r(s),
+    '<<': lambda l, r: lambda s: c_shl(l(s), r(s)),
+    '>>': lambda l, r: lambda s: c_shr(l(s), r(s)),
+}
+_DOUBLE_BINARY = {
+    '+': lambda l, r: lambda s: l(s) + r(s),
+    '-': lambda l, r: lambda s: l(s) - r(s),
+    '*': lambda l, r: lambda s: l(s) * r(s),
+    '/': lambda l, r: lambda s: c_fdiv(l(s), r(s)),
+}
+_FLOAT_BINARY = {
+    '+': lambda l, r: lambda s: to_float32(l(s) + r(s)),
+    '-': lambda l, r: lambda s: to_float32(l(s) - r(s)),
+    '*': lambda l, r: lambda s: to_float32(l(s) * r(s)),
+    '/': lambda l, r: lambda s: to_float32(c_fdiv(l(s), r(s))),
+}
+_COMPARE = {
+    '<': lambda l, r: lambda s: 1 if l(s) < r(s) else 0,
+    '>': lambda l, r: lambda s: 1 if l(s) > r(s) else 0,
+    '<=': lambda l, r: lambda s: 1 if l(s) <= r(s) else 0,
+    '>=': lambda l, r: lambda s: 1 if l(s) >= r(s) else 0,
+    '==': lambda l, r: lambda s: 1 if l(s) == r(s) else 0,
+    '!=': lambda l, r: lambda s: 1 if l(s) != r(s) else 0,
+}
+
+# 各种二元表达式节点：运算符子节点都在下标 1
+BINARY_NODES = frozenset({
+    'LogicalOrExpression', 'LogicalAndExpression',
+    'BitwiseOrExpression', 'BitwiseXorExpression', 'BitwiseAndExpression',
+    'EqualityExpression', 'RelationalExpression', 'ShiftExpression',
+    'AdditiveExpression', 'MultiplicativeExpression',
+})
+
+
+def compile_binary(op, left, right):
+    (lf, lt), (rf, rt) = left, right
+    if op == '&&':
+        return (lambda s: 1 if lf(s) and rf(s) else 0), 'int'
+    if op == '||':
+        return (lambda s: 1 if lf(s) or rf(s) else 0), 'int'
+    if op in ('<<', '>>'):
+        if lt not in INTEGRAL or rt not in INTEGRAL:
+            raise EvalError(f"invalid operands to {op}: {lt} and {rt}")
+        return _INT_BINARY[op](lf, rf), 'int'
+    t = common_type(lt, rt)
+    lf = cast(lf, lt, t)
+    rf = cast(rf, rt, t)
+    if op in _COMPARE:
+        return _COMPARE[op](lf, rf), 'int'
+    table = _INT_BINARY if t == 'int' else _FLOAT_BINARY if t == 'float' else _DOUBLE_BINARY
+    if op not in table:
+        raise EvalError(f"invalid operands to {op}: {lt} and {rt}")
+    return table[op](lf, rf), t
+
+
+class Compiler:
+    # variables: 名字 -> Variable；编译过程中遇到声明就分配新的存储位置
+    def __init__(self, variables=None, implicit_int=True):
+        self.variables = dict(variables or {})
+        self.slots = max((v.slot for v in self.variables.values()), default=-1) + 1
+        self.implicit_int = implicit_int     # 给未声明的变量赋值时按 int 隐式声明（a=2+5）
+
+    def declare(self, name, ctype, length=None):
+        if name in self.variables:
+            raise EvalError(f"redeclaration of '{name}'")
+        var = Variable(name, ctype, self.slots, length)
+        self.slots += 1
+        self.variables[name] = var
+        return var
+
+    def lookup(self, name):
+        var = self.variables.get(name)
+        if var is None:
+            raise EvalError(f"'{name}' undeclared")
+        return var
+
+    # ---- 表达式 ----
+
+    def expression(self, node):
+        # 返回 (闭包, C 类型)；闭包的参数是存储列表
+        if node is None:
+            raise EvalError("missing expression")
+        kind = node.node_type
+        if kind == 'PrimaryExpression':
+            return self.primary(node)
+        if kind in BINARY_NODES:
+            return self.binary(node)
+        if kind == 'ConditionalExpression':
+            return self.conditional(node)
+        if kind == 'UnaryExpression':
+            return self.unary(operator_value(node, 0), node.children[1])
+        if kind == 'PostfixExpression':
+            return self.increment(node.children[0], operator_value(node, 1), prefix=False)
+        if kind == 'ArrayAccess':
+            get, _, t = self.element(node.children[0], node.children[1])
+            return get, t
+        raise EvalError(f"cannot evaluate {kind}")
+
+    def binary(self, node):
+        # 沿左脊向下收集运算链，再从最左边的操作数开始逐个向上编译；右操作数照常递归。
+        # 第 _SEGMENT 个运算之后另起一段：段内最左边的操作数是上一段的值，闭包的参数是 (上一段的值, 存储)
+        spine = []
+        while node is not None and node.node_type in BINARY_NODES:
+            spine.append(node)
+            node = node.children[0]
+        f, t = self.expression(node)
+        segments = []
+        for i, node in enumerate(reversed(spine)):
+            if i and i % _SEGMENT == 0:
+                segments.append(f)
+                f = _accumulator
+            right = self.expression(node.children[2])
+            if segments:
+                right = _operand(right[0]), right[1]
+            f, t = compile_binary(operator_value(node, 1), (f, t), right)
+        if not segments:
+            return f, t
+        first, rest = segments[0], segments[1:] + [f]
+
+        def chain(s):
+            acc = first(s)
+            for segment in rest:
+                acc = segment((acc, s))
+            return acc
+        return chain, t
+
+    def primary(self, node):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise EvalError(f"bad primary expression {value!r}")
+        if isinstance(value, int):
+            v = wrap_int(value)
+            return (lambda s: v), 'int'
+        if isinstance(value, float):
+            return (lambda s: value), 'double'
+        if value.startswith('"'):
+            raise EvalError("a string constant can only be subscripted")
+        var = self.lookup(value)
+        if var.length is not None:
+            raise EvalError(f"array '{value}' used as a value")
+        return itemgetter(var.slot), var.ctype
+
+    def conditional(self, node):
+        c = node.children
+        test, _ = self.expression(c[0])
+        then, tt = self.expression(c[2])
+        other, et = self.expression(c[3])
+        t = common_type(tt, et)
+        then = cast(then, tt, t)
+        other = cast(other, et, t)
+        return (lambda s: then(s) if test(s) else other(s)), t
+
+    def unary(self, op, operand):
+        if op in ('++', '--'):
+            return self.increment(operand, op, prefix=True)
+        f, t = self.expression(operand)
+        if op == '!':
+            return (lambda s: 0 if f(s) else 1), 'int'
+        if op == '+':
+            return f, promote(t)
+        if op == '-':
+            if t in INTEGRAL:
+                return (lambda s: wrap_int(-f(s))), 'int'
+            return (lambda s: -f(s)), t
+        if op == '~':
+            if t not in INTEGRAL:
+                raise EvalError(f"invalid operand to ~: {t}")
+            return (lambda s: ~f(s)), 'int'
+        raise EvalError(f"unsupported unary operator {op}")
+
+    # ---- 左值 ----
+
+    def lvalue(self, node):
+        # 返回 (取值闭包, 存值闭包 (s, v) -> 存入后的值, 类型)
+        if node is not None and node.node_type == 'PrimaryExpression' and isinstance(node.value, str) \
+                and not node.value.startswith('"'):
+            var = self.lookup(node.value)
+            if var.length is not None:
+                raise EvalError(f"array '{var.name}' is not assignable")
+            slot = var.slot
+            convert = STORE[var.ctype]
+
+            def store(s, v):
+                v = s[slot] = convert(v)
+                return v
+            return itemgetter(slot), store, var.ctype
+        if node is not None and node.node_type == 'ArrayAccess':
+            return self.element(node.children[0], node.children[1])
+        raise EvalError("lvalue required")
+
+    def element(self, base, index):
+        # 数组元素：base 是数组名（或字符串常量，只读），index 是下标表达式
+        if base is None or base.node_type != 'PrimaryExpression' or not isinstance(base.value, str):
+            raise EvalError("subscripted value is not an array")
+        at, it = self.expression(index)
+        if it not in INTEGRAL:
+            raise EvalError("array subscript is not an integer")
+        if base.value.startswith('"'):
+            data = array('b', [wrap_char(b) for b in base.value[1:-1].encode('utf-8')] + [0])
+            return self._element(lambda s: data, len(data), at, 'char', None), None, 'char'
+        var = self.lookup(base.value)
+        if var.length is None:
+            raise EvalError(f"subscripted value '{var.name}' is not an array")
+        get = self._element(itemgetter(var.slot), var.length, at, var.ctype, var.name)
+        slot, length, convert, name = var.slot, var.length, STORE[var.ctype], var.name
+
+        def store(s, v, k=None):
+            k = at(s) if k is None else k
+            if not 0 <= k < length:
+                raise EvalError(f"index {k} out of bounds for '{name}[{length}]'")
+            v = convert(v)
+            s[slot][k] = v
+            return s[slot][k]
+        return get, store, var.ctype
+
+    @staticmethod
+    def _element(data, length, at, ctype, name):
+        def get(s):
+            k = at(s)
+            if 0 <= k < length:
+                return data(s)[k]
+            raise EvalError(f"index {k} out of bounds for '{name or 'string'}[{length}]'")
+        return get
+
+    def increment(self, operand, op, prefix):
+        get, store, t = self.lvalue(operand)
+        if store is None:
+            raise EvalError("lvalue required as increment operand")
+        delta = 1 if op == '++' else -1
+        if operand.node_type == 'ArrayAccess':
+            # 下标只求值一次
+            base, index = operand.children
+            at, _ = self.expression(index)
+            var = self.lookup(base.value)
+            slot, length = var.slot, var.length
+
+            def step(s):
+                k = at(s)
+                if not 0 <= k < length:
+                    raise EvalError(f"index {k} out of bounds for '{var.name}[{length}]'")
+                old = s[slot][k]
+                new = store(s, old + delta, k)
+                return new if prefix else old
+            return step, t
+
+        def step(s):
+            old = get(s)
+            new = store(s, old + delta)
+            return new if prefix else old
+        return step, t
+
+    def assign(self, target, value):
+        _, store, t = self.lvalue(target)
+        if store is None:
+            raise EvalError("assignment to a string constant")
+        f, _ = value
+        return (lambda s: store(s, f(s))), t
+
+    # ---- 语句 ----
+
+    def statement(self, node):
+        # 返回一个闭包：执行这条顶层语句并返回它的结果
+        kind = node.node_type
+        if kind == 'Declaration':
+            ctype = node.children[0].value
+            if ctype not in TYPECODES:
+                raise EvalError(f"unknown type {ctype!r}")
+            items = node.children[1]
+            items = items.children if items.node_type == 'DeclarationList' else [items]
+            inits = [self.declaration(ctype, item) for item in items]
+
+            def run(s):
+                result = None
+                for init in inits:
+                    result = init(s)
+                return result
+            return run
+        if kind == 'Identifier':
+            f, _ = self.primary(primary_node(node.value))
+            return f
+        if kind == 'DeclarationWithoutType':
+            name, value = node.children
+            if name.value not in self.variables and self.implicit_int:
+                self.declare(name.value, 'int')
+            f = self.assign(primary_node(name.value), self.expression(value))[0]
+            return f
+        if kind == 'ArrayDeclarationWithoutType':
+            name, index = node.children
+            return self.element(primary_node(name.value), primary_node(index.value))[0]
+        if kind == 'ArrayDeclarationWithoutTypeWithAssignment':
+            name, index, value = node.children
+            target = array_access_node(name.value, index.value)
+            return self.assign(target, self.expression(value))[0]
+        # 表达式语句
+        return self.expression(node)[0]
+
+    def declaration(self, ctype, item):
+        kind = item.node_type
+        convert = STORE[ctype]
+        if kind == 'Identifier':
+            var = self.declare(item.value, ctype)
+            slot = var.slot
+
+            def init(s):
+                s[slot] = convert(0)
+                return s[slot]
+            return init
+        if kind == 'DeclarationWithAssignment':
+            # 先编译初值再声明：int a = a; 里右边的 a 不是正在声明的这个
+            f, _ = self.expression(item.children[1])
+            slot = self.declare(item.children[0].value, ctype).slot
+
+            def init(s):
+                v = s[slot] = convert(f(s))
+                return v
+            return init
+        if kind in ('ArrayDeclaration', 'ArrayDeclarationWithAssignment'):
+            length = item.children[1].value
+            if not isinstance(length, int) or length <= 0:
+                raise EvalError(f"invalid array size {length!r}")
+            # int q[3] = 5; 把每个元素都初始化为 5
+            f = self.expression(item.children[2])[0] if len(item.children) > 2 else (lambda s: 0)
+            var = self.declare(item.children[0].value, ctype, length)
+            slot, code = var.slot, TYPECODES[ctype]
+
+            def init(s):
+                v = convert(f(s))
+                s[slot] = array(code, [v]) * length
+                return v
+            return init
+        raise EvalError(f"cannot declare {kind}")
+
+
+# ---- 各个后端（ir、pycode、vectorize、semantic）共用的 AST 工具 ----
+
+def operator_value(node, index):
+    # 运算符子节点的值；手工构造的树缺了运算符时报错
+    children = node.children
+    if len(children) <= index or children[index] is None:
+        raise EvalError(f"malformed {node.node_type}")
+    return children[index].value
+
+
+def primary_node(value):
+    return ASTNode("PrimaryExpression", value=value)
+
+
+def array_access_node(name, index):
+    # 不带类型的 a[i] = e; 语句里数组名和下标是两个值，不是表达式节点，补成 a[i] 的表达式
+    return ASTNode("ArrayAccess", [primary_node(name), primary_node(index)])
+
+
+def parse_expression(text, parser=None):
+    # 文法里只有语句，表达式作为赋值 _result = ... 的右边来解析
+    parser = parser or get_parser()
+    tree = parser.parse(f"_result = {text};")
+    if tree is None or len(tree.children) != 1 or tree.children[0].node_type != 'DeclarationWithoutType':
+        raise EvalError(f"not an expression: {text!r}")
+    return tree.children[0].children[1]
+
+
+def _accumulator(p):
+    return p[0]
+
+
+def _operand(f):
+    # 运算链截断之后，段内闭包的参数是 (上一段的值, 存储)，右操作数仍然只要存储
+    return lambda p: f(p[1])
+
+
+def compile_expression(node, variables=None):
+    # 单独编译一个表达式，返回 (闭包, 类型)；variables 为 名字 -> Variable
+    try:
+        f, t = Compiler(variables, implicit_int=False).expression(node)
+    except RecursionError:
+        raise EvalError(_DEEP) from None
+
+    def run(s):
+        try:
+            return f(s)
+        except RecursionError:
+            raise EvalError(_DEEP) from None
+    return run, t
+
+
+class Program:
+    def __init__(self, tree, implicit_int=True):
+        if tree is None:
+            raise EvalError("no syntax tree")
+        compiler = Compiler(implicit_int=implicit_int)
+        children = tree.children if tree.node_type == 'Program' else [tree]
+        try:
+            self.statements = [compiler.statement(child) for child in children if child is not None]
+        except RecursionError:
+            raise EvalError(_DEEP) from None
+        self.variables = compiler.variables
+        self.slots = compiler.slots
+
+    def storage(self):
+        # 与 C 的静态变量一样，所有变量先置零；隐式声明的变量在赋值前也可以读
+        s = [None] * self.slots
+        for var in self.variables.values():
+            zero = STORE[var.ctype](0)
+            s[var.slot] = zero if var.length is None else array(TYPECODES[var.ctype], [zero]) * var.length
+        return s
+
+    def run(self, storage=None):
+        # 返回 (每条语句的结果, 存储)；storage 可以重复使用，声明语句会重新初始化变量
+        s = storage if storage is not None else self.storage()
+        try:
+            return [statement(s) for statement in self.statements], s
+        except RecursionError:
+            raise EvalError(_DEEP) from None
+
+    def values(self, storage):
+        result = {}
+        for name, var in self.variables.items():
+            value = storage[var.slot]
+            result[name] = list(value) if isinstance(value, array) else value
+        return result
+
+
+def evaluate(text, parser=None):
+    # 解析并执行一段源码，返回各变量的最终值
+    parser = parser or get_parser()
+    program = Program(parser.parse(text))
+    _, storage = program.run()
+    return program.values(storage)
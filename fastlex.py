@@ -0,0 +1,320 @@
+import re
+import string
+
+try:
+    from re import _parser as sre_parse
+except ImportError:                 # Python 3.10 及以前
+    import sre_parse
+
+import define
+
+# 单正则词法分析器：把 define.py 里的规则拼成带命名分组的大正则，
+# 每个 token 只做一次 match，关键字用字典查找，不经过 PLY 的逐规则函数调用。
+#
+# 规则顺序与 PLY 完全一致：先是函数规则（按定义的行号），再是字符串规则
+# （按正则长度从长到短，如 << 排在 < 之前）。所以得到的 token 流与 define.lexer 相同，
+# 包括 PLY 顺序带来的结果，例如 t_MINUS 是函数规则，-- 和 -> 总是两个 MINUS。
+
+# 函数规则的快速处理方式；不在表中的函数规则照常调用 define 里的函数
+_NEWLINE, _KEEP, _KEYWORD, _INT, _FLOAT, _CALL = range(6)
+_ACTIONS = {
+    'NewLine': _NEWLINE,
+    'IDENTIFIER': _KEYWORD,
+    'CONSTANT': _INT,
+    'FLOAT': _FLOAT,
+    'MINUS': _KEEP,
+    'STRING_CONSTANT': _KEEP,
+    'DOUBLE': _KEEP,
+}
+
+
+class LexError(Exception):
+    pass
+
+
+class Token:
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer', 'column')   # column 只有 streamlex 会设置
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+def rules(module=define):
+    # [(规则名, 正则, 是否函数规则)]，顺序即 PLY 构造主正则时的顺序
+    functions = []
+    strings = []
+    for name, rule in vars(module).items():
+        if not name.startswith('t_') or name in ('t_ignore', 't_error'):
+            continue
+        if callable(rule):
+            functions.append((rule.__code__.co_firstlineno, name[2:], rule.__doc__))
+        elif isinstance(rule, str):
+            strings.append((name[2:], rule))
+    functions.sort()
+    strings.sort(key=lambda r: len(r[1]), reverse=True)
+    return [(name, regex, True) for _, name, regex in functions] + \
+           [(name, regex, False) for name, regex in strings]
+
+
+def _first_chars(items):
+    # 返回 (可能的首字符集合, 能否匹配空串)；集合为 None 表示算不出来，当作任意字符
+    chars = set()
+    for op, arg in items:
+        op = str(op)
+        if op == 'LITERAL':
+            return chars | {chr(arg)}, False
+        if op == 'IN':
+            for kind, v in arg:
+                kind = str(kind)
+                if kind == 'LITERAL':
+                    chars.add(chr(v))
+                elif kind == 'RANGE':
+                    chars.update(map(chr, range(v[0], min(v[1], 127) + 1)))
+                elif kind == 'CATEGORY' and str(v) in _CATEGORIES:
+                    chars.update(_CATEGORIES[str(v)])
+                else:
+                    return None, False
+            return chars, False
+        if op in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            low, _, sub = arg
+            first, nullable = _first_chars(sub)
+            nullable = nullable or low == 0
+        elif op == 'SUBPATTERN' and not arg[1] and not arg[2]:
+            first, nullable = _first_chars(arg[-1])
+        elif op == 'BRANCH':
+            first, nullable = set(), False
+            for branch in arg[1]:
+                f, n = _first_chars(branch)
+                if f is None:
+                    return None, False
+                first |= f
+                nullable = nullable or n
+        else:
+            return None, False
+        if first is None:
+            return None, False
+        chars |= first
+        if not nullable:
+            return chars, False
+    return chars, True
+
+
+# 非 ASCII 字符一律走包含全部规则的正则，所以这里只需要 ASCII 部分
+_CATEGORIES = {
+    'CATEGORY_DIGIT': string.digits,
+    'CATEGORY_WORD': string.ascii_letters + string.digits + '_',
+    'CATEGORY_SPACE': ' \t\n\r\f\v',
+}
+
+
+def master_pattern(module=define, names=None):
+    # 与 PLY 一样用 re.VERBOSE 编译；names 给出时只包含这些规则，顺序不变
+    return '|'.join(f"(?P<{name}>{regex})" for name, regex, _ in rules(module)
+                    if names is None or name in names)
+
+
+def build_tables(module=define, binary=False):
+    # 按当前字符查表：每个 ASCII 字符对应一个只含“可能以它开头”的规则的正则，
+    # 规则的相对顺序不变，所以结果与完整的大正则相同，只是少试很多分支。
+    #
+    # 返回 (master, dispatch, single)：
+    #   master    包含全部规则的 (match, actions)，非 ASCII 字符用它
+    #   dispatch  字符 -> (match, actions)，None 表示没有规则能以该字符开头
+    #   single    只可能是某个单字符 token 的字符（; , ( 等）-> token 类型，不必再跑正则
+    # binary=True 时正则按 bytes 编译，表的键是字节值（int），供 streamlex 直接扫描 mmap。
+    # 结果按模块缓存，多建几个 Lexer 不会重复编译正则
+    key = (module.__name__, binary)
+    if key not in _tables:
+        _tables[key] = _build_tables(module, binary)
+    return _tables[key]
+
+
+_tables = {}
+
+
+def _build_tables(module, binary):
+    all_rules = rules(module)
+    firsts = {name: _first_chars(sre_parse.parse(regex, re.VERBOSE).data)[0]
+              for name, regex, _ in all_rules}
+    compiled = {}
+
+    def build(names):
+        if names not in compiled:
+            pattern = master_pattern(module, names)
+            regex = re.compile(pattern.encode('ascii') if binary else pattern, re.VERBOSE)
+            # 按分组编号查表：(规则名, 处理方式, 需要调用的函数)
+            actions = [None] * (regex.groups + 1)
+            for name, _, is_function in all_rules:
+                if name not in names:
+                    continue
+                action, func = _KEEP, None
+                if is_function:
+                    action = _ACTIONS.get(name, _CALL)
+                    if action == _CALL:
+                        func = getattr(module, 't_' + name)
+                actions[regex.groupindex[name]] = (name, action, func)
+            compiled[names] = (regex.match, actions)
+        return compiled[names]
+
+    master = build(frozenset(name for name, _, _ in all_rules))
+    dispatch = {}
+    single = {}
+    literals = {}
+    for name, regex, is_function in all_rules:
+        items = sre_parse.parse(regex, re.VERBOSE).data
+        if not is_function and len(items) == 1 and str(items[0][0]) == 'LITERAL':
+            literals[name] = chr(items[0][1])
+    ignore = getattr(module, 't_ignore', '')
+    for code in range(128):
+        c = chr(code)
+        if c in ignore:
+            continue
+        key = code if binary else c
+        names = frozenset(name for name, first in firsts.items() if first is None or c in first)
+        dispatch[key] = build(names) if names else None
+        if len(names) == 1:
+            name, = names
+            if literals.get(name) == c:
+                single[key] = name
+    return master, dispatch, single
+
+
+class Lexer:
+    # 接口与 PLY 的 Lexer 相同（input / token / lineno / lexpos / skip），可直接传给 parser.parse
+    def __init__(self, module=define):
+        self.module = module
+        self.reserved = dict(getattr(module, 'reserved', {}))
+        self.ignore = getattr(module, 't_ignore', '')
+        self.error_rule = getattr(module, 't_error', None)
+        self.master, self.dispatch, self.single = build_tables(module)
+        self.lexdata = ''
+        self.lexpos = 0
+        self.lineno = 1
+        self._tokens = iter(())
+
+    def input(self, text):
+        self.lexdata = text
+        self.lexpos = 0
+        self._tokens = self._scan()
+
+    def skip(self, n):
+        self.lexpos += n
+
+    def clone(self):
+        other = Lexer.__new__(Lexer)
+        other.__dict__.update(self.__dict__)
+        other.input(self.lexdata)
+        other.lexpos = self.lexpos
+        return other
+
+    def token(self):
+        return next(self._tokens, None)
+
+    def __iter__(self):
+        return self._tokens
+
+    def _scan(self):
+        # lexpos / lineno 在每次产出 token 前写回，恢复时再读回来
+        text = self.lexdata
+        end = len(text)
+        dispatch = self.dispatch
+        master = self.master
+        ignore = self.ignore
+        reserved = self.reserved
+        single = self.single
+        pos = self.lexpos
+        lineno = self.lineno
+        while pos < end:
+            c = text[pos]
+            if c in ignore:
+                pos += 1
+                continue
+            name = single.get(c)
+            if name is not None:
+                tok = Token(name, c, lineno, pos)
+                pos += 1
+                self.lexpos = pos
+                self.lineno = lineno
+                yield tok
+                pos = self.lexpos
+                lineno = self.lineno
+                continue
+            match, actions = dispatch.get(c, master) or (None, None)
+            m = match(text, pos) if match is not None else None
+            if m is None:
+                self.lexpos = pos
+                self.lineno = lineno
+                tok = self._error(text, pos)
+                pos = self.lexpos
+                lineno = self.lineno
+                if tok is None:
+                    continue
+            else:
+                index = m.lastindex
+                name, action, func = actions[index]
+                value = m.group(index)
+                pos = m.end()
+                if action == _NEWLINE:
+                    lineno += len(value)
+                    continue
+                if action == _KEEP:
+                    tok = Token(name, value, lineno, pos - len(value))
+                elif action == _KEYWORD:
+                    tok = Token(reserved.get(value, name), value, lineno, pos - len(value))
+                elif action == _INT:
+                    tok = Token(name, int(value), lineno, pos - len(value))
+                elif action == _FLOAT:
+                    tok = Token(name, float(value), lineno, pos - len(value))
+                else:
+                    self.lexpos = pos
+                    self.lineno = lineno
+                    tok = Token(name, value, lineno, pos - len(value))
+                    tok.lexer = self
+                    tok = func(tok)
+                    pos = self.lexpos
+                    lineno = self.lineno
+                    if tok is None:
+                        continue
+            self.lexpos = pos
+            self.lineno = lineno
+            yield tok
+            # 两次 token() 之间也可能有人改了 lexpos / lineno
+            pos = self.lexpos
+            lineno = self.lineno
+        self.lexpos = pos
+        self.lineno = lineno
+
+    def _error(self, text, pos):
+        if self.error_rule is None:
+            raise LexError(f"Illegal character {text[pos]!r} at index {pos}")
+        # PLY 传入剩余的全部文本；t_error 只看第一个字符，这里截一小段，
+        # 避免每行都有非法字符（如 \r）时整体变成平方复杂度
+        tok = Token('error', text[pos:pos + 64], self.lineno, pos)
+        tok.lexer = self
+        tok = self.error_rule(tok)
+        if self.lexpos == pos:
+            raise LexError(f"Scanning error. Illegal character {text[pos]!r}")
+        return tok
+
+
+def tokenize(text, lineno=1):
+    lexer = get_lexer().clone()
+    lexer.lineno = lineno
+    lexer.input(text)
+    return iter(lexer)
+
+
+_lexer = None
+
+
+def get_lexer():
+    global _lexer
+    if _lexer is None:
+        _lexer = Lexer(define)
+    return _lexer
@@ -1,43 +1,75 @@
-import tkinter as tk
-from tkinter import scrolledtext, filedialog
-
-import graphviz
-from graphviz import Digraph
-import ply.lex as lex
-import ply.yacc as yacc
-from define import lexer
+import sys
+
+import define
 from define import tokens
 
 class ASTNode:
+    # 没有 __dict__，节点类型字符串驻留，同类节点共享同一个字符串对象
+    __slots__ = ('node_type', 'children', 'value')
+
     def __init__(self, node_type, children=None, value=None):
-        self.node_type = node_type
+        self.node_type = sys.intern(node_type)
         self.children = children if children is not None else []
         self.value = value
 
     def __str__(self, indent=0):
-        result = "  " * indent + f"{self.node_type}"
-        if self.value is not None:
-            result += f"\n{'  ' * (indent + 1)}Value: {self.value}"
-        for child in self.children:
-            result += "\n" + child.__str__(indent + 1)
-        return result
+        # 与 write_ast 同一个分块写出器；去掉最后一行的换行
+        return "".join(iter_ast_chunks(self, indent=indent))[:-1]
+
+# 规则函数都通过 new_node 构造节点；hashcons.hash_consing() 期间换成查表的工厂，相同的子树只构造一次
+new_node = ASTNode
+
+# 二元运算符的优先级，从低到高，都是左结合，即 C 的优先级和结合性；由 binary_expression 的产生式使用，
+# 不再一级一级地写成 logical_or_expression → logical_and_expression → ... 的单位产生式链。
+# PREFIX 是前缀运算符的优先级（%prec PREFIX），比它高的是后缀运算符：-a++ 即 -(a++)，-a[1] 即 -(a[1])
+precedence = (
+    ('left', 'LOGICAL_OR'),
+    ('left', 'LOGICAL_AND'),
+    ('left', 'BITWISE_OR'),
+    ('left', 'BITWISE_XOR'),
+    ('left', 'BITWISE_AND'),
+    ('left', 'EQUALS', 'NOT_EQUALS'),
+    ('left', 'LESS_THAN', 'GREATER_THAN', 'LESS_EQUALS', 'GREATER_EQUALS'),
+    ('left', 'SHIFT_LEFT', 'SHIFT_RIGHT'),
+    ('left', 'PLUS', 'MINUS'),
+    ('left', 'MUL', 'DIV', 'MOD'),
+    ('right', 'PREFIX'),
+    ('left', 'INCREMENT', 'DECREMENT', 'OPEN_BRACKET', 'OPEN_PAREN', 'DOT', 'ARROW'),
+)
+
+# 二元运算符 token -> (表达式节点类型, 运算符节点类型)
+OPERATOR_NODES = {
+    'LOGICAL_OR': ('LogicalOrExpression', 'LogicalOrOperator'),
+    'LOGICAL_AND': ('LogicalAndExpression', 'LogicalAndOperator'),
+    'BITWISE_OR': ('BitwiseOrExpression', 'BitwiseOrOperator'),
+    'BITWISE_XOR': ('BitwiseXorExpression', 'BitwiseXorOperator'),
+    'BITWISE_AND': ('BitwiseAndExpression', 'BitwiseAndOperator'),
+    'EQUALS': ('EqualityExpression', 'EqualityOperator'),
+    'NOT_EQUALS': ('EqualityExpression', 'EqualityOperator'),
+    'LESS_THAN': ('RelationalExpression', 'RelationalOperator'),
+    'GREATER_THAN': ('RelationalExpression', 'RelationalOperator'),
+    'LESS_EQUALS': ('RelationalExpression', 'RelationalOperator'),
+    'GREATER_EQUALS': ('RelationalExpression', 'RelationalOperator'),
+    'SHIFT_LEFT': ('ShiftExpression', 'ShiftOperator'),
+    'SHIFT_RIGHT': ('ShiftExpression', 'ShiftOperator'),
+    'PLUS': ('AdditiveExpression', 'AdditiveOperator'),
+    'MINUS': ('AdditiveExpression', 'AdditiveOperator'),
+    'MUL': ('MultiplicativeExpression', 'MultiplicativeOperator'),
+    'DIV': ('MultiplicativeExpression', 'MultiplicativeOperator'),
+    'MOD': ('MultiplicativeExpression', 'MultiplicativeOperator'),
+}
 
 def p_program(p):
     '''
     program : program declaration
-            | empty
+            |
     '''
+    # 所有声明直接挂在同一个 Program 节点下，而不是一层套一层
     if len(p) == 3:
-        p[0] = ASTNode("Program", [p[1], p[2]])
+        p[1].children.append(p[2])
+        p[0] = p[1]
     else:
-        p[0] = ASTNode("Program", [p[1]])
-
-def p_statement(p):
-    '''
-    statement : declaration
-              | expression_statement
-    '''
-    p[0] = p[1]
+        p[0] = new_node("Program")
 
 def p_declaration(p):
     '''
@@ -45,7 +77,7 @@ def p_declaration(p):
                 | declaration_without_type SEMICOLON
     '''
     if len(p) == 4:
-        p[0] = ASTNode("Declaration", [p[1], p[2]])
+        p[0] = new_node("Declaration", [p[1], p[2]])
     else:
         p[0] = p[1]
 
@@ -56,8 +88,11 @@ def p_declaration_list(p):
     '''
     if len(p) == 2:
         p[0] = p[1]
+    elif p[1].node_type == "DeclarationList":
+        p[1].children.append(p[3])
+        p[0] = p[1]
     else:
-        p[0] = ASTNode("DeclarationList", [p[1], p[3]])
+        p[0] = new_node("DeclarationList", [p[1], p[3]])
 
 def p_declaration_item(p):
     '''
@@ -65,21 +100,16 @@ def p_declaration_item(p):
                     | IDENTIFIER OPEN_BRACKET CONSTANT CLOSE_BRACKET
                     | IDENTIFIER ASSIGN expression
                     | IDENTIFIER OPEN_BRACKET CONSTANT CLOSE_BRACKET ASSIGN expression
-                    | IDENTIFIER ASSIGN float_constant
-                    | IDENTIFIER OPEN_BRACKET CONSTANT CLOSE_BRACKET ASSIGN float_constant
     '''
+    name = new_node("Identifier", value=p[1])
     if len(p) == 2:
-        p[0] = ASTNode("Identifier", value=p[1])
+        p[0] = name
     elif len(p) == 5:
-        p[0] = ASTNode("ArrayDeclaration", [ASTNode("Identifier", value=p[1]), ASTNode("Constant", value=p[3])])
+        p[0] = new_node("ArrayDeclaration", [name, new_node("Constant", value=p[3])])
     elif len(p) == 4:
-        p[0] = ASTNode("DeclarationWithAssignment", [ASTNode("Identifier", value=p[1]), p[3]])
-    elif len(p) == 7:
-        p[0] = ASTNode("ArrayDeclarationWithAssignment", [ASTNode("Identifier", value=p[1]), ASTNode("Constant", value=p[5]), p[7]])
-    elif len(p) == 5 and p[2] == '=':
-        p[0] = ASTNode("DeclarationWithFloatAssignment", [ASTNode("Identifier", value=p[1]), p[4]])
-    elif len(p) == 7 and p[4] == '=':
-        p[0] = ASTNode("ArrayDeclarationWithFloatAssignment", [ASTNode("Identifier", value=p[1]), ASTNode("Constant", value=p[5]), p[7]])
+        p[0] = new_node("DeclarationWithAssignment", [name, p[3]])
+    else:
+        p[0] = new_node("ArrayDeclarationWithAssignment", [name, new_node("Constant", value=p[3]), p[6]])
 
 def p_declaration_without_type(p):
     '''
@@ -87,23 +117,17 @@ def p_declaration_without_type(p):
                             | IDENTIFIER ASSIGN expression
                             | IDENTIFIER OPEN_BRACKET CONSTANT CLOSE_BRACKET
                             | IDENTIFIER OPEN_BRACKET CONSTANT CLOSE_BRACKET ASSIGN expression
-                            | IDENTIFIER ASSIGN float_constant
-                            | IDENTIFIER OPEN_BRACKET CONSTANT CLOSE_BRACKET ASSIGN float_constant
     '''
+    # 不带类型的“声明”就是赋值语句：x = e; 或 a[i] = e;（只有 x; 和 a[i]; 时只是取值）
+    name = new_node("Identifier", value=p[1])
     if len(p) == 2:
-        p[0] = ASTNode("Identifier", value=p[1])
+        p[0] = name
     elif len(p) == 4:
-        p[0] = ASTNode("ArrayDeclarationWithoutType", [ASTNode("Identifier", value=p[1]), ASTNode("Constant", value=p[3])])
-    elif len(p) == 3:
-        p[0] = ASTNode("DeclarationWithoutType", [ASTNode("Identifier", value=p[1]), p[2]])
-    elif len(p) == 6:
-        p[0] = ASTNode("ArrayDeclarationWithoutTypeWithAssignment", [ASTNode("Identifier", value=p[1]), ASTNode("Constant", value=p[4]), p[6]])
-    elif len(p) == 4 and p[2] == '=':
-        p[0] = ASTNode("DeclarationWithoutTypeWithFloatAssignment", [ASTNode("Identifier", value=p[1]), p[3]])
-    elif len(p) == 7 and p[5] == '=':
-        p[0] = ASTNode("ArrayDeclarationWithoutTypeWithFloatAssignment", [ASTNode("Identifier", value=p[1]), ASTNode("Constant", value=p[4]), p[6]])
-
-
+        p[0] = new_node("DeclarationWithoutType", [name, p[3]])
+    elif len(p) == 5:
+        p[0] = new_node("ArrayDeclarationWithoutType", [name, new_node("Constant", value=p[3])])
+    else:
+        p[0] = new_node("ArrayDeclarationWithoutTypeWithAssignment", [name, new_node("Constant", value=p[3]), p[6]])
 
 def p_type(p):
     '''
@@ -112,343 +136,215 @@ def p_type(p):
          | FLOAT
          | DOUBLE
     '''
-    p[0] = ASTNode("Type", value=p[1])
+    p[0] = new_node("Type", value=p[1])
 
 def p_expression(p):
     '''
-    expression : additive_expression
-               | conditional_expression
-               | expression LOGICAL_OR expression
-               | expression LOGICAL_AND expression
-               | expression BITWISE_OR expression
-               | expression BITWISE_XOR expression
-               | expression BITWISE_AND expression
-               | expression EQUALS expression
-               | expression NOT_EQUALS expression
-               | expression LESS_THAN expression
-               | expression GREATER_THAN expression
-               | expression LESS_EQUALS expression
-               | expression GREATER_EQUALS expression
-               | expression SHIFT_LEFT expression
-               | expression SHIFT_RIGHT expression
+    expression : binary_expression
+               | binary_expression CONDITIONAL_OPERATOR expression COLON expression
+               | binary_expression CONDITIONAL_OPERATOR expression COMMA expression
     '''
+    # 与 C 相同，?: 的优先级低于所有二元运算符、右结合：a < b ? c : d 即 (a < b) ? c : d，
+    # a ? b : c ? d : e 即 a ? b : (c ? d : e)。第二种写法是题目示例里的 a<40? a+b,a-b，按 a<40? a+b : a-b 处理
     if len(p) == 2:
         p[0] = p[1]
     else:
-        p[0] = ASTNode("BinaryExpression", [p[1], ASTNode("Operator", value=p[2]), p[3]])
-
-def p_expression_statement(p):
-    '''
-    expression_statement : expression SEMICOLON
-    '''
-    p[0] = p[1]
-
-def p_assignment_expression(p):
-    '''
-    assignment_expression : conditional_expression
-                        | unary_expression assignment_operator assignment_expression
-    '''
+        p[0] = new_node("ConditionalExpression", [p[1], new_node("ConditionalOperator", value=p[2]), p[3], p[5]])
+
+def p_binary_expression(p):
+    '''
+    binary_expression : unary_expression
+                      | binary_expression LOGICAL_OR binary_expression
+                      | binary_expression LOGICAL_AND binary_expression
+                      | binary_expression BITWISE_OR binary_expression
+                      | binary_expression BITWISE_XOR binary_expression
+                      | binary_expression BITWISE_AND binary_expression
+                      | binary_expression EQUALS binary_expression
+                      | binary_expression NOT_EQUALS binary_expression
+                      | binary_expression LESS_THAN binary_expression
+                      | binary_expression GREATER_THAN binary_expression
+                      | binary_expression LESS_EQUALS binary_expression
+                      | binary_expression GREATER_EQUALS binary_expression
+                      | binary_expression SHIFT_LEFT binary_expression
+                      | binary_expression SHIFT_RIGHT binary_expression
+                      | binary_expression PLUS binary_expression
+                      | binary_expression MINUS binary_expression
+                      | binary_expression MUL binary_expression
+                      | binary_expression DIV binary_expression
+                      | binary_expression MOD binary_expression
+    '''
+    # 节点类型按运算符查 OPERATOR_NODES，与原来每一级各自的产生式得到的节点相同
     if len(p) == 2:
         p[0] = p[1]
     else:
-        p[0] = ASTNode("AssignmentExpression", [p[1], ASTNode("AssignmentOperator", value=p[2]), p[3]])
-
-def p_conditional_expression(p):
-    '''
-    conditional_expression : logical_or_expression
-                          | logical_or_expression CONDITIONAL_OPERATOR expression COLON conditional_expression
-                          | logical_or_expression CONDITIONAL_OPERATOR expression COMMA conditional_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    elif len(p) == 5:
-        p[0] = ASTNode("ConditionalExpression", [p[1], ASTNode("ConditionalOperator", value=p[2]), p[3], p[5]])
-    else:
-        # Assuming there is a comma after the expression in the true branch
-        p[0] = ASTNode("ConditionalExpression", [p[1], ASTNode("ConditionalOperator", value=p[2]), p[3], p[5]])
-
-
-def p_logical_or_expression(p):
-    '''
-    logical_or_expression : logical_and_expression
-                        | logical_or_expression LOGICAL_OR logical_and_expression
-                        | conditional_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("LogicalOrExpression", [p[1], ASTNode("LogicalOrOperator", value=p[2]), p[3]])
-
-def p_logical_and_expression(p):
-    '''
-    logical_and_expression : bitwise_or_expression
-                        | logical_and_expression LOGICAL_AND bitwise_or_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("LogicalAndExpression", [p[1], ASTNode("LogicalAndOperator", value=p[2]), p[3]])
-
-def p_bitwise_or_expression(p):
-    '''
-    bitwise_or_expression : bitwise_xor_expression
-                        | bitwise_or_expression BITWISE_OR bitwise_xor_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("BitwiseOrExpression", [p[1], ASTNode("BitwiseOrOperator", value=p[2]), p[3]])
-
-def p_bitwise_xor_expression(p):
-    '''
-    bitwise_xor_expression : bitwise_and_expression
-                        | bitwise_xor_expression BITWISE_XOR bitwise_and_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("BitwiseXorExpression", [p[1], ASTNode("BitwiseXorOperator", value=p[2]), p[3]])
-
-def p_bitwise_and_expression(p):
-    '''
-    bitwise_and_expression : equality_expression
-                        | bitwise_and_expression BITWISE_AND equality_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("BitwiseAndExpression", [p[1], ASTNode("BitwiseAndOperator", value=p[2]), p[3]])
-
-def p_equality_expression(p):
-    '''
-    equality_expression : relational_expression
-                     | equality_expression EQUALS relational_expression
-                     | equality_expression NOT_EQUALS relational_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("EqualityExpression", [p[1], ASTNode("EqualityOperator", value=p[2]), p[3]])
-
-def p_relational_expression(p):
-    '''
-    relational_expression : shift_expression
-                      | relational_expression LESS_THAN shift_expression
-                      | relational_expression GREATER_THAN shift_expression
-                      | relational_expression LESS_EQUALS shift_expression
-                      | relational_expression GREATER_EQUALS shift_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("RelationalExpression", [p[1], ASTNode("RelationalOperator", value=p[2]), p[3]])
-
-def p_shift_expression(p):
-    '''
-    shift_expression : additive_expression
-                     | shift_expression SHIFT_LEFT additive_expression
-                     | shift_expression SHIFT_RIGHT additive_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("ShiftExpression", [p[1], ASTNode("ShiftOperator", value=p[2]), p[3]])
-
-def p_additive_expression(p):
-    '''
-    additive_expression : multiplicative_expression
-                     | additive_expression PLUS multiplicative_expression
-                     | additive_expression MINUS multiplicative_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("AdditiveExpression", [p[1], ASTNode("AdditiveOperator", value=p[2]), p[3]])
-
-def p_multiplicative_expression(p):
-    '''
-    multiplicative_expression : unary_expression
-                         | multiplicative_expression MUL unary_expression
-                         | multiplicative_expression DIV unary_expression
-                         | multiplicative_expression MOD unary_expression
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    else:
-        p[0] = ASTNode("MultiplicativeExpression", [p[1], ASTNode("MultiplicativeOperator", value=p[2]), p[3]])
+        kind, operator = OPERATOR_NODES[p.slice[2].type]
+        p[0] = new_node(kind, [p[1], new_node(operator, value=p[2]), p[3]])
 
 def p_unary_expression(p):
     '''
-    unary_expression : postfix_expression
-                    | BITWISE_AND unary_expression
-                    | TIMES unary_expression
-                    | PLUS unary_expression
-                    | MINUS unary_expression
-                    | LOGICAL_NOT unary_expression
-                    | INCREMENT unary_expression
-                    | DECREMENT unary_expression
+    unary_expression : BITWISE_AND unary_expression %prec PREFIX
+                    | TIMES unary_expression %prec PREFIX
+                    | PLUS unary_expression %prec PREFIX
+                    | MINUS unary_expression %prec PREFIX
+                    | LOGICAL_NOT unary_expression %prec PREFIX
+                    | INCREMENT unary_expression %prec PREFIX
+                    | DECREMENT unary_expression %prec PREFIX
     '''
-    if len(p) == 2:
-        p[0] = p[1]
-    elif len(p) == 3:
-        p[0] = ASTNode("UnaryExpression", [ASTNode("Operator", value=p[1]), p[2]])
-    else:
-        p[0] = ASTNode("UnaryExpression", [ASTNode("Operator", value=p[1]), p[3]])
-
-
+    p[0] = new_node("UnaryExpression", [new_node("Operator", value=p[1]), p[2]])
 
 def p_postfix_expression(p):
     '''
-    postfix_expression : primary_expression
-                    | postfix_expression OPEN_PAREN CLOSE_PAREN
-                    | postfix_expression OPEN_BRACKET expression CLOSE_BRACKET
-                    | postfix_expression DOT IDENTIFIER
-                    | postfix_expression ARROW IDENTIFIER
-                    | postfix_expression INCREMENT
-                    | postfix_expression DECREMENT
+    unary_expression : unary_expression OPEN_PAREN CLOSE_PAREN
+                    | unary_expression OPEN_BRACKET expression CLOSE_BRACKET
+                    | unary_expression DOT IDENTIFIER
+                    | unary_expression ARROW IDENTIFIER
+                    | unary_expression INCREMENT
+                    | unary_expression DECREMENT
     '''
-    if len(p) == 2:
-        p[0] = p[1]
-    elif len(p) == 4:
-        p[0] = ASTNode("FunctionCall", [p[1]]) if p[2] == '(' else ASTNode("ArrayAccess", [p[1], p[3]])
+    # 后缀 ++/-- 用 PostfixExpression，操作数在前、运算符在后，与前缀的 UnaryExpression 区分开
+    if len(p) == 3:
+        p[0] = new_node("PostfixExpression", [p[1], new_node("Operator", value=p[2])])
     elif len(p) == 5:
-        p[0] = ASTNode("MemberAccess", [p[1], ASTNode("Identifier", value=p[3])])
+        p[0] = new_node("ArrayAccess", [p[1], p[3]])
+    elif p[2] == '(':
+        p[0] = new_node("FunctionCall", [p[1]])
     else:
-        p[0] = ASTNode("UnaryExpression", [ASTNode("Operator", value=p[2]), p[1]])
+        p[0] = new_node("MemberAccess", [p[1], new_node("Identifier", value=p[3])], value=p[2])
 
 def p_primary_expression(p):
     '''
-    primary_expression : IDENTIFIER
+    unary_expression : IDENTIFIER
                     | CONSTANT
                     | STRING_CONSTANT
                     | FLOAT
                     | OPEN_PAREN expression CLOSE_PAREN
     '''
+    # 前缀、后缀和基本表达式是同一个非终结符，基本表达式不再经过 primary → postfix → unary 两次单位归约
     if len(p) == 2:
-        p[0] = ASTNode("PrimaryExpression", value=p[1])
+        p[0] = new_node("PrimaryExpression", value=p[1])
     else:
         p[0] = p[2]
 
-def p_basic_expression(p):
-    '''
-    basic_expression : unary_expression
-                    | basic_expression PLUS basic_expression
-                    | basic_expression MINUS basic_expression
-                    | basic_expression MUL basic_expression
-                    | basic_expression DIV basic_expression
-                    | basic_expression MOD basic_expression
-                    | basic_expression INCREMENT
-                    | basic_expression DECREMENT
-    '''
-    if len(p) == 2:
-        p[0] = p[1]
-    elif len(p) == 3:
-        p[0] = ASTNode("UnaryExpression", [ASTNode("Operator", value=p[2]), p[1]])
-    else:
-        p[0] = ASTNode("BinaryExpression", [p[1], ASTNode("Operator", value=p[2]), p[3]])
-
-
-def p_constant(p):
-    '''
-    constant : INTEGER
-             | CHAR
-             | float_constant
-    '''
-    p[0] = ASTNode("Constant", value=p[1])
-
-
-def p_integer_constant(p):
-    '''
-    integer_constant : INTEGER
-                    | FLOAT
-                    | MINUS INTEGER
-                    | MINUS FLOAT
-    '''
-    if len(p) == 2:
-        p[0] = ASTNode("IntegerConstant", value=p[1])
+def p_error(p):
+    if p is None:
+        print("Syntax error at end of input")
     else:
-        p[0] = ASTNode("NegativeIntegerConstant" if p[2] == '-' else "NegativeFloatConstant", [ASTNode("IntegerConstant" if p[2] == '-' else "FloatConstant", value=p[3])])
+        print(f"Syntax error at line {p.lineno}, token {p.type}")
+
+_parsers = {}
+
+def get_parser(tables='parsetab'):
+    # 每个进程只构建一次，直接加载预生成的分析表，不写 parser.out
+    # tables='parsetab' 使用 ply 的 parsetab.py；tables='binary' 使用 bintab 的 mmap 二进制表；
+    # tables='pratt' 不用分析表，声明和语句照样调用这里的规则函数，表达式由 pratt 按运算符表解析
+    parser = _parsers.get(tables)
+    if parser is None:
+        define.get_lexer()
+        module = sys.modules[__name__]
+        if tables == 'binary':
+            import bintab
+            parser = bintab.load_parser(module)
+        elif tables == 'parsetab':
+            import ply.yacc as yacc
+            parser = yacc.yacc(module=module, debug=False)
+        elif tables == 'pratt':
+            import pratt
+            parser = pratt.PrattParser(module)
+        else:
+            raise ValueError(f"unknown parse tables: {tables!r}")
+        _parsers[tables] = parser
+    return parser
+
+def __getattr__(name):
+    # 兼容 "from gramma import parser"，首次访问时才构建
+    if name == 'parser':
+        return get_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def iter_ast_lines(node, indent=0):
+    # 显式栈的先序遍历，逐行产出；耗时与树的大小成线性，不受递归深度限制
+    stack = [(node, indent)]
+    while stack:
+        node, indent = stack.pop()
+        if node is None:
+            continue
+        yield "  " * indent + node.node_type
+        if node.value is not None:
+            yield "  " * (indent + 1) + f"Value: {node.value}"
+        for child in reversed(node.children):
+            stack.append((child, indent + 1))
+
+def iter_ast_chunks(node, chunk_size=65536, indent=0):
+    # 把若干行拼成约 chunk_size 个字符的块，适合分批写文件或插入 GUI 文本框。
+    # 与 iter_ast_lines 同样的前序遍历，但行直接收进列表，不逐行经过生成器；各层的缩进字符串只构造一次。
+    # 栈上放的是各层子节点的迭代器，深度就是栈高，叶子节点不用入栈
+    pads = ["  " * i for i in range(indent + 2)]
+    lines = []
+    append = lines.append
+    size = 0
+    stack = [iter((node,))]
+    while stack:
+        for node in stack[-1]:
+            if node is None:
+                continue
+            depth = indent + len(stack) - 1
+            if depth + 1 >= len(pads):
+                pads.append("  " * len(pads))
+            line = pads[depth] + node.node_type
+            append(line)
+            size += len(line) + 1
+            if node.value is not None:
+                line = f"{pads[depth + 1]}Value: {node.value}"
+                append(line)
+                size += len(line) + 1
+            if node.children:
+                stack.append(iter(node.children))
+                break
+        else:
+            stack.pop()
+        if size >= chunk_size:
+            append("")
+            yield "\n".join(lines)
+            lines.clear()
+            size = 0
+    if lines:
+        append("")
+        yield "\n".join(lines)
+
+def write_ast(node, write, chunk_size=65536):
+    # write 为接收字符串的函数，例如 file.write 或向文本框插入文本的 lambda
+    for chunk in iter_ast_chunks(node, chunk_size):
+        write(chunk)
 
-def p_float_constant(p):
-    '''
-    float_constant : FLOAT
-                  | MINUS FLOAT
-    '''
-    if len(p) == 2:
-        p[0] = ASTNode("FloatConstant", value=p[1])
-    else:
-        p[0] = ASTNode("NegativeFloatConstant", [ASTNode("FloatConstant", value=p[2])])
+def print_ast(node, indent=0):
+    for chunk in iter_ast_chunks(node, indent=indent):
+        sys.stdout.write(chunk)
 
-def p_assignment_operator(p):
-    '''
-    assignment_operator : '='
-    '''
-    p[0] = ASTNode("AssignmentOperator", value=p[1])
 
-def p_empty(p):
-    'empty :'
-    pass
+def generate_ast_graph(node, path='ast.gv', options=None):
+    # 把 AST 的 DOT 文本流式写入 path 并返回 path；大树按 options（astgraph.GraphOptions）折叠。
+    # 渲染成图片用 astgraph.render，或 graphviz.render('dot', 'png', path)
+    import astgraph
 
-def p_error(p):
-    print(f"Syntax error at line {p.lineno}, token {p.type}")
+    with open(path, 'w', encoding='utf-8') as f:
+        astgraph.write_dot(node, f.write, options)
+    return path
 
-parser = yacc.yacc()
 
-input_string = """
+if __name__ == '__main__':
+    input_string = """
     int a=10, b=20, c; c=a<40? A+b,a-b;
 """
 
+    result = get_parser().parse(input_string)
 
-result = parser.parse(input_string)
-
-if result:
-    print("语法分析成功！")
-else:
-    print("语法分析失败！")
-
-def print_ast(node, indent=0):
-    if node:
-        print("  " * indent + f"{node.node_type}")
-        if node.value is not None:
-            print("  " * (indent + 1) + f"Value: {node.value}")
-        for child in node.children:
-            print_ast(child, indent + 1)
-
-# 在解析完成后打印AST
-print_ast(result)
-
-
-def generate_ast_graph(node, graph=None):
-
-    if graph is None:
-        graph = graphviz.Digraph(format='png')
-
-    node_id = str(id(node))
-
-    if node.value is not None:
-        if isinstance(node.value, ASTNode):
-            value_id = str(id(node.value))
-            graph.node(value_id, label=f"{node.value.node_type}")
-            graph.edge(node_id, value_id)
-            generate_ast_graph(node.value, graph)
-        else:
-            graph.node(node_id, label=f"{node.node_type}\n{node.value}")
+    if result:
+        print("语法分析成功！")
     else:
-        graph.node(node_id, label=f"{node.node_type}")
-
-    for child in node.children:
-        if child is not None:
-            child_id = str(id(child))
-
-            if isinstance(child, ASTNode):
-                graph.edge(node_id, child_id)
-                generate_ast_graph(child, graph)
-            else:
-                graph.node(child_id, label=f"{child}")
-        else:
-            pass
-
-    return graph
+        print("语法分析失败！")
 
+    # 在解析完成后打印AST
+    print_ast(result)
 
-generate_ast_graph(result).view()
\ No newline at end of file
+    import graphviz
+    graphviz.view(graphviz.render('dot', 'png', generate_ast_graph(result)))
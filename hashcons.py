@@ -0,0 +1,107 @@
+import contextlib
+
+import gramma
+from gramma import ASTNode
+
+# 可选的 hash-consing：按 (节点类型, 值, 子节点的身份) 查表构造节点，结构相同的子树只有一个对象。
+# 生成的输入里 a+b、x[i]、常量这样的子表达式成千上万次重复，共享之后节点数和内存都大幅下降，
+# 后续的遍历（求值、生成 IR、画图）也可以按节点身份记忆结果。
+#
+# 共享的节点是 SharedNode：children 为元组、不可修改，带有缓存的结构哈希 hash，
+# hash(node) 直接返回它；相等仍按身份比较（同一张表里结构相同就是同一个对象）。
+# Program 和 DeclarationList 在解析过程中会原地追加子节点，不参与共享，仍是普通的 ASTNode。
+#
+#   with hash_consing() as table:           # 期间 gramma 的规则函数和 pratt 都经过 table 构造节点
+#       tree = parser.parse(text)
+#   table.stats()
+#   tree = NodeTable().share(tree)          # 已有的树也可以并入表中
+#
+# 替换的是 gramma.new_node 这个模块级的工厂，with 块里整个进程的解析都会查这张表。
+
+MUTABLE = frozenset(('Program', 'DeclarationList'))
+
+
+class SharedNode(ASTNode):
+    __slots__ = ('hash',)
+
+    def __init__(self, node_type, children, value=None):
+        super().__init__(node_type, children, value)
+        self.hash = hash((self.node_type, _value_key(value), tuple(structural_hash(c) for c in children)))
+
+    def __hash__(self):
+        return self.hash
+
+
+def _value_key(value):
+    # 1、1.0 和 True 相等且哈希相同，-0.0 == 0.0，所以带上类型，浮点按 repr 区分
+    if type(value) is float:
+        return float, repr(value)
+    return type(value), value
+
+
+def structural_hash(node):
+    # 共享节点直接取缓存；普通节点（Program、DeclarationList）现算，它们的子节点通常是共享的
+    if node is None:
+        return 0
+    if isinstance(node, SharedNode):
+        return node.hash
+    return hash((node.node_type, _value_key(node.value), tuple(structural_hash(c) for c in node.children)))
+
+
+class NodeTable:
+    def __init__(self):
+        self._nodes = {}
+        self.requests = 0
+        self.reused = 0
+
+    def node(self, node_type, children=None, value=None):
+        # 与 ASTNode 构造函数的参数相同，可以直接替换 gramma.new_node
+        self.requests += 1
+        if node_type in MUTABLE:
+            return ASTNode(node_type, children, value)
+        children = tuple(children) if children else ()
+        key = (node_type, _value_key(value), tuple(map(id, children)))
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = SharedNode(node_type, children, value)
+        else:
+            self.reused += 1
+        return node
+
+    def share(self, tree):
+        # 自底向上把一棵普通的树重建成共享节点（显式栈，不受递归深度限制）
+        done = {}
+        stack = [(tree, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node is None or id(node) in done:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((c, False) for c in node.children)
+                continue
+            children = [None if c is None else done[id(c)] for c in node.children]
+            done[id(node)] = self.node(node.node_type, children, node.value)
+        return done[id(tree)]
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def clear(self):
+        self._nodes.clear()
+        self.requests = 0
+        self.reused = 0
+
+    def stats(self):
+        return f"构造节点 {self.requests} 次，其中 {self.reused} 次复用已有节点；表中共 {len(self._nodes)} 个共享节点"
+
+
+@contextlib.contextmanager
+def hash_consing(table=None):
+    table = table if table is not None else NodeTable()
+    saved = gramma.new_node
+    gramma.new_node = table.node
+    try:
+        yield table
+    finally:
+        gramma.new_node = saved
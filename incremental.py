@@ -0,0 +1,128 @@
+import re
+
+import define
+from gramma import ASTNode, get_parser
+
+# 增量解析：顶层的每条声明都以 SEMICOLON 结束，且内部不会再出现分号（字符串常量除外），
+# 所以可以在顶层分号处把源码切成互相独立的语句段。再次解析时，文本没变的语句段
+# 直接复用上一次的 AST 子树，只有改动过的语句段才重新词法分析和语法分析。
+#
+# 任何一个改动过的语句段单独解析失败时，退回整段解析，保证结果与 parser.parse 一致。
+
+# 与词法分析器一致：字符串常量内的分号和换行都不算数
+_SPLIT = re.compile(r'"[^"]*"|;|\n')
+
+
+def split_statements(text):
+    # 返回 [(start, end, lineno)]，每段以分号结尾；最后一段可能是不含分号的尾部
+    segments = []
+    start = 0
+    lineno = 1
+    start_line = 1
+    for m in _SPLIT.finditer(text):
+        c = m.group()
+        if c == '\n':
+            lineno += 1
+        elif c == ';':
+            segments.append((start, m.end(), start_line))
+            start = m.end()
+            start_line = lineno
+    if start < len(text):
+        segments.append((start, len(text), start_line))
+    return segments
+
+
+class IncrementalParser:
+    def __init__(self, parser=None, lexer=None):
+        self.parser = parser or get_parser()
+        self.lexer = lexer or define.get_lexer()
+        self._segments = {}   # 语句段文本 -> [该段解析出的子节点列表, ...]
+        self.reused = 0
+        self.reparsed = 0
+        self.full_parses = 0
+
+    def _run(self, text, lineno, check, check_every, report=True):
+        # 返回 (tree, 是否出现过语法错误)；report=False 时只记录错误、不调用 p_error
+        lexer = self.lexer
+        lexer.lineno = lineno
+        lexer.input(text)
+        tokenfunc = None
+        if check is not None:
+            count = 0
+
+            def tokenfunc():
+                nonlocal count
+                count += 1
+                if count % check_every == 0:
+                    check()
+                return lexer.token()
+
+        errors = []
+        errorfunc = self.parser.errorfunc
+
+        def on_error(tok):
+            errors.append(tok)
+            if report and errorfunc:
+                return errorfunc(tok)
+
+        self.parser.errorfunc = on_error
+        try:
+            tree = self.parser.parse(lexer=lexer, tokenfunc=tokenfunc)
+        finally:
+            self.parser.errorfunc = errorfunc
+        return tree, bool(errors)
+
+    def full_parse(self, text, check=None, check_every=512):
+        # 有语法错误时保留上一次登记的语句段，改正之后仍可复用
+        self.full_parses += 1
+        tree, failed = self._run(text, 1, check, check_every)
+        if tree is not None and not failed:
+            self._segments = {}
+            self._remember(text, tree)
+        return tree
+
+    def _remember(self, text, tree):
+        # 把整段解析的结果按语句段登记，供下一次增量解析复用
+        segments = [text[s:e] for s, e, _ in split_statements(text) if text[s:e].strip()]
+        if len(segments) != len(tree.children):
+            return
+        for segment, child in zip(segments, tree.children):
+            self._segments.setdefault(segment, []).append([child])
+
+    def parse(self, text, check=None, check_every=512):
+        if not self._segments:
+            return self.full_parse(text, check, check_every)
+
+        previous = self._segments
+        used = {}
+        current = {}
+        children = []
+        reused = reparsed = 0
+        for start, end, lineno in split_statements(text):
+            segment = text[start:end]
+            if not segment.strip():
+                continue
+            cached = previous.get(segment, ())
+            index = used.get(segment, 0)
+            if index < len(cached):
+                nodes = cached[index]
+                used[segment] = index + 1
+                reused += 1
+            else:
+                if not segment.rstrip().endswith(';'):
+                    return self.full_parse(text, check, check_every)
+                if check is not None:
+                    check()
+                # 出错时不在这里报告，交给整段解析报告一次
+                tree, failed = self._run(segment, lineno, check, check_every, report=False)
+                if tree is None or failed:
+                    return self.full_parse(text, check, check_every)
+                nodes = tree.children
+                reparsed += 1
+            current.setdefault(segment, []).append(nodes)
+            children.extend(nodes)
+
+        self._segments = current
+        self.reused += reused
+        self.reparsed += reparsed
+        return ASTNode("Program", children)
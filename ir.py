@@ -0,0 +1,770 @@
+import math
+import operator
+from array import array
+from collections import Counter
+
+from evaluator import (BINARY_NODES, INTEGRAL, STORE, EvalError, array_access_node, c_div, c_fdiv, c_mod, c_shl,
+                       c_shr, common_type, operator_value, primary_node, promote, wrap_char, wrap_int)
+from gramma import get_parser
+
+# 中间代码：把 AST 翻译成三地址码（四元式），再在基本块内做局部优化。
+#
+# 每条指令是一个四元组 (op, a, b, c)：
+#   c = a op b           op 为 C 的二元运算符（+ - * / % << >> & | ^ < > <= >= == !=）
+#   c = op a             op 为 neg not inv（- ! ~）、cast（转换成 c 的类型）、copy
+#   c = a[b]             load；a 为数组名或字符串常量
+#   a[b] = c             store（这里 c 是被存入的值，不是结果）
+#   array a b c          声明长度为 a 的数组 c，每个元素初始化为 b
+#   label c / goto c / iffalse a c
+# 操作数是变量名、临时变量（%1 %2 ...）、int/float 常量或字符串常量。
+# 运算按结果 c 的类型进行：int 回绕、float 舍入到单精度，语义与 evaluator 相同；
+# 不同类型之间的转换都显式地由 cast 完成，所以 copy 两边的值总是同一种类型能表示的。
+#
+#   code = lower(tree)           # 翻译
+#   optimized = optimize(code)   # 常量折叠、复写传播、公共子表达式消除、删除无用临时变量
+#   values, steps = run(optimized)
+
+BINARY_OPS = ('+', '-', '*', '/', '%', '<<', '>>', '&', '|', '^', '<', '>', '<=', '>=', '==', '!=')
+UNARY_OPS = ('neg', 'not', 'inv', 'cast', 'copy')
+OPS = BINARY_OPS + UNARY_OPS + ('load', 'store', 'array', 'label', 'goto', 'iffalse')
+OPCODES = {op: code for code, op in enumerate(OPS)}
+PURE = frozenset(BINARY_OPS + UNARY_OPS + ('load',))     # 不写变量以外的存储，公共子表达式消除可以合并
+JUMPS = frozenset(('goto', 'iffalse'))
+COMMUTATIVE = frozenset(('+', '*', '&', '|', '^', '==', '!='))
+
+_PYTHON = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '&': operator.and_, '|': operator.or_, '^': operator.xor,
+    '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+    '==': operator.eq, '!=': operator.ne,
+}
+_COMPARE = frozenset(('<', '>', '<=', '>=', '==', '!='))
+
+
+def is_temp(x):
+    return isinstance(x, str) and x.startswith('%')
+
+
+def is_name(x):
+    # 变量或临时变量；字符串常量以引号开头
+    return isinstance(x, str) and not x.startswith('"')
+
+
+def is_constant(x):
+    return isinstance(x, (int, float))
+
+
+def apply(op, ctype, a, b=None):
+    # 按结果类型 ctype 计算一条指令的值；执行和常量折叠都用它，两者的结果不会不一致
+    if op in _COMPARE:
+        return 1 if _PYTHON[op](a, b) else 0
+    if op == '/':
+        return c_div(a, b) if ctype in INTEGRAL else STORE[ctype](c_fdiv(a, b))
+    if op == '%':
+        return c_mod(a, b)
+    if op == '<<':
+        return c_shl(a, b)
+    if op == '>>':
+        return c_shr(a, b)
+    if op in _PYTHON:
+        return STORE[ctype](_PYTHON[op](a, b))
+    if op == 'neg':
+        return STORE[ctype](-a)
+    if op == 'not':
+        return 0 if a else 1
+    if op == 'inv':
+        return ~a
+    if op == 'cast':
+        return STORE[ctype](a)
+    if op == 'copy':
+        return a
+    raise EvalError(f"unknown operation {op}")
+
+
+def string_data(literal):
+    return [wrap_char(b) for b in literal[1:-1].encode('utf-8')] + [0]
+
+
+def uses(q):
+    # 指令读取的操作数（可能含常量和 None）
+    op, a, b, c = q
+    if op in ('label', 'goto'):
+        return ()
+    if op == 'iffalse':
+        return (a,)
+    if op == 'store':
+        return (a, b, c)
+    if op == 'array':
+        return (b,)
+    return (a, b)
+
+
+def defines(q):
+    op = q[0]
+    if op in ('store', 'label', 'goto', 'iffalse'):
+        return None
+    return q[3]
+
+
+class IR:
+    def __init__(self, code, types, variables, arrays):
+        self.code = code                # [(op, a, b, c)]
+        self.types = types              # 变量和临时变量 -> C 类型
+        self.variables = variables      # 源程序中的变量，按声明顺序
+        self.arrays = arrays            # 数组名 -> 长度
+
+    def __len__(self):
+        return len(self.code)
+
+    def replace(self, code):
+        return IR(code, self.types, self.variables, self.arrays)
+
+    def format(self):
+        lines = []
+        for op, a, b, c in self.code:
+            if op in BINARY_OPS:
+                lines.append(f"    {c} = {a} {op} {b}")
+            elif op in ('neg', 'not', 'inv'):
+                lines.append(f"    {c} = {dict(neg='-', inv='~').get(op, '!')}{a}")
+            elif op == 'cast':
+                lines.append(f"    {c} = ({self.types[c]}) {a}")
+            elif op == 'copy':
+                lines.append(f"    {c} = {a}")
+            elif op == 'load':
+                lines.append(f"    {c} = {a}[{b}]")
+            elif op == 'store':
+                lines.append(f"    {a}[{b}] = {c}")
+            elif op == 'array':
+                lines.append(f"    {self.types[c]} {c}[{a}] = {b}")
+            elif op == 'label':
+                lines.append(f"{c}:")
+            elif op == 'goto':
+                lines.append(f"    goto {c}")
+            else:
+                lines.append(f"    iffalse {a} goto {c}")
+        return '\n'.join(lines)
+
+    def pack(self):
+        # 紧凑形式：每条指令 4 个 int（操作码和三个操作数下标，0 表示没有），操作数放在一张表里
+        operands = []
+        index = {}
+
+        def ref(x):
+            if x is None:
+                return 0
+            key = (type(x), repr(x) if isinstance(x, float) else x)     # 0.0 和 -0.0 要分开
+            if key not in index:
+                operands.append(x)
+                index[key] = len(operands)
+            return index[key]
+
+        words = array('i')
+        for op, a, b, c in self.code:
+            words.extend((OPCODES[op], ref(a), ref(b), ref(c)))
+        return words, operands
+
+
+def unpack(words, operands):
+    table = (None,) + tuple(operands)
+    return [(OPS[words[i]], table[words[i + 1]], table[words[i + 2]], table[words[i + 3]])
+            for i in range(0, len(words), 4)]
+
+
+class Lowering:
+    def __init__(self, implicit_int=True):
+        self.code = []
+        self.types = {}
+        self.variables = []
+        self.arrays = {}
+        self.temps = 0
+        self.labels = 0
+        self.implicit_int = implicit_int     # 给未声明的变量赋值时按 int 隐式声明（a=2+5）
+
+    def emit(self, op, a=None, b=None, c=None):
+        self.code.append((op, a, b, c))
+
+    def temp(self, ctype):
+        self.temps += 1
+        name = f"%{self.temps}"
+        self.types[name] = ctype
+        return name
+
+    def label(self):
+        self.labels += 1
+        return f"L{self.labels}"
+
+    def declare(self, name, ctype, length=None):
+        if name in self.types:
+            raise EvalError(f"redeclaration of '{name}'")
+        self.types[name] = ctype
+        self.variables.append(name)
+        if length is not None:
+            self.arrays[name] = length
+
+    def lookup(self, name):
+        if name not in self.types:
+            raise EvalError(f"'{name}' undeclared")
+        return self.types[name]
+
+    def convert(self, operand, src, dst):
+        # 值不变的转换（char -> int、float -> double）不需要指令
+        if src == dst or (src == 'char' and dst == 'int') or (src == 'float' and dst == 'double'):
+            return operand
+        t = self.temp(dst)
+        self.emit('cast', operand, None, t)
+        return t
+
+    def move(self, operand, src, dest):
+        dst = self.types[dest]
+        same = src == dst or (src == 'char' and dst == 'int') or (src == 'float' and dst == 'double')
+        self.emit('copy' if same else 'cast', operand, None, dest)
+
+    # ---- 表达式 ----
+
+    def expression(self, node):
+        # 返回 (操作数, C 类型)
+        if node is None:
+            raise EvalError("missing expression")
+        kind = node.node_type
+        if kind == 'PrimaryExpression':
+            return self.primary(node)
+        if kind in BINARY_NODES:
+            return self.binary(node)
+        if kind == 'ConditionalExpression':
+            return self.conditional(node)
+        if kind == 'UnaryExpression':
+            return self.unary(node.children[0].value, node.children[1])
+        if kind == 'PostfixExpression':
+            return self.increment(node.children[0], node.children[1].value, prefix=False)
+        if kind == 'ArrayAccess':
+            base, index, ctype = self.element(node.children[0], node.children[1])
+            t = self.temp(ctype)
+            self.emit('load', base, index, t)
+            return t, ctype
+        raise EvalError(f"cannot evaluate {kind}")
+
+    def primary(self, node):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise EvalError(f"bad primary expression {value!r}")
+        if isinstance(value, int):
+            return wrap_int(value), 'int'
+        if isinstance(value, float):
+            return value, 'double'
+        if value.startswith('"'):
+            raise EvalError("a string constant can only be subscripted")
+        ctype = self.lookup(value)
+        if value in self.arrays:
+            raise EvalError(f"array '{value}' used as a value")
+        return value, ctype
+
+    def binary(self, node):
+        # a+b+c+... 沿左脊逐个节点翻译，不按层递归，链再长也不受递归上限限制；右操作数照常递归。
+        # 生成的指令与逐层递归翻译时相同：先算左边的整条链，再算右操作数
+        spine = []
+        while node is not None and node.node_type in BINARY_NODES:
+            spine.append(node)
+            node = node.children[0]
+        left = self.expression(node)
+        for node in reversed(spine):
+            op = operator_value(node, 1)
+            if op in ('&&', '||'):
+                left = self.logical(op, left, node.children[2])
+            else:
+                left = self.combine(op, left, self.expression(node.children[2]))
+        return left
+
+    def combine(self, op, left, right):
+        # 两个操作数都已求值，按一般算术转换插入 cast 后生成运算指令
+        (l, lt), (r, rt) = left, right
+        if op in ('<<', '>>'):
+            if lt not in INTEGRAL or rt not in INTEGRAL:
+                raise EvalError(f"invalid operands to {op}: {lt} and {rt}")
+            t = self.temp('int')
+            self.emit(op, l, r, t)
+            return t, 'int'
+        if op not in BINARY_OPS:
+            raise EvalError(f"unsupported operator {op}")
+        ctype = common_type(lt, rt)
+        if ctype not in INTEGRAL and op in ('%', '&', '|', '^'):
+            raise EvalError(f"invalid operands to {op}: {lt} and {rt}")
+        l = self.convert(l, lt, ctype)
+        r = self.convert(r, rt, ctype)
+        t = self.temp('int' if op in _COMPARE else ctype)
+        self.emit(op, l, r, t)
+        return t, self.types[t]
+
+    def logical(self, op, left, right):
+        # left 是已经翻译好的 (操作数, 类型)，right 还是节点
+        # a && b:  t = a; iffalse t goto F; u = b; r = u != 0; goto E; F: r = 0; E:
+        # a || b:  t = a; iffalse t goto R; r = 1; goto E; R: u = b; r = u != 0; E:
+        l, _ = left
+        result = self.temp('int')
+        other = self.label()
+        end = self.label()
+        self.emit('iffalse', l, None, other)
+        if op == '||':
+            self.emit('copy', 1, None, result)
+            self.emit('goto', c=end)
+            self.emit('label', c=other)
+        r, _ = self.expression(right)
+        self.emit('!=', r, 0, result)
+        if op == '&&':
+            self.emit('goto', c=end)
+            self.emit('label', c=other)
+            self.emit('copy', 0, None, result)
+        self.emit('label', c=end)
+        return result, 'int'
+
+    def conditional(self, node):
+        # 结果类型要两边都翻译完才知道，两个分支先各自翻译到单独的列表里，再按类型插入转换拼起来
+        c = node.children
+        test, _ = self.expression(c[0])
+        code = self.code
+        self.code = []
+        then, tt = self.expression(c[2])
+        then_code = self.code
+        self.code = []
+        other, et = self.expression(c[3])
+        other_code = self.code
+        self.code = code
+
+        ctype = common_type(tt, et)
+        result = self.temp(ctype)
+        otherwise = self.label()
+        end = self.label()
+        self.emit('iffalse', test, None, otherwise)
+        self.code.extend(then_code)
+        self.move(self.convert(then, tt, ctype), ctype, result)
+        self.emit('goto', c=end)
+        self.emit('label', c=otherwise)
+        self.code.extend(other_code)
+        self.move(self.convert(other, et, ctype), ctype, result)
+        self.emit('label', c=end)
+        return result, ctype
+
+    def unary(self, op, operand):
+        if op in ('++', '--'):
+            return self.increment(operand, op, prefix=True)
+        a, ctype = self.expression(operand)
+        if op == '+':
+            return a, promote(ctype)
+        if op == '!':
+            t = self.temp('int')
+            self.emit('not', a, None, t)
+            return t, 'int'
+        if op == '-':
+            t = self.temp(promote(ctype))
+            self.emit('neg', a, None, t)
+            return t, self.types[t]
+        if op == '~':
+            if ctype not in INTEGRAL:
+                raise EvalError(f"invalid operand to ~: {ctype}")
+            t = self.temp('int')
+            self.emit('inv', a, None, t)
+            return t, 'int'
+        raise EvalError(f"unsupported unary operator {op}")
+
+    # ---- 左值 ----
+
+    def element(self, base, index):
+        # 返回 (数组名或字符串常量, 下标操作数, 元素类型)
+        if base is None or base.node_type != 'PrimaryExpression' or not isinstance(base.value, str):
+            raise EvalError("subscripted value is not an array")
+        k, it = self.expression(index)
+        if it not in INTEGRAL:
+            raise EvalError("array subscript is not an integer")
+        if base.value.startswith('"'):
+            return base.value, k, 'char'
+        name = base.value
+        ctype = self.lookup(name)
+        if name not in self.arrays:
+            raise EvalError(f"subscripted value '{name}' is not an array")
+        return name, k, ctype
+
+    def variable(self, node):
+        if node is not None and node.node_type == 'PrimaryExpression' and isinstance(node.value, str) \
+                and not node.value.startswith('"'):
+            self.lookup(node.value)
+            if node.value in self.arrays:
+                raise EvalError(f"array '{node.value}' is not assignable")
+            return node.value
+        if node is None or node.node_type != 'ArrayAccess':
+            raise EvalError("lvalue required")
+        return None
+
+    def increment(self, operand, op, prefix):
+        delta = 1 if op == '++' else -1
+        name = self.variable(operand)
+        if name is not None:
+            ctype = self.types[name]
+            old = None
+            if not prefix:
+                old = self.temp(ctype)
+                self.emit('copy', name, None, old)
+            at = common_type(ctype, 'int')
+            t = self.temp(at)
+            self.emit('+', name, delta, t)
+            self.move(t, at, name)
+            return (name, ctype) if prefix else (old, ctype)
+        base, k, ctype = self.element(operand.children[0], operand.children[1])
+        if base.startswith('"'):
+            raise EvalError("lvalue required as increment operand")
+        old = self.temp(ctype)
+        self.emit('load', base, k, old)
+        at = common_type(ctype, 'int')
+        t = self.temp(at)
+        self.emit('+', old, delta, t)
+        new = self.convert(t, at, ctype)
+        self.emit('store', base, k, new)
+        return (new if prefix else old), ctype
+
+    def assign(self, target, value):
+        v, vt = value
+        name = self.variable(target)
+        if name is not None:
+            ctype = self.types[name]
+            self.move(v, vt, name)
+            return name, ctype
+        base, k, ctype = self.element(target.children[0], target.children[1])
+        if base.startswith('"'):
+            raise EvalError("assignment to a string constant")
+        v = self.convert(v, vt, ctype)
+        self.emit('store', base, k, v)
+        return v, ctype
+
+    # ---- 语句 ----
+
+    def statement(self, node):
+        kind = node.node_type
+        if kind == 'Declaration':
+            ctype = node.children[0].value
+            if ctype not in STORE:
+                raise EvalError(f"unknown type {ctype!r}")
+            items = node.children[1]
+            for item in (items.children if items.node_type == 'DeclarationList' else [items]):
+                self.declaration(ctype, item)
+        elif kind == 'Identifier':
+            self.primary(node)
+        elif kind == 'DeclarationWithoutType':
+            name, value = node.children
+            if name.value not in self.types and self.implicit_int:
+                self.declare(name.value, 'int')
+            self.assign(primary_node(name.value), self.expression(value))
+        elif kind == 'ArrayDeclarationWithoutType':
+            name, index = node.children
+            self.expression(array_access_node(name.value, index.value))
+        elif kind == 'ArrayDeclarationWithoutTypeWithAssignment':
+            name, index, value = node.children
+            self.assign(array_access_node(name.value, index.value), self.expression(value))
+        else:
+            self.expression(node)
+
+    def declaration(self, ctype, item):
+        kind = item.node_type
+        if kind == 'Identifier':
+            self.declare(item.value, ctype)
+            self.emit('copy', STORE[ctype](0), None, item.value)
+        elif kind == 'DeclarationWithAssignment':
+            v, vt = self.expression(item.children[1])
+            name = item.children[0].value
+            self.declare(name, ctype)
+            self.move(v, vt, name)
+        elif kind in ('ArrayDeclaration', 'ArrayDeclarationWithAssignment'):
+            length = item.children[1].value
+            if not isinstance(length, int) or length <= 0:
+                raise EvalError(f"invalid array size {length!r}")
+            v, vt = self.expression(item.children[2]) if len(item.children) > 2 else (0, 'int')
+            v = self.convert(v, vt, ctype)
+            name = item.children[0].value
+            self.declare(name, ctype, length)
+            self.emit('array', length, v, name)
+        else:
+            raise EvalError(f"cannot declare {kind}")
+
+
+def lower(tree, implicit_int=True):
+    if tree is None:
+        raise EvalError("no syntax tree")
+    lowering = Lowering(implicit_int)
+    try:
+        for child in tree.children if tree.node_type == 'Program' else [tree]:
+            if child is not None:
+                lowering.statement(child)
+    except RecursionError:
+        # 左结合的运算链不递归；只有几百层括号、前缀运算符或 ?: 这样的嵌套才会走到这里
+        raise EvalError("expression nested too deeply") from None
+    return IR(lowering.code, lowering.types, lowering.variables, lowering.arrays)
+
+
+# ---- 优化 ----
+
+def basic_blocks(code):
+    # 基本块从 label 开始、到跳转结束
+    blocks = []
+    current = []
+    for q in code:
+        if q[0] == 'label' and current:
+            blocks.append(current)
+            current = []
+        current.append(q)
+        if q[0] in JUMPS:
+            blocks.append(current)
+            current = []
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def _key(op, a, b, ctype):
+    # 公共子表达式的键；常量带上类型，1 和 1.0 不算同一个操作数
+    if op in COMMUTATIVE and repr(b) < repr(a):
+        a, b = b, a
+    return (op, type(a), a, type(b), b, ctype)
+
+
+def _simplify(op, a, b, ctype):
+    # 整数的代数恒等式：x+0 x-0 x*1 x|0 x^0 x<<0 x>>0 x/1 -> x，x*0 x&0 -> 0
+    if ctype not in INTEGRAL:
+        return None
+    if b == 0 and isinstance(b, int) and op in ('+', '-', '|', '^', '<<', '>>'):
+        return a
+    if a == 0 and isinstance(a, int) and op in ('+', '|', '^'):
+        return b
+    if b == 1 and isinstance(b, int) and op in ('*', '/'):
+        return a
+    if a == 1 and isinstance(a, int) and op == '*':
+        return b
+    if op in ('*', '&') and ((a == 0 and isinstance(a, int)) or (b == 0 and isinstance(b, int))):
+        return 0
+    return None
+
+
+def optimize_block(block, types, fold=True, propagate=True, cse=True):
+    # 基本块内的常量折叠、复写传播（含常量传播）和公共子表达式消除，一遍扫描完成
+    copies = {}                     # 名字 -> 与它相等的操作数
+    copied_from = {}                # 操作数 -> {以它为副本的名字}
+    available = {}                  # 表达式键 -> 保存结果的名字
+    mentions = {}                   # 名字 -> {用到它的表达式键}
+    out = []
+
+    def kill(name):
+        # name 被重新赋值：以它为源或目标的副本、用到它或保存在它里面的表达式都失效
+        source = copies.pop(name, None)
+        if source is not None:
+            copied_from.get(source, set()).discard(name)
+        for other in copied_from.pop(name, ()):
+            copies.pop(other, None)
+        for key in mentions.pop(name, ()):
+            available.pop(key, None)
+
+    for q in block:
+        op, a, b, c = q
+        if propagate and op not in ('label', 'goto'):
+            if op in ('load', 'store'):
+                b = copies.get(b, b) if is_name(b) else b
+                if op == 'store':
+                    c = copies.get(c, c) if is_name(c) else c
+            elif op == 'array':
+                b = copies.get(b, b) if is_name(b) else b
+            else:
+                a = copies.get(a, a) if is_name(a) else a
+                b = copies.get(b, b) if is_name(b) else b
+        if fold:
+            if (op in BINARY_OPS and is_constant(a) and is_constant(b)) or \
+                    (op in UNARY_OPS and op != 'copy' and is_constant(a)):
+                try:
+                    op, a, b = 'copy', apply(op, types[c], a, b), None
+                except EvalError:
+                    pass        # 例如除以零：留到运行时报错
+            elif op in BINARY_OPS:
+                same = _simplify(op, a, b, types[c])
+                if same is not None:
+                    op, a, b = 'copy', same, None
+            elif op == 'load' and isinstance(a, str) and a.startswith('"') and isinstance(b, int):
+                data = string_data(a)
+                if 0 <= b < len(data):
+                    op, a, b = 'copy', data[b], None
+            elif op == 'iffalse' and is_constant(a):
+                if a:
+                    continue
+                op, a = 'goto', None
+        key = None
+        if cse and op in PURE and op != 'copy':
+            key = _key(op, a, b, types[c])
+            holder = available.get(key)
+            if holder is not None:
+                op, a, b = 'copy', holder, None
+                key = None
+        out.append((op, a, b, c))
+
+        if op in ('store', 'array'):
+            array_name = a if op == 'store' else c
+            for k in mentions.pop(('[]', array_name), ()):
+                available.pop(k, None)
+        d = defines((op, a, b, c))
+        if d is None:
+            continue
+        kill(d)
+        if op == 'copy' and a != d and (is_constant(a) or is_name(a)):
+            copies[d] = a
+            if is_name(a):
+                copied_from.setdefault(a, set()).add(d)
+        elif key is not None and d not in (a, b):
+            available[key] = d
+            for x in (a, b):
+                if is_name(x):
+                    mentions.setdefault(x, set()).add(key)
+            mentions.setdefault(d, set()).add(key)
+            if op == 'load':
+                mentions.setdefault(('[]', a), set()).add(key)
+    return out
+
+
+def may_trap(q, types, arrays):
+    # 执行时可能报 EvalError 的指令：整数除以零、移位位数越界、下标越界、nan 或 inf 转成整数。
+    # 只有操作数是常量、能证明不会出错时才返回 False
+    op, a, b, c = q
+    if op == '/' or op == '%':
+        return types[c] in INTEGRAL and not (is_constant(b) and b != 0)
+    if op == '<<' or op == '>>':
+        return not (isinstance(b, int) and 0 <= b < 32)
+    if op == 'load':
+        length = len(string_data(a)) if a.startswith('"') else arrays.get(a)
+        return not (isinstance(b, int) and length is not None and 0 <= b < length)
+    if op == 'cast' and types[c] in INTEGRAL:
+        if is_constant(a):
+            return not math.isfinite(a)
+        return types[a] not in INTEGRAL
+    return False
+
+
+def remove_dead_temporaries(code, types, arrays):
+    # 结果没有被任何指令读取的临时变量，连同算出它的指令一起删掉；删完可能又有新的，反复进行。
+    # 可能出错的指令不删：否则除以零、下标越界的程序会变成正常结束，与 evaluator 不一致
+    counts = Counter(x for q in code for x in uses(q) if is_temp(x))
+    alive = [True] * len(code)
+    definitions = {}
+    for i, q in enumerate(code):
+        if q[0] in PURE and is_temp(q[3]) and not may_trap(q, types, arrays):
+            definitions.setdefault(q[3], []).append(i)
+    work = [t for t in definitions if counts[t] == 0]
+    while work:
+        t = work.pop()
+        for i in definitions.pop(t, ()):
+            alive[i] = False
+            for x in uses(code[i]):
+                if is_temp(x):
+                    counts[x] -= 1
+                    if counts[x] == 0 and x in definitions:
+                        work.append(x)
+    return [q for q, keep in zip(code, alive) if keep]
+
+
+def remove_jumps(code):
+    # 删除不可达的指令、跳到下一条的 goto 和没有人跳转的 label
+    out = []
+    reachable = True
+    for q in code:
+        if q[0] == 'label':
+            reachable = True
+        if reachable:
+            out.append(q)
+        if q[0] == 'goto':
+            reachable = False
+    code = out
+    out = []
+    for i, q in enumerate(code):
+        if q[0] == 'goto':
+            j = i + 1
+            while j < len(code) and code[j][0] == 'label' and code[j][3] != q[3]:
+                j += 1
+            if j < len(code) and code[j][0] == 'label' and code[j][3] == q[3]:
+                continue
+        out.append(q)
+    targets = {q[3] for q in out if q[0] in JUMPS}
+    return [q for q in out if q[0] != 'label' or q[3] in targets]
+
+
+def _same(code, other):
+    # 常量可能是 nan，不能直接用 ==
+    return len(code) == len(other) and all(p == q or repr(p) == repr(q) for p, q in zip(code, other))
+
+
+PASSES = frozenset(('fold', 'propagate', 'cse', 'dead', 'jumps'))
+
+
+def optimize(ir, passes=PASSES):
+    # 各个优化互相创造机会（传播出常量才能折叠，折叠出常量条件才能删跳转），重复到不再变化
+    code = ir.code
+    local = {name: name in passes for name in ('fold', 'propagate', 'cse')}
+    while True:
+        before = code
+        if any(local.values()):
+            code = [q for block in basic_blocks(code) for q in optimize_block(block, ir.types, **local)]
+        if 'jumps' in passes:
+            code = remove_jumps(code)
+        if 'dead' in passes:
+            code = remove_dead_temporaries(code, ir.types, ir.arrays)
+        if _same(code, before):
+            return ir.replace(code)
+
+
+# ---- 执行 ----
+
+def run(ir):
+    # 解释执行三地址码，返回 (变量的最终值, 执行的指令条数)；变量与 evaluator 一样先置零
+    code = ir.code
+    types = ir.types
+    targets = {q[3]: i for i, q in enumerate(code) if q[0] == 'label'}
+    env = {}
+    for name in ir.variables:
+        zero = STORE[types[name]](0)
+        env[name] = [zero] * ir.arrays[name] if name in ir.arrays else zero
+    strings = {}
+
+    def value(x):
+        return env[x] if isinstance(x, str) else x
+
+    def element(base, k):
+        if base.startswith('"'):
+            if base not in strings:
+                strings[base] = string_data(base)
+            data = strings[base]
+        else:
+            data = env[base]
+        if not 0 <= k < len(data):
+            raise EvalError(f"index {k} out of bounds for '{base}[{len(data)}]'")
+        return data
+
+    pc = 0
+    steps = 0
+    end = len(code)
+    while pc < end:
+        op, a, b, c = code[pc]
+        pc += 1
+        if op == 'label':
+            continue
+        steps += 1
+        if op == 'goto':
+            pc = targets[c]
+        elif op == 'iffalse':
+            if not value(a):
+                pc = targets[c]
+        elif op == 'load':
+            k = value(b)
+            env[c] = element(a, k)[k]
+        elif op == 'store':
+            k = value(b)
+            element(a, k)[k] = STORE[types[a]](value(c))
+        elif op == 'array':
+            env[c] = [STORE[types[c]](value(b))] * a
+        else:
+            env[c] = apply(op, types[c], value(a), value(b) if b is not None else None)
+    return {name: env[name] for name in ir.variables}, steps
+
+
+def compile_source(text, parser=None, optimized=True):
+    parser = parser or get_parser()
+    code = lower(parser.parse(text))
+    return optimize(code) if optimized else code
@@ -1,5 +1,7 @@
-import ply.lex as lex
+import sys
+
 import define
+import streamlex
 
 data = '''
 int main() {
@@ -8,7 +10,12 @@ int main() {
 }
 '''
 
-define.lexer.input(data)
+# 带文件名参数时流式读取该文件，逐个打印 token 及其行列号
+if len(sys.argv) > 1:
+    for token in streamlex.tokens(sys.argv[1]):
+        print(f"{token.lineno}:{token.column}\t{token}")
+else:
+    define.lexer.input(data)
 
-for token in define.lexer:
-    print(token)
\ No newline at end of file
+    for token in define.lexer:
+        print(token)
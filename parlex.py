@@ -0,0 +1,137 @@
+import contextlib
+import io
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import define
+from streamlex import open_source
+from tokbuf import TokenBuffer
+
+# 并行词法分析：在顶层分号（字符串常量之外）处把源码切成几段，各段交给进程池
+# 分别生成 TokenBuffer，再按顺序拼成一个。结果与 TokenBuffer(整个源码) 完全相同：
+#
+#   - 分号之后不可能处在某个 token 中间，唯一能跨过分号的只有字符串常量；
+#     词法分析器见到的引号总是从头依次两两配对（最后落单的一个是非法字符），
+#     所以分号前引号个数为偶数、或者后面再没有引号时，分号就在字符串之外；
+#   - 行号只由 t_NewLine 增加，字符串常量里的换行不算，每段的起始行号在切分时算好，
+#     t_error 输出的行号也因此正确；各段的输出先收集起来，再按顺序打印。
+
+_STRING = re.compile(rb'"[^"]*"')
+_WINDOW = 16 << 20
+
+
+def _count(data, byte, start, end):
+    # mmap 没有 count()，分窗口复制出来再数，内存占用有上限
+    if not isinstance(data, mmap.mmap):
+        return data.count(byte, start, end)
+    return sum(data[a:min(a + _WINDOW, end)].count(byte) for a in range(start, end, _WINDOW))
+
+
+def split_points(data, parts):
+    # 返回切分位置 [0, p1, ..., len(data)]，每个 p 都紧跟在一个字符串之外的分号后面
+    size = len(data)
+    points = [0]
+    pos = 0
+    quotes = 0                      # data[:pos] 中的引号个数
+    for i in range(1, parts):
+        target = size * i // parts
+        if target <= pos:
+            continue
+        quotes += _count(data, b'"', pos, target)
+        pos = target
+        while True:
+            semi = data.find(b';', pos)
+            if semi < 0:
+                return points + [size]
+            quotes += _count(data, b'"', pos, semi)
+            pos = semi
+            if quotes % 2 == 0:
+                break
+            close = data.find(b'"', semi)
+            if close < 0:
+                break
+            quotes += _count(data, b'"', semi, close + 1)
+            pos = close + 1
+        pos += 1
+        if pos < size:
+            points.append(pos)
+    return points + [size]
+
+
+def line_numbers(data, points):
+    # 每段开始处的行号：之前的换行数减去字符串常量里的换行数
+    starts = []
+    lineno = 1
+    previous = 0
+    for point in points[:-1]:
+        lineno += _count(data, b'\n', previous, point)
+        if data.find(b'"', previous, point) >= 0:
+            for m in _STRING.finditer(data, previous, point):
+                lineno -= m.group().count(b'\n')
+        starts.append(lineno)
+        previous = point
+    return starts
+
+
+def _lex_chunk(task):
+    # 在工作进程中运行：task 为 (源码片段或文件路径, 起始字节, 结束字节, 起始行号)
+    source, start, end, lineno = task
+    close = None
+    if isinstance(source, str):
+        data, close = open_source(source)
+        chunk = memoryview(data)[start:end]
+    else:
+        chunk = source
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            buffer = TokenBuffer(chunk, lineno=lineno, offset=start)
+        result = buffer.dump()
+        buffer.view.release()
+    finally:
+        if close is not None:
+            chunk.release()
+            close()
+    return result, out.getvalue()
+
+
+def _lex(data, path, workers, executor, chunks_per_worker, min_chunk, close=None):
+    workers = workers or os.cpu_count() or 1
+    parts = min(workers * chunks_per_worker, max(len(data) // min_chunk, 1))
+    if parts <= 1:
+        return TokenBuffer(data, _close=close)
+    points = split_points(data, parts)
+    lines = line_numbers(data, points)
+    tasks = [(path if path is not None else bytes(data[a:b]), a, b, lineno)
+             for a, b, lineno in zip(points, points[1:], lines)]
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_lex_chunk, tasks))
+    else:
+        results = list(executor.map(_lex_chunk, tasks))
+    dumps = []
+    for dump, output in results:
+        sys.stdout.write(output)
+        dumps.append(dump)
+    return TokenBuffer.join(data, dumps, define, close)
+
+
+def lex_parallel(data, workers=None, executor=None, chunks_per_worker=2, min_chunk=1 << 16):
+    # data 为 str 或 bytes；各段复制后发给工作进程
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return _lex(data, None, workers, executor, chunks_per_worker, min_chunk)
+
+
+def lex_file_parallel(path, workers=None, executor=None, chunks_per_worker=2, min_chunk=1 << 16):
+    # 工作进程各自 mmap 同一个文件，只传文件名和字节范围
+    data, close = open_source(os.fspath(path))
+    try:
+        return _lex(data, os.fspath(path), workers, executor, chunks_per_worker, min_chunk, close)
+    except BaseException:
+        if close is not None:
+            close()
+        raise
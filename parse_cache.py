@@ -0,0 +1,55 @@
+import hashlib
+from collections import OrderedDict
+
+# 按编辑器内容的哈希缓存解析结果。同一段文本的“分析”“展示AST”“保存AST图”
+# 只解析一次，渲染出的图片和语义分析结果也挂在同一个缓存项上复用。
+
+
+class CacheEntry:
+    __slots__ = ('key', 'tree', 'images', 'semantics')
+
+    def __init__(self, key, tree):
+        self.key = key
+        self.tree = tree
+        self.images = {}
+        self.semantics = None
+
+
+class ParseCache:
+    def __init__(self, parse, maxsize=16):
+        self._parse = parse
+        self._entries = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text):
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def entry(self, text, parse=None):
+        # parse 可临时替换解析函数（例如带取消检查的版本），结果照常入缓存
+        key = self.key(text)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        entry = CacheEntry(key, (parse or self._parse)(text))
+        self.misses += 1
+        self._entries[key] = entry
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def parse(self, text):
+        return self.entry(text).tree
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return f"缓存命中 {self.hits} / 未命中 {self.misses}"
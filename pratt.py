@@ -0,0 +1,271 @@
+import define
+import gramma
+
+# 表达式的优先级爬升（Pratt）解析：声明和语句仍然调用 gramma 里的规则函数
+# （p_program、p_declaration、p_declaration_item ...），表达式不查 LALR 分析表，
+# 而是按下面这一张运算符表解析。每个操作数只构造一次节点，
+# 没有 primary_expression → postfix_expression → ... → expression 这一串单位归约。
+# 表达式在显式栈上解析，与 LALR 一样接受任意深的嵌套，不会 RecursionError。
+#
+# 得到的树与 gramma 的 LALR 文法完全相同，优先级和结合性都与 C 一致：
+#   二元运算符   按 gramma.precedence 分层、左结合，得到 LogicalOrExpression、RelationalExpression 等节点
+#   ?:          比所有二元运算符都低、右结合，a < b ? c : d 即 (a < b) ? c : d；
+#               冒号也可以写成逗号（题目示例里的 a<40? a+b,a-b）
+# 语法错误与 ply 的处理一致：调用 errorfunc（p_error）报告，丢掉出错的 token，从下一个 token
+# 重新开始整个程序；上次出错之后移进不到 3 个 token 又出错时不再报告；在输入末尾出错时返回 None。
+#
+#   parser = gramma.get_parser('pratt')
+#   tree = parser.parse("int a = 1, b = a < 2 ? a : -a;")
+
+# 二元运算符：token 类型 -> (优先级, 节点类型, 运算符节点类型)，数字越大结合越紧；
+# 与 LALR 文法共用同一张优先级表 gramma.precedence 和节点表 gramma.OPERATOR_NODES
+BINARY = {
+    name: (level, *gramma.OPERATOR_NODES[name])
+    for level, (_, *names) in enumerate(gramma.precedence, 1)
+    for name in names if name in gramma.OPERATOR_NODES
+}
+LOWEST = 1
+UNARY = len(gramma.precedence) + 1  # 前缀运算符比所有二元运算符结合得紧
+
+# expression() 运算符栈上的括号和下标记号；?: 的记号另带运算符的值
+_PAREN = (0, '(', None, None)
+_INDEX = (0, '[', None, None)
+
+PREFIX = frozenset(('BITWISE_AND', 'TIMES', 'PLUS', 'MINUS', 'LOGICAL_NOT', 'INCREMENT', 'DECREMENT'))
+PRIMARY = frozenset(('IDENTIFIER', 'CONSTANT', 'STRING_CONSTANT', 'FLOAT'))
+TYPES = frozenset(('INTEGER', 'CHAR', 'FLOAT', 'DOUBLE'))
+ERROR_COUNT = 3                     # 与 ply.yacc.error_count 相同
+
+
+class _Error(Exception):
+    # 出错的 token 就是解析器当前的 tok
+    pass
+
+
+class _Symbol:
+    __slots__ = ('type', 'value')
+
+    def __init__(self, type, value=None):
+        self.type = type
+        self.value = value
+
+
+class _Production:
+    # 规则函数看到的 p：p[i] 是第 i 个符号的值，p.slice[i].type 是它的名字
+    __slots__ = ('slice',)
+
+    def __init__(self, symbols):
+        self.slice = symbols
+
+    def __getitem__(self, n):
+        return self.slice[n].value
+
+    def __setitem__(self, n, v):
+        self.slice[n].value = v
+
+    def __len__(self):
+        return len(self.slice)
+
+
+def _reduce(rule, name, *symbols):
+    # symbols 为 (符号名, 值)，返回规则函数算出的 p[0]
+    p = _Production([_Symbol(name)] + [_Symbol(t, v) for t, v in symbols])
+    rule(p)
+    return p.slice[0].value
+
+
+class PrattParser:
+    # 与 ply 的 LRParser 相同的 parse() 接口，errorfunc 可以临时替换
+    def __init__(self, module=gramma):
+        self.module = module
+        self.errorfunc = getattr(module, 'p_error', None)
+        self.tok = None
+        self.shifted = 0
+
+    def parse(self, input=None, lexer=None, debug=False, tracking=False, tokenfunc=None):
+        if not lexer:
+            lexer = define.get_lexer()
+        if input is not None:
+            lexer.input(input)
+        self.token = lexer.token if tokenfunc is None else tokenfunc
+        self.shifted = 0
+        errorcount = 0
+        mark = 0
+        self.tok = self.token()
+        while True:
+            try:
+                return self.program()
+            except _Error:
+                pass
+            tok = self.tok
+            if self.shifted - mark >= errorcount and self.errorfunc:
+                if tok is not None and not hasattr(tok, 'lexer'):
+                    tok.lexer = lexer
+                self.errorfunc(tok)
+            errorcount = ERROR_COUNT
+            mark = self.shifted
+            if tok is None:
+                return None
+            self.tok = self.token()
+
+    def advance(self):
+        tok = self.tok
+        self.tok = self.token()
+        self.shifted += 1
+        return tok
+
+    def expect(self, type):
+        tok = self.tok
+        if tok is None or tok.type != type:
+            raise _Error
+        self.advance()
+        return tok.value
+
+    def at(self, type):
+        return self.tok is not None and self.tok.type == type
+
+    # 声明和语句：按 gramma 的产生式逐个调用规则函数
+
+    def program(self):
+        m = self.module
+        program = _reduce(m.p_program, 'program')
+        while self.tok is not None:
+            program = _reduce(m.p_program, 'program', ('program', program), ('declaration', self.declaration()))
+        return program
+
+    def declaration(self):
+        m = self.module
+        tok = self.tok
+        if tok.type in TYPES:
+            self.advance()
+            ctype = _reduce(m.p_type, 'type', (tok.type, tok.value))
+            items = _reduce(m.p_declaration_list, 'declaration_list',
+                            ('declaration_item', self.item(m.p_declaration_item, 'declaration_item')))
+            while self.at('COMMA'):
+                comma = self.advance().value
+                item = self.item(m.p_declaration_item, 'declaration_item')
+                items = _reduce(m.p_declaration_list, 'declaration_list',
+                                ('declaration_list', items), ('COMMA', comma), ('declaration_item', item))
+            symbols = [('type', ctype), ('declaration_list', items)]
+        elif tok.type == 'IDENTIFIER':
+            symbols = [('declaration_without_type', self.item(m.p_declaration_without_type, 'declaration_without_type'))]
+        else:
+            raise _Error
+        symbols.append(('SEMICOLON', self.expect('SEMICOLON')))
+        return _reduce(m.p_declaration, 'declaration', *symbols)
+
+    def item(self, rule, name):
+        # IDENTIFIER [ '[' CONSTANT ']' ] [ '=' expression ]
+        symbols = [('IDENTIFIER', self.expect('IDENTIFIER'))]
+        if self.at('OPEN_BRACKET'):
+            symbols.append(('OPEN_BRACKET', self.advance().value))
+            symbols.append(('CONSTANT', self.expect('CONSTANT')))
+            symbols.append(('CLOSE_BRACKET', self.expect('CLOSE_BRACKET')))
+        if self.at('ASSIGN'):
+            symbols.append(('ASSIGN', self.advance().value))
+            symbols.append(('expression', self.expression()))
+        return _reduce(rule, name, *symbols)
+
+    # 表达式
+
+    def expression(self):
+        # 显式栈上的优先级爬升，嵌套再深也不会超出递归上限：
+        #   operands  已经建好的操作数节点
+        #   ops       等待归约的运算符 (优先级, 节点类型, 运算符节点类型, 值)；前缀运算符的节点类型为 None，
+        #             括号、下标和 ?: 的记号优先级为 0，归约到记号为止
+        # 归约顺序与 binary_expression [ '?' expression (':' | ',') expression ] 的递归写法相同，出错的 token 也相同
+        operands = []
+        ops = []
+        new_node = gramma.new_node
+        while True:
+            # 操作数：前缀运算符、初等表达式或括号
+            tok = self.tok
+            if tok is None:
+                raise _Error
+            type = tok.type
+            if type in PREFIX:
+                self.advance()
+                ops.append((UNARY, None, "Operator", tok.value))
+                continue
+            if type == 'OPEN_PAREN':
+                self.advance()
+                ops.append(_PAREN)
+                continue
+            if type not in PRIMARY:
+                raise _Error
+            self.advance()
+            operands.append(new_node("PrimaryExpression", value=tok.value))
+
+            # 操作数之后：后缀运算符、二元运算符、?，或者结束一层括号、下标和 ?:
+            while True:
+                tok = self.tok
+                type = tok.type if tok is not None else None
+                if type == 'OPEN_BRACKET':
+                    self.advance()
+                    ops.append(_INDEX)
+                    break
+                if type == 'INCREMENT' or type == 'DECREMENT':
+                    self.advance()
+                    operands[-1] = new_node("PostfixExpression", [operands[-1], new_node("Operator", value=tok.value)])
+                    continue
+                if type == 'OPEN_PAREN':
+                    self.advance()
+                    self.expect('CLOSE_PAREN')
+                    operands[-1] = new_node("FunctionCall", [operands[-1]])
+                    continue
+                if type == 'DOT' or type == 'ARROW':
+                    self.advance()
+                    member = new_node("Identifier", value=self.expect('IDENTIFIER'))
+                    operands[-1] = new_node("MemberAccess", [operands[-1], member], value=tok.value)
+                    continue
+                entry = BINARY.get(type)
+                if entry is not None:
+                    # 先归约栈顶优先级不低于它的运算符，因而左结合
+                    if ops and ops[-1][0] >= entry[0]:
+                        _reduce_ops(operands, ops, entry[0])
+                    self.advance()
+                    ops.append((*entry, tok.value))
+                    break
+                if ops and ops[-1][0]:
+                    _reduce_ops(operands, ops, LOWEST)
+                if type == 'CONDITIONAL_OPERATOR':
+                    self.advance()
+                    ops.append((0, '?', None, tok.value))
+                    break
+                # 这个 token 结束了当前的表达式，交给最近的记号
+                marker = ops.pop() if ops else None
+                if marker is None:
+                    return operands.pop()
+                kind = marker[1]
+                if kind == ':':
+                    other = operands.pop()
+                    then = operands.pop()
+                    test = operands.pop()
+                    op = new_node("ConditionalOperator", value=marker[3])
+                    operands.append(new_node("ConditionalExpression", [test, op, then, other]))
+                    continue
+                if kind == '?' and (type == 'COLON' or type == 'COMMA'):
+                    self.advance()
+                    ops.append((0, ':', None, marker[3]))
+                    break
+                if kind == '(' and type == 'CLOSE_PAREN':
+                    self.advance()
+                    continue
+                if kind == '[' and type == 'CLOSE_BRACKET':
+                    self.advance()
+                    index = operands.pop()
+                    operands[-1] = new_node("ArrayAccess", [operands[-1], index])
+                    continue
+                raise _Error
+
+
+def _reduce_ops(operands, ops, level):
+    # 归约栈顶优先级不低于 level 的运算符，停在记号上
+    new_node = gramma.new_node
+    while ops and ops[-1][0] >= level:
+        prec, kind, operator, value = ops.pop()
+        if kind is None:
+            operands[-1] = new_node("UnaryExpression", [new_node(operator, value=value), operands[-1]])
+        else:
+            right = operands.pop()
+            operands[-1] = new_node(kind, [operands[-1], new_node(operator, value=value), right])
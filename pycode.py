@@ -0,0 +1,583 @@
+import ast
+from array import array
+from collections import OrderedDict
+
+import evaluator
+import fastlex
+from evaluator import (BINARY_NODES, INTEGRAL, STORE, TYPECODES, EvalError, Variable, array_access_node, c_div,
+                       c_fdiv, c_mod, c_shl, c_shr, common_type, operator_value, parse_expression, primary_node,
+                       promote, to_float32, truncate, wrap_char, wrap_int)
+from gramma import get_parser
+
+# 编译成 Python 代码对象：把 AST 翻译成 Python 的 ast 节点，再用 compile() 得到真正的函数，
+# 执行时就是 CPython 字节码，没有闭包调用和分派的开销。语义与 evaluator 完全相同：
+# int 的 + - * 就地写成补码回绕的位运算，除法、移位等调用 evaluator 里的 c_div、c_shl，
+# && || ?: 对应 Python 的 and or 条件表达式，短路求值。
+#
+# 存储布局与 evaluator.Program 一致（一个列表，每个变量一格）。函数开头把变量读进局部变量，
+# 结束时（包括出错时）把改过的写回去。
+#
+#   program = Program(tree)
+#   results, storage = program.run()
+#   program.values(storage)
+#   print(program.source)           # 生成的 Python 代码
+#
+# 同一段源码反复执行时用 CodeCache：按规范化后的源码（词法单元序列）缓存编译结果，LRU 淘汰。
+#
+#   cache = CodeCache()
+#   cache.evaluate("int a = 2; a = a * 3;")    # {'a': 6}
+#   cache.stats()
+#
+# a+b+c+... 这样的左结合运算链沿左脊逐个节点翻译，不按层递归。链里 int 的 + - * 只在最外层回绕一次
+# （补码回绕与 + - * 可交换），每 _SEGMENT 个运算把值存进临时变量另起一段，生成的表达式深度与链长无关，
+# compile() 和 ast.unparse 都不会因为嵌套太深而失败。其它写法嵌套得太深（几百层括号）时报 EvalError。
+
+_BIAS, _MASK = 0x80000000, 0xFFFFFFFF
+# 上下文和运算符节点没有字段，整棵树共用一个实例（CPython 解析源码时也是这样）
+_LOAD, _STORE = ast.Load(), ast.Store()
+_ARITHMETIC = {'+': ast.Add(), '-': ast.Sub(), '*': ast.Mult(), '&': ast.BitAnd(), '|': ast.BitOr(), '^': ast.BitXor()}
+_SHIFT = {'<<': ast.LShift(), '>>': ast.RShift()}
+_COMPARE = {'<': ast.Lt(), '>': ast.Gt(), '<=': ast.LtE(), '>=': ast.GtE(), '==': ast.Eq(), '!=': ast.NotEq()}
+_LOGICAL = {'&&': ast.And(), '||': ast.Or()}
+_UNARY = {'-': ast.USub(), '~': ast.Invert()}
+_SEGMENT = 50
+_DEEP = "expression nested too deeply"
+
+
+def _out_of_bounds(k, name, length):
+    raise EvalError(f"index {k} out of bounds for '{name}[{length}]'")
+
+
+def _set(data, v, k, length, name):
+    if not 0 <= k < length:
+        _out_of_bounds(k, name, length)
+    data[k] = v
+    return data[k]
+
+
+def _step(data, k, delta, prefix, length, name, ctype):
+    if not 0 <= k < length:
+        _out_of_bounds(k, name, length)
+    old = data[k]
+    data[k] = STORE[ctype](old + delta)
+    return data[k] if prefix else old
+
+
+# 生成的代码能用到的全局名字
+NAMESPACE = {
+    'array': array, 'EvalError': EvalError,
+    'c_div': c_div, 'c_mod': c_mod, 'c_fdiv': c_fdiv, 'c_shl': c_shl, 'c_shr': c_shr,
+    'to_float32': to_float32, 'truncate': truncate, 'wrap_char': wrap_char,
+    '_out_of_bounds': _out_of_bounds, '_set': _set, '_step': _step,
+}
+
+
+def _name(name, store=False):
+    return ast.Name(name, _STORE if store else _LOAD)
+
+
+def _call(fn, *args):
+    return ast.Call(_name(fn), list(args), [])
+
+
+def _wrap(x):
+    # ((x + 2**31) & (2**32 - 1)) - 2**31
+    return ast.BinOp(ast.BinOp(ast.BinOp(x, _ARITHMETIC['+'], ast.Constant(_BIAS)), _ARITHMETIC['&'], ast.Constant(_MASK)),
+                     _ARITHMETIC['-'], ast.Constant(_BIAS))
+
+
+def _unwrap(x):
+    # _wrap(x) 还原成 x；接着做 int 的 + - * 时内层不必回绕，外层回绕一次结果相同
+    if isinstance(x, ast.BinOp) and x.op is _ARITHMETIC['-'] and isinstance(x.left, ast.BinOp) \
+            and x.left.op is _ARITHMETIC['&'] and isinstance(x.left.left, ast.BinOp) and x.left.left.op is _ARITHMETIC['+'] \
+            and all(isinstance(c, ast.Constant) and c.value == v
+                    for c, v in ((x.right, _BIAS), (x.left.right, _MASK), (x.left.left.right, _BIAS))):
+        return x.left.left.left
+    return x
+
+
+def _flag(test):
+    return ast.IfExp(test, ast.Constant(1), ast.Constant(0))
+
+
+def _same(src, dst):
+    return src == dst or (src == 'char' and dst == 'int') or (src == 'float' and dst == 'double')
+
+
+_CONVERSIONS = {'float': float, 'to_float32': to_float32, 'truncate': truncate, 'wrap_char': wrap_char}
+
+
+def _conversion(fn, x):
+    # 常量在翻译时就转换好；转换会出错（如 nan 转整数）的留到执行时再报
+    if isinstance(x, ast.Constant):
+        try:
+            return ast.Constant(_CONVERSIONS[fn](x.value))
+        except EvalError:
+            pass
+    return _call(fn, x)
+
+
+def cast(x, src, dst):
+    # 与 evaluator.cast 相同的转换，生成的是表达式节点
+    if _same(src, dst):
+        return x
+    if dst == 'double':
+        return _conversion('float', x)
+    if dst == 'float':
+        return _conversion('to_float32', x)
+    if dst == 'int':
+        return _conversion('truncate', x) if src in ('float', 'double') else x
+    return _conversion('wrap_char', _conversion('truncate', x) if src in ('float', 'double') else x)
+
+
+def convert(x, src, dst):
+    # 存入 dst 类型变量时的转换，等价于 evaluator.STORE[dst]；src 为 int 时值已经在范围内，不必再回绕
+    if dst == 'float':
+        return x if src == 'float' else _conversion('to_float32', x)
+    return cast(x, src, dst)
+
+
+def _local(var):
+    # 变量名可能与 Python 关键字相同（如 in），加前缀
+    return f"v_{var.name}"
+
+
+class Translator:
+    # variables: 名字 -> evaluator.Variable，与 evaluator.Compiler 分配的存储位置相同
+    def __init__(self, variables=None, implicit_int=True):
+        self.variables = dict(variables or {})
+        self.slots = max((v.slot for v in self.variables.values()), default=-1) + 1
+        self.implicit_int = implicit_int
+        self.used = {}          # 读写过的变量：名字 -> Variable
+        self.assigned = set()   # 赋值过的变量名，执行完要写回存储
+        self.constants = {}     # 字符串常量的数据：名字 -> array
+        self.temps = 0
+
+    def declare(self, name, ctype, length=None):
+        if name in self.variables:
+            raise EvalError(f"redeclaration of '{name}'")
+        var = Variable(name, ctype, self.slots, length)
+        self.slots += 1
+        self.variables[name] = var
+        return var
+
+    def lookup(self, name):
+        var = self.variables.get(name)
+        if var is None:
+            raise EvalError(f"'{name}' undeclared")
+        self.used[name] = var
+        return var
+
+    def temp(self):
+        self.temps += 1
+        return f"t{self.temps}"
+
+    def store(self, var, value):
+        self.used[var.name] = var
+        self.assigned.add(var.name)
+        return ast.NamedExpr(_name(_local(var), store=True), value)
+
+    # ---- 表达式 ----
+
+    def expression(self, node):
+        # 返回 (表达式节点, C 类型)
+        if node is None:
+            raise EvalError("missing expression")
+        kind = node.node_type
+        if kind == 'PrimaryExpression':
+            return self.primary(node)
+        if kind in BINARY_NODES:
+            return self.chain(node)
+        if kind == 'ConditionalExpression':
+            c = node.children
+            test, _ = self.expression(c[0])
+            then, tt = self.expression(c[2])
+            other, et = self.expression(c[3])
+            t = common_type(tt, et)
+            return ast.IfExp(test, cast(then, tt, t), cast(other, et, t)), t
+        if kind == 'UnaryExpression':
+            return self.unary(operator_value(node, 0), node.children[1])
+        if kind == 'PostfixExpression':
+            return self.increment(node.children[0], operator_value(node, 1), prefix=False)
+        if kind == 'ArrayAccess':
+            data, length, name, ctype = self.data(node.children[0])
+            return self.element(data, length, name, self.index(node.children[1])), ctype
+        raise EvalError(f"cannot evaluate {kind}")
+
+    def primary(self, node):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise EvalError(f"bad primary expression {value!r}")
+        if isinstance(value, int):
+            return ast.Constant(wrap_int(value)), 'int'
+        if isinstance(value, float):
+            return ast.Constant(value), 'double'
+        if value.startswith('"'):
+            raise EvalError("a string constant can only be subscripted")
+        var = self.lookup(value)
+        if var.length is not None:
+            raise EvalError(f"array '{value}' used as a value")
+        return _name(_local(var)), var.ctype
+
+    def chain(self, node):
+        # 沿左脊向下收集运算链，再从最左边的操作数开始逐个向上翻译；右操作数照常递归。
+        # 每 _SEGMENT 个运算把值存进临时变量：(t1 := 第一段, t2 := t1 ..., t2 ...)[-1]，从左到右求值
+        spine = []
+        while node is not None and node.node_type in BINARY_NODES:
+            spine.append(node)
+            node = node.children[0]
+        left = self.expression(node)
+        segments = []
+        for i, node in enumerate(reversed(spine)):
+            if i and i % _SEGMENT == 0:
+                t = self.temp()
+                segments.append(ast.NamedExpr(_name(t, store=True), left[0]))
+                left = _name(t), left[1]
+            left = self.binary(operator_value(node, 1), left, self.expression(node.children[2]))
+        if not segments:
+            return left
+        return ast.Subscript(ast.Tuple(segments + [left[0]], _LOAD), ast.Constant(-1), _LOAD), left[1]
+
+    def binary(self, op, left, right):
+        (l, lt), (r, rt) = left, right
+        if op in _LOGICAL:
+            return _flag(ast.BoolOp(_LOGICAL[op], [l, r])), 'int'
+        if op in ('<<', '>>'):
+            if lt not in INTEGRAL or rt not in INTEGRAL:
+                raise EvalError(f"invalid operands to {op}: {lt} and {rt}")
+            if isinstance(r, ast.Constant) and 0 <= r.value < 32:
+                # 移位位数是范围内的常量时不用检查
+                x = ast.BinOp(l, _SHIFT[op], r)
+                return (_wrap(x) if op == '<<' else x), 'int'
+            return _call('c_shl' if op == '<<' else 'c_shr', l, r), 'int'
+        t = common_type(lt, rt)
+        l = cast(l, lt, t)
+        r = cast(r, rt, t)
+        if op in _COMPARE:
+            return _flag(ast.Compare(l, [_COMPARE[op]], [r])), 'int'
+        if t == 'int':
+            if op in ('/', '%'):
+                return _call('c_div' if op == '/' else 'c_mod', l, r), t
+            if op in ('+', '-', '*'):
+                return _wrap(ast.BinOp(_unwrap(l), _ARITHMETIC[op], _unwrap(r))), t
+            if op in _ARITHMETIC:
+                return ast.BinOp(l, _ARITHMETIC[op], r), t
+        elif op in ('+', '-', '*', '/'):
+            x = _call('c_fdiv', l, r) if op == '/' else ast.BinOp(l, _ARITHMETIC[op], r)
+            return (_call('to_float32', x) if t == 'float' else x), t
+        raise EvalError(f"invalid operands to {op}: {lt} and {rt}")
+
+    def unary(self, op, operand):
+        if op in ('++', '--'):
+            return self.increment(operand, op, prefix=True)
+        x, t = self.expression(operand)
+        if op == '!':
+            return ast.IfExp(x, ast.Constant(0), ast.Constant(1)), 'int'
+        if op == '+':
+            return x, promote(t)
+        if op == '-':
+            if isinstance(x, ast.Constant):
+                return ast.Constant(wrap_int(-x.value) if t in INTEGRAL else -x.value), promote(t)
+            if t in INTEGRAL:
+                return _wrap(ast.UnaryOp(_UNARY['-'], x)), 'int'
+            return ast.UnaryOp(_UNARY['-'], x), t
+        if op == '~':
+            if t not in INTEGRAL:
+                raise EvalError(f"invalid operand to ~: {t}")
+            return ast.UnaryOp(_UNARY['~'], x), 'int'
+        raise EvalError(f"unsupported unary operator {op}")
+
+    # ---- 数组 ----
+
+    def data(self, base):
+        # 返回 (数据节点, 长度, 报错用的名字, 元素类型)；字符串常量的 name 为 None
+        if base is None or base.node_type != 'PrimaryExpression' or not isinstance(base.value, str):
+            raise EvalError("subscripted value is not an array")
+        if base.value.startswith('"'):
+            data = array('b', [wrap_char(b) for b in base.value[1:-1].encode('utf-8')] + [0])
+            name = f"k{len(self.constants)}"
+            self.constants[name] = data
+            return _name(name), len(data), None, 'char'
+        var = self.lookup(base.value)
+        if var.length is None:
+            raise EvalError(f"subscripted value '{var.name}' is not an array")
+        return _name(_local(var)), var.length, var.name, var.ctype
+
+    def index(self, node):
+        k, t = self.expression(node)
+        if t not in INTEGRAL:
+            raise EvalError("array subscript is not an integer")
+        return k
+
+    def element(self, data, length, name, k):
+        # 下标是范围内的常量时直接取；否则先存进临时变量再检查范围
+        if isinstance(k, ast.Constant):
+            if 0 <= k.value < length:
+                return ast.Subscript(data, k, _LOAD)
+            return _call('_out_of_bounds', k, ast.Constant(name or 'string'), ast.Constant(length))
+        t = self.temp()
+        test = ast.Compare(ast.Constant(0), [_COMPARE['<='], _COMPARE['<']],
+                           [ast.NamedExpr(_name(t, store=True), k), ast.Constant(length)])
+        return ast.IfExp(test, ast.Subscript(data, _name(t), _LOAD),
+                         _call('_out_of_bounds', _name(t), ast.Constant(name or 'string'), ast.Constant(length)))
+
+    # ---- 赋值 ----
+
+    def assign(self, target, value):
+        if target is not None and target.node_type == 'PrimaryExpression' and isinstance(target.value, str) \
+                and not target.value.startswith('"'):
+            var = self.lookup(target.value)
+            if var.length is not None:
+                raise EvalError(f"array '{var.name}' is not assignable")
+            return self.store(var, convert(*value, var.ctype)), var.ctype
+        if target is None or target.node_type != 'ArrayAccess':
+            raise EvalError("lvalue required")
+        data, length, name, ctype = self.data(target.children[0])
+        if name is None:
+            raise EvalError("assignment to a string constant")
+        k = self.index(target.children[1])
+        # 与 evaluator 相同，先求右边的值再求下标
+        v = convert(*value, ctype)
+        return _call('_set', data, v, k, ast.Constant(length), ast.Constant(name)), ctype
+
+    def increment(self, operand, op, prefix):
+        delta = 1 if op == '++' else -1
+        if operand is not None and operand.node_type == 'ArrayAccess':
+            data, length, name, ctype = self.data(operand.children[0])
+            if name is None:
+                raise EvalError("lvalue required as increment operand")
+            k = self.index(operand.children[1])
+            return _call('_step', data, k, ast.Constant(delta), ast.Constant(prefix), ast.Constant(length),
+                         ast.Constant(name), ast.Constant(ctype)), ctype
+        if operand is None or operand.node_type != 'PrimaryExpression' or not isinstance(operand.value, str) \
+                or operand.value.startswith('"'):
+            raise EvalError("lvalue required as increment operand")
+        var = self.lookup(operand.value)
+        if var.length is not None:
+            raise EvalError(f"array '{var.name}' is not assignable")
+        x = ast.BinOp(_name(_local(var)), _ARITHMETIC['+'], ast.Constant(delta))
+        if var.ctype == 'int':
+            x = _wrap(x)
+        elif var.ctype == 'char':
+            x = _call('wrap_char', x)
+        elif var.ctype == 'float':
+            x = _call('to_float32', x)
+        new = self.store(var, x)
+        if prefix:
+            return new, var.ctype
+        # (旧值, 新值)[0]
+        return ast.Subscript(ast.Tuple([_name(_local(var)), new], _LOAD), ast.Constant(0), _LOAD), var.ctype
+
+    # ---- 语句 ----
+
+    def statement(self, node):
+        # 返回表达式节点的列表，依次求值，最后一个的值是这条语句的结果
+        kind = node.node_type
+        if kind == 'Declaration':
+            ctype = node.children[0].value
+            if ctype not in TYPECODES:
+                raise EvalError(f"unknown type {ctype!r}")
+            items = node.children[1]
+            return [self.declaration(ctype, item)
+                    for item in (items.children if items.node_type == 'DeclarationList' else [items])]
+        if kind == 'Identifier':
+            return [self.primary(primary_node(node.value))[0]]
+        if kind == 'DeclarationWithoutType':
+            name, value = node.children
+            if name.value not in self.variables and self.implicit_int:
+                self.declare(name.value, 'int')
+            return [self.assign(primary_node(name.value), self.expression(value))[0]]
+        if kind == 'ArrayDeclarationWithoutType':
+            name, index = node.children
+            return [self.expression(array_access_node(name.value, index.value))[0]]
+        if kind == 'ArrayDeclarationWithoutTypeWithAssignment':
+            name, index, value = node.children
+            return [self.assign(array_access_node(name.value, index.value), self.expression(value))[0]]
+        return [self.expression(node)[0]]
+
+    def declaration(self, ctype, item):
+        kind = item.node_type
+        if kind == 'Identifier':
+            return self.store(self.declare(item.value, ctype), ast.Constant(STORE[ctype](0)))
+        if kind == 'DeclarationWithAssignment':
+            # 先翻译初值再声明：int a = a; 里右边的 a 不是正在声明的这个
+            value = self.expression(item.children[1])
+            return self.store(self.declare(item.children[0].value, ctype), convert(*value, ctype))
+        if kind in ('ArrayDeclaration', 'ArrayDeclarationWithAssignment'):
+            length = item.children[1].value
+            if not isinstance(length, int) or length <= 0:
+                raise EvalError(f"invalid array size {length!r}")
+            value = self.expression(item.children[2]) if len(item.children) > 2 else (ast.Constant(0), 'int')
+            var = self.declare(item.children[0].value, ctype, length)
+            # (v := array(code, [初值]) * length)[0]，结果与 evaluator 一样是初值
+            data = ast.BinOp(_call('array', ast.Constant(TYPECODES[ctype]), ast.List([convert(*value, ctype)], _LOAD)),
+                             _ARITHMETIC['*'], ast.Constant(length))
+            return ast.Subscript(self.store(var, data), ast.Constant(0), _LOAD)
+        raise EvalError(f"cannot declare {kind}")
+
+    # ---- 生成函数 ----
+
+    def function(self, statements, name='_program'):
+        # statements: 每条语句的表达式节点列表；生成的函数参数为存储列表 s，返回每条语句的结果。
+        # statements 为单个表达式节点时直接返回它的值
+        if isinstance(statements, ast.expr):
+            body = [ast.Return(statements)]
+        else:
+            body = []
+            results = []
+            for i, exprs in enumerate(statements):
+                for x in exprs[:-1]:
+                    body.append(ast.Expr(x))
+                results.append(f"r{i}")
+                body.append(ast.Assign([_name(results[-1], store=True)], exprs[-1]))
+            body.append(ast.Return(ast.List([_name(r) for r in results], _LOAD)))
+        load = [ast.Assign([_name(_local(var), store=True)],
+                           ast.Subscript(_name('s'), ast.Constant(var.slot), _LOAD))
+                for var in self.used.values()]
+        save = [ast.Assign([ast.Subscript(_name('s'), ast.Constant(self.variables[n].slot), _STORE)],
+                           _name(_local(self.variables[n])))
+                for n in self.assigned]
+        if save:
+            body = [ast.Try(body, [], [], save)]
+        tree = ast.parse(f"def {name}(s):\n    pass")
+        tree.body[0].body = load + body
+        _locate(tree)
+        namespace = dict(NAMESPACE, **self.constants)
+        try:
+            exec(compile(tree, '<pycode>', 'exec'), namespace)
+        except RecursionError:
+            raise EvalError(_DEEP) from None
+        return namespace[name], tree
+
+
+def _locate(tree):
+    # compile() 要求每个节点都有行号；生成的代码不需要真实位置，全部记为第 1 行。
+    # 比 ast.fix_missing_locations 快几倍（不递归，也不逐字段生成迭代器）
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node._attributes:
+            node.lineno = node.end_lineno = 1
+            node.col_offset = node.end_col_offset = 0
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                stack.extend(value)
+            elif isinstance(value, ast.AST):
+                stack.append(value)
+
+
+def compile_expression(node, variables=None):
+    # 与 evaluator.compile_expression 相同：返回 (函数, 类型)，函数的参数是存储列表
+    translator = Translator(variables, implicit_int=False)
+    try:
+        x, t = translator.expression(node)
+    except RecursionError:
+        raise EvalError(_DEEP) from None
+    return translator.function(x, '_expression')[0], t
+
+
+class Program(evaluator.Program):
+    # 接口与 evaluator.Program 相同，storage() 和 values() 直接沿用
+    def __init__(self, tree, implicit_int=True):
+        if tree is None:
+            raise EvalError("no syntax tree")
+        translator = Translator(implicit_int=implicit_int)
+        children = tree.children if tree.node_type == 'Program' else [tree]
+        try:
+            statements = [translator.statement(child) for child in children if child is not None]
+        except RecursionError:
+            # 左结合的运算链不递归；只有几百层括号、前缀运算符或 ?: 这样的嵌套才会走到这里
+            raise EvalError(_DEEP) from None
+        self.function, self.tree = translator.function(statements)
+        self.variables = translator.variables
+        self.slots = translator.slots
+
+    @property
+    def source(self):
+        return ast.unparse(self.tree)
+
+    def run(self, storage=None):
+        s = storage if storage is not None else self.storage()
+        return self.function(s), s
+
+
+def normalize(text):
+    # 规范化的源码：词法单元序列，空白、换行、数字的写法不同都算同一段源码
+    return tuple((tok.type, tok.value) for tok in fastlex.tokenize(text))
+
+
+class CodeCache:
+    def __init__(self, parser=None, maxsize=256):
+        self._parser = parser
+        self._entries = OrderedDict()
+        self._normalized = {}       # 原样的源码 -> 规范化的源码，同一种写法第二次出现时不用再做词法分析
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key, build):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        entry = build()
+        self.misses += 1
+        self._entries[key] = entry
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def normalize(self, text):
+        key = self._normalized.get(text)
+        if key is None:
+            if len(self._normalized) >= 4 * self.maxsize:
+                self._normalized.clear()
+            key = self._normalized[text] = normalize(text)
+        return key
+
+    def parser(self):
+        if self._parser is None:
+            self._parser = get_parser()
+        return self._parser
+
+    def program(self, text, implicit_int=True):
+        key = ('program', implicit_int, self.normalize(text))
+        return self._lookup(key, lambda: Program(self.parser().parse(text), implicit_int))
+
+    def expression(self, text, variables=None):
+        # 单个表达式，返回 (函数, 类型)；变量的类型和存储位置不同的算不同的项
+        signature = tuple((n, v.ctype, v.slot, v.length) for n, v in (variables or {}).items())
+        key = ('expression', signature, self.normalize(text))
+        return self._lookup(key, lambda: compile_expression(parse_expression(text, self.parser()), variables))
+
+    def evaluate(self, text):
+        program = self.program(text)
+        _, storage = program.run()
+        return program.values(storage)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._entries.clear()
+        self._normalized.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return (f"缓存命中 {self.hits} / 未命中 {self.misses}（命中率 {self.hit_rate:.1%}），"
+                f"淘汰 {self.evictions}，当前 {len(self._entries)} / {self.maxsize} 项")
+
+
+def evaluate(text, parser=None):
+    parser = parser or get_parser()
+    program = Program(parser.parse(text))
+    _, storage = program.run()
+    return program.values(storage)
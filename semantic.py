@@ -0,0 +1,370 @@
+import sys
+
+from evaluator import (BINARY_NODES, INTEGRAL, TYPECODES, EvalError, array_access_node, common_type, operator_value,
+                       primary_node, promote, wrap_int)
+from gramma import get_parser
+
+# 语义分析：一遍扫描 AST，检查未声明的变量、重复声明、类型错误和常量下标越界，
+# 同时推导每个表达式的类型（char int float double，按一般算术转换）。
+#
+# 规则与 evaluator 编译时报的错误一致：evaluator 能编译的程序这里没有错误，反之亦然；
+# 另外常量下标越界在 evaluator 里要执行到才报，这里直接报出来。
+# 与 evaluator 遇到第一个错误就停不同，这里报告全部错误；出错的子表达式类型记为 None，
+# 不再引出后续的错误，未声明的名字也只报第一次（与 gcc 相同）。
+#
+#   result = analyze(tree)
+#   for d in result.diagnostics:
+#       print(d)                   # statement 2: error: 'A' undeclared
+#   result.symbols['a'].ctype      # 'int'
+#   result.types                   # 每条语句的类型（声明语句为声明的类型）
+#
+# 符号表以驻留后的名字为键，查找是一次字典访问。文法里没有复合语句，整个程序只有一层作用域。
+# a+b+c+... 这样的左结合运算链沿左脊逐个节点分析，不按层递归；其它写法嵌套得太深（几百层括号）时，
+# 这条语句报一个错误，接着分析下一条。
+
+
+class Symbol:
+    __slots__ = ('name', 'ctype', 'length', 'statement', 'implicit')
+
+    def __init__(self, name, ctype, length=None, statement=0, implicit=False):
+        self.name = name
+        self.ctype = ctype              # None 表示未声明就使用的名字（只用来避免重复报错）
+        self.length = length            # None 表示标量
+        self.statement = statement      # 声明所在的语句序号（从 1 开始）
+        self.implicit = implicit        # a=2+5 这样按 int 隐式声明的
+
+    def __repr__(self):
+        size = '' if self.length is None else f"[{self.length}]"
+        return f"Symbol({self.ctype} {self.name}{size})"
+
+
+class SymbolTable:
+    def __init__(self):
+        self._symbols = {}      # 名字 -> 符号，按声明顺序
+
+    def declare(self, symbol):
+        # 返回已有的同名符号（重复声明），没有则返回 None
+        name = symbol.name = sys.intern(symbol.name)
+        previous = self._symbols.get(name)
+        if previous is not None:
+            return previous
+        self._symbols[name] = symbol
+        return None
+
+    def lookup(self, name):
+        return self._symbols.get(name)
+
+    def __getitem__(self, name):
+        return self._symbols[name]
+
+    def __contains__(self, name):
+        return name in self._symbols
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def __iter__(self):
+        return iter(self._symbols.values())
+
+
+class Diagnostic:
+    __slots__ = ('severity', 'kind', 'message', 'statement')
+
+    def __init__(self, severity, kind, message, statement):
+        self.severity = severity        # 'error' | 'warning'
+        self.kind = kind                # 'undeclared' 'redeclared' 'type' 'bounds' 'implicit'
+        self.message = message
+        self.statement = statement      # 语句序号（从 1 开始）；AST 里没有行号
+
+    def __str__(self):
+        return f"statement {self.statement}: {self.severity}: {self.message}"
+
+    def __repr__(self):
+        return f"Diagnostic({self.severity!r}, {self.kind!r}, {self.message!r}, {self.statement})"
+
+
+class Analysis:
+    def __init__(self, symbols, diagnostics, types):
+        self.symbols = symbols
+        self.diagnostics = diagnostics
+        self.types = types
+
+    @property
+    def errors(self):
+        return [d for d in self.diagnostics if d.severity == 'error']
+
+    @property
+    def warnings(self):
+        return [d for d in self.diagnostics if d.severity == 'warning']
+
+    def __bool__(self):
+        # 没有错误
+        return not any(d.severity == 'error' for d in self.diagnostics)
+
+
+class Analyzer:
+    def __init__(self, implicit_int=True):
+        self.symbols = SymbolTable()
+        self.diagnostics = []
+        self.types = []
+        self.statement = 0
+        self.implicit_int = implicit_int     # 给未声明的变量赋值时按 int 隐式声明（a=2+5），给出警告
+
+    def report(self, kind, message, severity='error'):
+        self.diagnostics.append(Diagnostic(severity, kind, message, self.statement))
+
+    def declare(self, name, ctype, length=None, implicit=False):
+        previous = self.symbols.declare(Symbol(name, ctype, length, self.statement, implicit))
+        if previous is not None:
+            if previous.ctype is None:
+                # 先用后声明：之前已经报过未声明，这里补上声明
+                previous.ctype, previous.length, previous.statement = ctype, length, self.statement
+            else:
+                self.report('redeclared', f"redeclaration of '{name}' (first declared in statement {previous.statement})")
+
+    def lookup(self, name):
+        symbol = self.symbols.lookup(name)
+        if symbol is None:
+            self.report('undeclared', f"'{name}' undeclared")
+            self.symbols.declare(Symbol(name, None, statement=self.statement))
+            return None
+        return symbol if symbol.ctype is not None else None
+
+    # ---- 表达式 ----
+
+    def expression(self, node):
+        # 返回表达式的类型；出错时为 None
+        if node is None:
+            self.report('type', "missing expression")
+            return None
+        kind = node.node_type
+        if kind == 'PrimaryExpression':
+            return self.primary(node)
+        if kind in BINARY_NODES:
+            return self.chain(node)
+        if kind == 'ConditionalExpression':
+            c = node.children
+            self.expression(c[0])
+            tt = self.expression(c[2])
+            et = self.expression(c[3])
+            return common_type(tt, et) if tt and et else None
+        if kind == 'UnaryExpression':
+            op = self.operator(node, 0)
+            return self.unary(op, node.children[1]) if op is not None else None
+        if kind == 'PostfixExpression':
+            return self.lvalue(node.children[0], "lvalue required as increment operand")
+        if kind == 'ArrayAccess':
+            return self.element(node.children[0], node.children[1])
+        self.report('type', f"cannot evaluate {kind}")
+        return None
+
+    def chain(self, node):
+        # 沿左脊向下收集运算链（运算符按从外到内的顺序检查），再从最左边的操作数开始逐个向上推导类型
+        spine = []
+        while node is not None and node.node_type in BINARY_NODES:
+            spine.append((self.operator(node, 1), node.children[2]))
+            node = node.children[0]
+        lt = self.expression(node)
+        for op, right in reversed(spine):
+            rt = self.expression(right)
+            lt = self.binary(op, lt, rt) if op is not None else None
+        return lt
+
+    def operator(self, node, index):
+        # 缺了运算符的树报告一次，返回 None
+        try:
+            return operator_value(node, index)
+        except EvalError as e:
+            self.report('type', str(e))
+            return None
+
+    def primary(self, node):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            self.report('type', f"bad primary expression {value!r}")
+            return None
+        if isinstance(value, int):
+            return 'int'
+        if isinstance(value, float):
+            return 'double'
+        if value.startswith('"'):
+            self.report('type', "a string constant can only be subscripted")
+            return None
+        symbol = self.lookup(value)
+        if symbol is None:
+            return None
+        if symbol.length is not None:
+            self.report('type', f"array '{value}' used as a value")
+            return None
+        return symbol.ctype
+
+    def binary(self, op, lt, rt):
+        if op in ('&&', '||'):
+            return 'int'
+        if lt is None or rt is None:
+            return None
+        if op in ('<<', '>>'):
+            if lt not in INTEGRAL or rt not in INTEGRAL:
+                self.report('type', f"invalid operands to {op}: {lt} and {rt}")
+                return None
+            return 'int'
+        if op in ('<', '>', '<=', '>=', '==', '!='):
+            return 'int'
+        t = common_type(lt, rt)
+        if op not in ('+', '-', '*', '/') and (t != 'int' or op not in ('%', '&', '|', '^')):
+            self.report('type', f"invalid operands to {op}: {lt} and {rt}")
+            return None
+        return t
+
+    def unary(self, op, operand):
+        if op in ('++', '--'):
+            return self.lvalue(operand, "lvalue required as increment operand")
+        t = self.expression(operand)
+        if op not in ('!', '+', '-', '~'):
+            self.report('type', f"unsupported unary operator {op}")
+            return None
+        if t is None:
+            return None
+        if op == '!':
+            return 'int'
+        if op == '~' and t not in INTEGRAL:
+            self.report('type', f"invalid operand to ~: {t}")
+            return None
+        return promote(t)
+
+    def lvalue(self, node, message):
+        if node is not None and node.node_type == 'PrimaryExpression' and isinstance(node.value, str) \
+                and not node.value.startswith('"'):
+            symbol = self.lookup(node.value)
+            if symbol is None:
+                return None
+            if symbol.length is not None:
+                self.report('type', f"array '{symbol.name}' is not assignable")
+                return None
+            return symbol.ctype
+        if node is not None and node.node_type == 'ArrayAccess':
+            base = node.children[0]
+            if base is not None and base.node_type == 'PrimaryExpression' and isinstance(base.value, str) \
+                    and base.value.startswith('"'):
+                self.expression(node.children[1])
+                self.report('type', "assignment to a string constant")
+                return None
+            return self.element(node.children[0], node.children[1])
+        self.report('type', message)
+        return None
+
+    def element(self, base, index):
+        if base is None or base.node_type != 'PrimaryExpression' or not isinstance(base.value, str):
+            self.expression(index)
+            self.report('type', "subscripted value is not an array")
+            return None
+        it = self.expression(index)
+        if it is not None and it not in INTEGRAL:
+            self.report('type', "array subscript is not an integer")
+        if base.value.startswith('"'):
+            name, ctype, length = 'string', 'char', len(base.value[1:-1].encode('utf-8')) + 1
+        else:
+            symbol = self.lookup(base.value)
+            if symbol is None:
+                return None
+            if symbol.length is None:
+                self.report('type', f"subscripted value '{symbol.name}' is not an array")
+                return None
+            name, ctype, length = symbol.name, symbol.ctype, symbol.length
+        k = _constant(index)
+        if k is not None and not 0 <= k < length:
+            self.report('bounds', f"index {k} out of bounds for '{name}[{length}]'")
+        return ctype
+
+    # ---- 语句 ----
+
+    def run(self, node):
+        self.statement += 1
+        try:
+            t = self.statement_type(node)
+        except RecursionError:
+            # 左结合的运算链不递归；只有几百层括号、前缀运算符或 ?: 这样的嵌套才会走到这里
+            self.report('type', "expression nested too deeply")
+            t = None
+        self.types.append(t)
+
+    def statement_type(self, node):
+        kind = node.node_type
+        if kind == 'Declaration':
+            ctype = node.children[0].value
+            if ctype not in TYPECODES:
+                self.report('type', f"unknown type {ctype!r}")
+                ctype = None
+            items = node.children[1]
+            for item in (items.children if items.node_type == 'DeclarationList' else [items]):
+                self.declaration(ctype, item)
+            return ctype
+        if kind == 'Identifier':
+            return self.primary(primary_node(node.value))
+        if kind == 'DeclarationWithoutType':
+            name, value = node.children
+            if self.symbols.lookup(name.value) is None and self.implicit_int:
+                self.report('implicit', f"implicit declaration of '{name.value}' as int", 'warning')
+                self.declare(name.value, 'int', implicit=True)
+            t = self.lvalue(primary_node(name.value), "lvalue required")
+            self.expression(value)
+            return t
+        if kind == 'ArrayDeclarationWithoutType':
+            name, index = node.children
+            return self.element(primary_node(name.value), primary_node(index.value))
+        if kind == 'ArrayDeclarationWithoutTypeWithAssignment':
+            name, index, value = node.children
+            t = self.lvalue(array_access_node(name.value, index.value), "lvalue required")
+            self.expression(value)
+            return t
+        return self.expression(node)
+
+    def declaration(self, ctype, item):
+        kind = item.node_type
+        if kind == 'Identifier':
+            name, length = item.value, None
+        elif kind == 'DeclarationWithAssignment':
+            # 先分析初值再声明：int a = a; 里右边的 a 不是正在声明的这个
+            self.expression(item.children[1])
+            name, length = item.children[0].value, None
+        elif kind in ('ArrayDeclaration', 'ArrayDeclarationWithAssignment'):
+            length = item.children[1].value
+            if len(item.children) > 2:
+                self.expression(item.children[2])
+            if not isinstance(length, int) or length <= 0:
+                self.report('type', f"invalid array size {length!r}")
+                ctype = None
+            name = item.children[0].value
+        else:
+            self.report('type', f"cannot declare {kind}")
+            return
+        # 类型或长度有错时仍然登记这个名字（类型为 None），后面用到它不再报未声明
+        self.declare(name, ctype, length)
+
+
+def _constant(node):
+    # 常量下标的值，前面可以有一元的 + -（a[-1]）；不是常量时为 None。按 int 回绕，与 evaluator 执行时的下标相同
+    sign = 1
+    while node is not None and node.node_type == 'UnaryExpression' and node.children[0] is not None \
+            and node.children[0].value in ('+', '-'):
+        if node.children[0].value == '-':
+            sign = -sign
+        node = node.children[1]
+    if node is not None and node.node_type == 'PrimaryExpression' and isinstance(node.value, int) \
+            and not isinstance(node.value, bool):
+        return wrap_int(sign * node.value)
+    return None
+
+
+def analyze(tree, implicit_int=True):
+    analyzer = Analyzer(implicit_int)
+    if tree is not None:
+        for child in tree.children if tree.node_type == 'Program' else [tree]:
+            if child is not None:
+                analyzer.run(child)
+    return Analysis(analyzer.symbols, analyzer.diagnostics, analyzer.types)
+
+
+def check(text, parser=None):
+    parser = parser or get_parser()
+    return analyze(parser.parse(text))
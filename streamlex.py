@@ -0,0 +1,305 @@
+import mmap
+import os
+
+import define
+from fastlex import _CALL, _FLOAT, _INT, _KEEP, _KEYWORD, _NEWLINE, LexError, Token, build_tables
+from gramma import get_parser
+
+# 流式词法分析：输入是文件路径、mmap 或任何支持缓冲区协议的对象（bytes 等），
+# 正则直接在 mmap 上按字节匹配，不把整个文件读成一个 str。token 由生成器逐个产出，
+# parser 边取边解析；已经扫描过的页面定期还给操作系统，内存占用与文件大小无关。
+#
+#   for tok in tokens('big.c'): ...                  # tok.lineno / tok.column 从 1 开始
+#   tree = parse_file('big.c')                       # 整个文件一棵 AST
+#   for tree in parse_statements('big.c'): ...       # 每条顶层语句一棵 AST，用完即丢
+#
+# token 流与 fastlex / define.lexer 对 UTF-8 解码后的文本一致，只是 lexpos 和 column
+# 按字节计算（纯 ASCII 时与字符位置相同）。
+
+# 每扫描这么多字节就把之前的页面从内存中释放（之后再访问会从文件重新读入）
+RELEASE_BYTES = 16 << 20
+# 遇到非 ASCII 字符时解码这么长的一段，交给 str 版本的正则匹配
+_WIDE_WINDOW = 4096
+
+
+def open_source(source):
+    # 返回 (缓冲区, 关闭函数)
+    if isinstance(source, (str, os.PathLike)):
+        f = open(source, 'rb')
+    elif hasattr(source, 'fileno') and not isinstance(source, mmap.mmap):
+        f = os.fdopen(os.dup(source.fileno()), 'rb')
+    else:
+        return source, None
+    try:
+        if os.fstat(f.fileno()).st_size == 0:
+            f.close()
+            return b'', None
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        f.close()
+        raise
+
+    def close():
+        buf.close()
+        f.close()
+    return buf, close
+
+
+class StreamLexer:
+    # 接口与 fastlex.Lexer 相同（input / token / lineno / lexpos / skip），可直接传给 parser.parse
+    def __init__(self, module=define):
+        self.module = module
+        self.reserved = dict(getattr(module, 'reserved', {}))
+        self.ignore = getattr(module, 't_ignore', '').encode('ascii')
+        self.error_rule = getattr(module, 't_error', None)
+        self.master, self.dispatch, self.single = build_tables(module, binary=True)
+        self.text_master = build_tables(module)[0]
+        self.release_bytes = RELEASE_BYTES
+        self.lexdata = b''
+        self.lexpos = 0
+        self.lineno = 1
+        self.line_start = 0         # 当前行第一个字节的位置，用来算 column
+        self._window = None         # 出错位置开始的一小段字节，skip(n) 的 n 按它的字符数换算成字节数
+        self._close = None
+        self._tokens = iter(())
+
+    def input(self, source):
+        self.close()
+        self.lexdata, self._close = open_source(source)
+        self.lexpos = 0
+        self.line_start = 0
+        self._tokens = self._scan()
+
+    def seek(self, pos, lineno, line_start=0):
+        # 不重新打开输入，从 pos 处接着扫描
+        self.lexpos = pos
+        self.lineno = lineno
+        self.line_start = line_start
+        self._tokens = self._scan()
+
+    def close(self):
+        self._tokens = iter(())
+        if self._close is not None:
+            self._close()
+            self._close = None
+        self.lexdata = b''
+
+    def skip(self, n):
+        if self._window is not None:
+            size = 0
+            for _ in range(n):
+                size += _char_size(self._window, size)
+            n = size
+        self.lexpos += n
+
+    def token(self):
+        return next(self._tokens, None)
+
+    def __iter__(self):
+        return self._tokens
+
+    def _scan(self):
+        # lexpos / lineno 在每次产出 token 前写回，恢复时再读回来
+        buf = self.lexdata
+        end = len(buf)
+        dispatch = self.dispatch
+        ignore = self.ignore
+        reserved = self.reserved
+        single = self.single
+        release = buf.madvise if isinstance(buf, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED') else None
+        released = 0
+        pos = self.lexpos
+        lineno = self.lineno
+        line_start = self.line_start
+        while pos < end:
+            if release is not None and pos - released >= self.release_bytes:
+                upto = pos - pos % mmap.PAGESIZE
+                release(mmap.MADV_DONTNEED, released, upto - released)
+                released = upto
+            c = buf[pos]
+            if c in ignore:
+                pos += 1
+                continue
+            name = single.get(c)
+            if name is not None:
+                tok = Token(name, chr(c), lineno, pos)
+                tok.column = pos - line_start + 1
+                pos += 1
+            else:
+                if c < 128:
+                    entry = dispatch[c]
+                    m = entry[0](buf, pos) if entry is not None else None
+                    if m is not None:
+                        if m.end() < end and buf[m.end()] >= 0x80:
+                            # 后面紧跟非 ASCII 字符时，str 版本的正则可能匹配得更长（\d 能匹配全角数字）
+                            m, name, action, func, value, size = self._wide(buf, pos)
+                        else:
+                            index = m.lastindex
+                            name, action, func = entry[1][index]
+                            raw = m.group(index)
+                            value = raw.decode('utf-8', 'replace')
+                            size = len(raw)
+                else:
+                    m, name, action, func, value, size = self._wide(buf, pos)
+                if m is None:
+                    self.lexpos = pos
+                    self.lineno = lineno
+                    self.line_start = line_start
+                    tok = self._error(buf, pos)
+                    pos = self.lexpos
+                    lineno = self.lineno
+                    if tok is None:
+                        continue
+                else:
+                    start = pos
+                    pos += size
+                    if action == _NEWLINE:
+                        lineno += len(value)
+                        line_start = pos
+                        continue
+                    if action == _KEEP:
+                        tok = Token(name, value, lineno, start)
+                    elif action == _KEYWORD:
+                        tok = Token(reserved.get(value, name), value, lineno, start)
+                    elif action == _INT:
+                        tok = Token(name, int(value), lineno, start)
+                    elif action == _FLOAT:
+                        tok = Token(name, float(value), lineno, start)
+                    else:
+                        self.lexpos = pos
+                        self.lineno = lineno
+                        tok = Token(name, value, lineno, start)
+                        tok.lexer = self
+                        tok = func(tok)
+                        pos = self.lexpos
+                        lineno = self.lineno
+                    if tok is not None:
+                        tok.column = start - line_start + 1
+                    # 跨行的 token（字符串常量）之后，列号从最后一个换行之后算起
+                    newline = value.rfind('\n')
+                    if newline >= 0:
+                        line_start = start + len(value[:newline + 1].encode('utf-8', 'surrogateescape'))
+                    if tok is None:
+                        continue
+            self.lexpos = pos
+            self.lineno = lineno
+            self.line_start = line_start
+            yield tok
+            # 两次 token() 之间也可能有人改了 lexpos / lineno
+            pos = self.lexpos
+            lineno = self.lineno
+        self.lexpos = pos
+        self.lineno = lineno
+        self.line_start = line_start
+
+    def _wide(self, buf, pos):
+        # 解码一小段，用 str 版本的完整正则匹配
+        window = bytes(buf[pos:pos + _WIDE_WINDOW]).decode('utf-8', 'surrogateescape')
+        match, actions = self.text_master
+        m = match(window)
+        if m is None:
+            return None, None, None, None, None, 0
+        index = m.lastindex
+        name, action, func = actions[index]
+        raw = m.group(index).encode('utf-8', 'surrogateescape')
+        return m, name, action, func, raw.decode('utf-8', 'replace'), len(raw)
+
+    def _error(self, buf, pos):
+        if self.error_rule is None:
+            raise LexError(f"Illegal byte {buf[pos]:#x} at offset {pos}")
+        # 交给 t_error 的是按 'replace' 解码的一小段文本，与先解码整个文件再分析时看到的一样
+        self._window = bytes(buf[pos:pos + 64])
+        tok = Token('error', self._window.decode('utf-8', 'replace'), self.lineno, pos)
+        tok.column = pos - self.line_start + 1
+        tok.lexer = self
+        try:
+            tok = self.error_rule(tok)
+        finally:
+            self._window = None
+        if self.lexpos == pos:
+            raise LexError(f"Scanning error. Illegal byte {buf[pos]:#x} at offset {pos}")
+        return tok
+
+
+def _char_size(raw, pos):
+    # raw[pos:] 第一个字符占几个字节；按 'replace' 解码时一段非法字节算作一个 U+FFFD
+    if pos >= len(raw) or raw[pos] < 0x80:
+        return 1
+    try:
+        ch = raw[pos:pos + 4].decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start == 0:
+            return e.end
+        ch = raw[pos:pos + e.start].decode('utf-8')
+    return len(ch[0].encode('utf-8'))
+
+
+def tokens(source, lineno=1):
+    lexer = StreamLexer()
+    lexer.lineno = lineno
+    lexer.input(source)
+    try:
+        yield from lexer
+    finally:
+        lexer.close()
+
+
+def parse_file(source, parser=None, lexer=None):
+    parser = parser or get_parser()
+    lexer = lexer or StreamLexer()
+    lexer.lineno = 1
+    lexer.input(source)
+    try:
+        return parser.parse(lexer=lexer)
+    finally:
+        lexer.close()
+
+
+def parse_statements(source, parser=None, lexer=None):
+    # 每条顶层语句单独解析，产出只含这一条语句的 Program，整个文件的 AST 不会同时留在内存里。
+    # token 流在 SEMICOLON 处切开（字符串常量里的分号已经是 STRING_CONSTANT 的一部分）
+    parser = parser or get_parser()
+    lexer = lexer or StreamLexer()
+    lexer.lineno = 1
+    lexer.input(source)
+    lookahead = lexer.token()
+    end_of_statement = False
+
+    def tokenfunc():
+        nonlocal lookahead, end_of_statement
+        if end_of_statement or lookahead is None:
+            return None
+        tok = lookahead
+        lookahead = lexer.token()
+        end_of_statement = tok.type == 'SEMICOLON'
+        return tok
+
+    try:
+        while lookahead is not None:
+            end_of_statement = False
+            yield parser.parse(lexer=lexer, tokenfunc=tokenfunc)
+    finally:
+        lexer.close()
+
+
+def check_file(source, parser=None):
+    # 只检查语法、不保留 AST：返回 (顶层声明数, 语法错误数)
+    parser = parser or get_parser()
+    errors = 0
+    errorfunc = parser.errorfunc
+
+    def on_error(tok):
+        nonlocal errors
+        errors += 1
+        if errorfunc:
+            return errorfunc(tok)
+
+    parser.errorfunc = on_error
+    statements = 0
+    try:
+        for tree in parse_statements(source, parser):
+            if tree is not None:
+                statements += len(tree.children)
+    finally:
+        parser.errorfunc = errorfunc
+    return statements, errors
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# 测试直接导入仓库根目录的模块；输入生成器和 AST 比较工具沿用 benchmarks/corpus.py。
+# benchmarks 放在最后：那里有与根目录模块同名的脚本（pratt.py、ir.py ...），不能遮住它们
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, 'benchmarks'))
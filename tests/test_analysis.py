@@ -0,0 +1,30 @@
+import gc
+
+import gramma
+from analysis import AnalysisWorker
+from parse_cache import ParseCache
+
+
+def wait(worker, generation):
+    while True:
+        status, done, kind, payload = worker.results.get(timeout=60)
+        if done == generation and status != 'progress':
+            return status, payload
+
+
+def test_long_chain_is_analyzed_and_gc_restored():
+    worker = AnalysisWorker(ParseCache(gramma.get_parser().parse))
+    text = f"int x; x = {' + '.join(['1'] * 1500)}; y = {'-(' * 2000}1{')' * 2000};"
+    status, (entry, chunks) = wait(worker, worker.submit('analyze', text))
+    assert status == 'done' and chunks
+    assert [d.kind for d in entry.semantics.diagnostics] == ['implicit', 'type']
+    assert gc.isenabled()
+
+
+def test_cancelled_job_restores_gc():
+    worker = AnalysisWorker(ParseCache(gramma.get_parser().parse))
+    worker.submit('analyze', "int a;\n" * 20000)
+    worker.cancel()
+    status, (entry, _) = wait(worker, worker.submit('analyze', "int a = 1;"))
+    assert status == 'done' and len(entry.tree.children) == 1
+    assert gc.isenabled()
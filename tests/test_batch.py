@@ -0,0 +1,43 @@
+import batch
+import gramma
+from disk_cache import DiskCache
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_exception_is_reported_for_that_file_only(tmp_path, monkeypatch):
+    good = write(tmp_path, 'good.c', "int a = 1;")
+    bad = write(tmp_path, 'bad.c', "int b = 2;")
+    parse = gramma.get_parser().parse
+
+    def flaky(text, **kwargs):
+        if 'b' in text:
+            raise RecursionError("maximum recursion depth exceeded")
+        return parse(text, **kwargs)
+
+    monkeypatch.setattr(gramma.get_parser(), 'parse', flaky)
+    records = {r['file']: r for r in batch.run([bad, good], jobs=1)}
+    assert records[bad]['ok'] is False and records[bad]['statements'] == 0
+    assert records[bad]['errors'] == ["RecursionError: maximum recursion depth exceeded"]
+    assert records[good]['ok'] is True and records[good]['statements'] == 1
+
+
+def test_missing_file(tmp_path):
+    [record] = batch.run([str(tmp_path / 'missing.c')], jobs=1)
+    assert record['ok'] is False and 'missing.c' in record['errors'][0]
+
+
+def test_cache_key_includes_tables(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    path = write(tmp_path, 'a.c', "int a = 1; a = a + ;")
+    text = "int a = 1;"
+    assert DiskCache(cache_dir, tables='parsetab').key(text) != DiskCache(cache_dir, tables='pratt').key(text)
+    # 第二个后端不读第一个后端的缓存项，各自第二次才命中
+    records = [next(batch.run([path], jobs=1, tables=tables, cache_dir=cache_dir))
+               for tables in ('parsetab', 'pratt', 'parsetab', 'pratt')]
+    assert [r['cached'] for r in records] == [False, False, True, True]
+    assert len({(r['ok'], tuple(r['errors'])) for r in records}) == 1
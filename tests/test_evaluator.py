@@ -0,0 +1,53 @@
+import pytest
+
+import evaluator
+import gramma
+from evaluator import EvalError, Program, evaluate
+from gramma import ASTNode
+
+
+def chain(op, term, n):
+    return f" {op} ".join([term] * n)
+
+
+@pytest.mark.parametrize('n', [99, 100, 101, 1500, 5000])
+def test_long_left_chains(n):
+    # 运算链跨过几个截断点，结果与逐步按 C 语义计算相同
+    assert evaluate(f"int x; x = {chain('+', '1', n)};")['x'] == n
+    assert evaluate(f"int x = 3; x = {chain('-', 'x', n)};")['x'] == 3 - 3 * (n - 1)
+    assert evaluate(f"int x = 3; x = {chain('*', 'x', n)};")['x'] == evaluator.wrap_int(3 ** n)
+
+
+def test_long_mixed_chain():
+    # 每一步的类型转换和回绕与短链一样插在原处：前半段是 int 回绕，乘上 0.5 之后是 double
+    terms = ['2147483647'] * 150 + ['0.5'] + ['1'] * 150
+    values = evaluate(f"double g; int a; g = {' + '.join(terms)}; a = {chain('&&', '1', 300)} || 0;")
+    assert values['g'] == evaluator.wrap_int(2147483647 * 150) + 0.5 + 150
+    assert values['a'] == 1
+
+
+def test_long_chain_keeps_short_circuit_and_errors():
+    values = evaluate(f"int a = 0, b = 0; a = 0 && b++ {'+ 1 ' * 300}; b = b;")
+    assert values == {'a': 0, 'b': 0}
+    with pytest.raises(EvalError, match="division by zero"):
+        evaluate(f"int x = 0; x = {chain('+', '1', 300)} + 1 / x;")
+
+
+def test_compile_expression_long_chain():
+    node = evaluator.parse_expression(chain('+', 'a', 2000))
+    fn, ctype = evaluator.compile_expression(node, {'a': evaluator.Variable('a', 'int', 0)})
+    assert ctype == 'int' and fn([7]) == 14000
+
+
+def test_deep_nesting_raises_eval_error():
+    text = f"int x; x = {'-(' * 2000}1{')' * 2000};"
+    tree = gramma.get_parser().parse(text)
+    with pytest.raises(EvalError, match="nested too deeply"):
+        Program(tree)
+
+
+@pytest.mark.parametrize('kind', ['Constant', 'IntegerConstant', 'NegativeIntegerConstant', 'AssignmentExpression'])
+def test_node_types_outside_the_grammar_are_rejected(kind):
+    node = ASTNode(kind, [ASTNode("PrimaryExpression", value=1)], value=1)
+    with pytest.raises(EvalError, match="cannot evaluate"):
+        evaluator.compile_expression(node)
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import random
+
+import pytest
+from corpus import shape, source
+
+import define
+import fastlex
+import gramma
+
+# 专门覆盖边界情况的片段：运算符前缀重叠、关键字、浮点数、非法字符、CRLF、字符串内换行
+EDGE_CASES = [
+    "", "\n\n\n", "a<<=b <<c < d<=e >>= f>>g>h>=i",
+    "a--b ++c -> d - -1 -2.5 3.25 .5 7.",
+    "int char float double doublex int_ _x9 X",
+    "a == b != c = !d && e || f & g | h ^ ~i",
+    "s = \"line1\nline2;\" ; t = \"\";",
+    "int a = 1;\r\nint b = 2;\r\n",
+    "x = $ @ ` #; y = 1;\n\t z",
+    "a[1] = b ? c : d, (e) {f} g.h * i / j % k;",
+    "\"unterminated",
+]
+
+
+def ply_tokens(text):
+    lexer = define.get_lexer().clone()
+    lexer.lineno = 1
+    lexer.input(text)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        tokens = [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lexer.token, None)]
+    return tokens, lexer.lineno, out.getvalue()
+
+
+def fast_tokens(text):
+    lexer = fastlex.get_lexer().clone()
+    lexer.lineno = 1
+    lexer.input(text)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        tokens = [(t.type, t.value, t.lineno, t.lexpos) for t in lexer]
+    return tokens, lexer.lineno, out.getvalue()
+
+
+def fuzz(rng, length):
+    alphabet = "ab_ 19.\t\n\r\"-+<>=!&|^~*/%?:;,()[]{}$é٣"
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_cases(text):
+    assert fast_tokens(text) == ply_tokens(text)
+
+
+def test_corpus():
+    for seed in range(20):
+        text = source(50, seed=seed)
+        assert fast_tokens(text) == ply_tokens(text)
+
+
+def test_fuzz():
+    rng = random.Random(3)
+    for _ in range(2000):
+        text = fuzz(rng, rng.randint(1, 80))
+        assert fast_tokens(text) == ply_tokens(text), text
+
+
+def test_parser_with_fastlex():
+    # 作为 parser 的 lexer 使用时 AST 也必须一致
+    parser = gramma.get_parser()
+    text = source(500, seed=11)
+    ply_lexer = define.get_lexer().clone()
+    ply_lexer.lineno = 1
+    lexer = fastlex.get_lexer().clone()
+    lexer.lineno = 1
+    assert shape(parser.parse(text, lexer=lexer)) == shape(parser.parse(text, lexer=ply_lexer))
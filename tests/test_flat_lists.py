@@ -0,0 +1,51 @@
+import io
+
+import define
+import gramma
+
+
+def parse(text):
+    lexer = define.get_lexer()
+    lexer.lineno = 1
+    return gramma.get_parser().parse(text, lexer=lexer)
+
+
+def depth(tree):
+    best = 0
+    stack = [(tree, 1)]
+    while stack:
+        node, d = stack.pop()
+        if node is not None:
+            best = max(best, d)
+            stack.extend((c, d + 1) for c in node.children)
+    return best
+
+
+def test_statements_are_children_of_one_program():
+    tree = parse("int a; b = 1; char c[2]; a;")
+    assert tree.node_type == 'Program'
+    assert [c.node_type for c in tree.children] == ['Declaration', 'DeclarationWithoutType', 'Declaration', 'Identifier']
+
+
+def test_declarators_are_one_flat_list():
+    names = [f"v{i}" for i in range(2000)]
+    tree = parse(f"int {', '.join(names)}, w[3] = 1;")
+    items = tree.children[0].children[1]
+    assert items.node_type == 'DeclarationList'
+    assert [c.node_type for c in items.children[:-1]] == ['Identifier'] * len(names)
+    assert [c.value for c in items.children[:-1]] == names
+    assert items.children[-1].node_type == 'ArrayDeclarationWithAssignment'
+    assert depth(tree) < 10
+
+
+def test_100k_declarations_parse_and_print():
+    n = 100_000
+    tree = parse(''.join(f"int v{i};\n" for i in range(n)))
+    assert len(tree.children) == n
+    assert depth(tree) == 3
+
+    out = io.StringIO()
+    gramma.write_ast(tree, out.write)
+    text = out.getvalue()
+    assert str(tree) + '\n' == text
+    assert text.count('  Declaration\n') == n
@@ -0,0 +1,52 @@
+import random
+
+from corpus import edit, shape, source
+
+import define
+import gramma
+from incremental import IncrementalParser, split_statements
+
+
+def full_parse(text):
+    lexer = define.get_lexer().clone()
+    lexer.lineno = 1
+    return gramma.get_parser().parse(text, lexer=lexer)
+
+
+def test_random_edits_match_full_parse():
+    rng = random.Random(42)
+    text = source(300, seed=5)
+    inc = IncrementalParser(gramma.get_parser(), define.get_lexer().clone())
+    inc.parse(text)
+    for _ in range(40):
+        text = edit(rng, text)
+        assert shape(inc.parse(text)) == shape(full_parse(text))
+    assert inc.reused > inc.reparsed > 0
+
+
+def test_unchanged_statements_are_reused():
+    text = "int a = 1;\nb = a + 2;\nchar c[4];\n"
+    inc = IncrementalParser(gramma.get_parser(), define.get_lexer().clone())
+    before = inc.parse(text)
+    after = inc.parse(text.replace("a + 2", "a * 3"))
+    assert after.children[0] is before.children[0]
+    assert after.children[2] is before.children[2]
+    assert after.children[1] is not before.children[1]
+    assert shape(after) == shape(full_parse(text.replace("a + 2", "a * 3")))
+
+
+def test_syntax_error_falls_back_to_full_parse(capsys):
+    text = "int a = 1;\nb = a + 2;\n"
+    inc = IncrementalParser(gramma.get_parser(), define.get_lexer().clone())
+    inc.parse(text)
+    broken = text.replace("a + 2", "a + ")
+    inc.parse(broken)
+    assert inc.full_parses == 2
+    assert capsys.readouterr().out.count("Syntax error") == 1
+    fixed = broken.replace("a + ", "a - 2")
+    assert shape(inc.parse(fixed)) == shape(full_parse(fixed))
+
+
+def test_split_ignores_semicolons_in_strings():
+    text = 'x = "a;b";\ny = 1;'
+    assert [text[s:e] for s, e, _ in split_statements(text)] == ['x = "a;b";', '\ny = 1;']
@@ -0,0 +1,40 @@
+import pytest
+
+import gramma
+import ir
+from evaluator import EvalError, evaluate
+
+
+def chain(op, term, n):
+    return f" {op} ".join([term] * n)
+
+
+def run(text, optimized=True):
+    code = ir.compile_source(text, optimized=optimized)
+    return ir.run(code)[0]
+
+
+@pytest.mark.parametrize('n', [600, 5000])
+@pytest.mark.parametrize('optimized', [False, True])
+def test_long_left_chains(n, optimized):
+    text = (f"int x = 3; int y; double g; y = {chain('+', 'x', n)}; x = {chain('-', 'x', n)};"
+            f" g = {chain('*', '1.5', 20)} + {chain('+', 'x', n)};")
+    assert run(text, optimized) == evaluate(text)
+
+
+def test_long_logical_chains():
+    # optimize 每轮只消掉一层跳转，&& 链很长时要迭代很多轮，这里只检查不优化的翻译
+    text = f"int x = 3; int a, b; a = {chain('&&', 'x', 2000)} || {chain('||', '0', 2000)}; b = {chain('||', '0', 2000)};"
+    assert run(text, optimized=False) == evaluate(text) == {'x': 3, 'a': 1, 'b': 0}
+
+
+def test_long_chain_keeps_evaluation_order():
+    # 右操作数的副作用按从左到右的顺序发生
+    text = f"int i = 0, s; s = {chain('+', 'i++ * 2', 700)};"
+    assert run(text, optimized=False) == evaluate(text) == {'i': 700, 's': 699 * 700}
+
+
+def test_deep_nesting_raises_eval_error():
+    tree = gramma.get_parser().parse(f"int x; x = {'-(' * 2000}1{')' * 2000};")
+    with pytest.raises(EvalError, match="nested too deeply"):
+        ir.lower(tree)
@@ -0,0 +1,87 @@
+import contextlib
+import io
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from corpus import source
+
+import parlex
+from tokbuf import TokenBuffer
+
+
+def snapshot(buffer):
+    return ([buffer.type(i) for i in range(len(buffer))], buffer.start.tobytes(),
+            buffer.length.tobytes(), buffer.line.tobytes(), buffer.lineno)
+
+
+def lexed(run):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        buffer = run()
+    return snapshot(buffer), out.getvalue()
+
+
+def tricky(rng, statements):
+    # 字符串里带分号和换行、落单的引号、非法字符，专门考验切分点
+    parts = []
+    for i in range(statements):
+        r = rng.random()
+        if r < 0.2:
+            parts.append(f'x = "a;{i}\n;b";')
+        elif r < 0.25:
+            parts.append('"')
+        elif r < 0.3:
+            parts.append('$;\r\n')
+        else:
+            parts.append(source(1, seed=i).strip())
+        parts.append(rng.choice(['\n', ' ', '\n\n', '']))
+    return ''.join(parts).encode()
+
+
+def fuzz(rng, length):
+    pieces = [b"ab", b"_", b" ", b"19", b".", b"\t", b"\n", b"\r\n", b'"', b"-", b"<<", b">=",
+              b"=", b";", b",", b"(", b")", b"$", "é".encode(), "٣".encode(), b"\xff", b"\xe4\xb8"]
+    return b''.join(rng.choice(pieces) for _ in range(length))
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def test_stitched_stream_is_identical(pool):
+    # 切分后并行分析再拼接的结果与整段 TokenBuffer 逐字节相同（四个数组、种类表、t_error 输出）
+    rng = random.Random(21)
+    cases = [tricky(rng, rng.randint(1, 400)) for _ in range(60)]
+    cases += [fuzz(rng, rng.randint(1, 400)) for _ in range(60)]
+    for data in cases:
+        expected = lexed(lambda: TokenBuffer(data))
+        for parts in (2, 3, 7):
+            got = lexed(lambda: parlex.lex_parallel(data, parts, pool, chunks_per_worker=1, min_chunk=1))
+            assert got == expected, (parts, data)
+
+
+def test_file_is_identical(pool, tmp_path):
+    data = source(3000, seed=6).encode()
+    path = tmp_path / 'big.c'
+    path.write_bytes(data)
+    expected = snapshot(TokenBuffer(data))
+    for workers in (1, 2, 4, 8):
+        assert snapshot(parlex.lex_parallel(data, workers, pool, min_chunk=1)) == expected
+        buffer = parlex.lex_file_parallel(str(path), workers, pool, min_chunk=1)
+        try:
+            assert snapshot(buffer) == expected
+        finally:
+            buffer.close()
+
+
+def test_split_points_are_outside_strings():
+    data = b'x = "a;b";\ny = 1;\nz = "c;\n;d";\nw = 2;\n'
+    for parts in range(2, 8):
+        points = parlex.split_points(data, parts)
+        assert points[0] == 0 and points[-1] == len(data)
+        for point in points[1:-1]:
+            assert data[point - 1:point] == b';'
+            assert data[:point].count(b'"') % 2 == 0
@@ -0,0 +1,106 @@
+import contextlib
+import io
+import random
+
+import pytest
+from corpus import BINARY, NAMES, PREFIX, SyntaxGenerator, shape, source
+
+import binast
+import define
+import gramma
+import streamlex
+
+DEEP = 3000                         # 远超 Python 的默认递归上限
+PUNCTUATION = BINARY + PREFIX + ['?', ':', ',', ';', '(', ')', '[', ']', '=', '.', '->', '~', '{']
+
+
+def mutate(rng, text):
+    # 随机删除、插入或替换一个 token，得到大多有语法错误的输入
+    toks = text.split(' ')
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(toks))
+        r = rng.random()
+        if r < 0.4 and len(toks) > 1:
+            del toks[i]
+        elif r < 0.7:
+            toks.insert(i, rng.choice(PUNCTUATION + NAMES))
+        else:
+            toks[i] = rng.choice(PUNCTUATION + NAMES)
+    return ' '.join(toks)
+
+
+def outcome(parser, text):
+    lexer = define.get_lexer()
+    lexer.lineno = 1
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        tree = parser.parse(text, lexer=lexer)
+    # 比较 binast 编码：与 shape() 一样逐节点区分类型和值，深树上也不会递归
+    return (binast.encode(tree) if tree is not None else None), out.getvalue()
+
+
+@pytest.fixture(scope='module')
+def parsers():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return gramma.get_parser(), gramma.get_parser('pratt')
+
+
+HANDWRITTEN = [
+    "int a=10, b=20, c; c=a<40? A+b,a-b;", "", "x = a < b ? c : d < e ? f : g || h;",
+    "int x = a ? b , c , y;", "x = a ? b : c ? d : e = f;", "x = *&a;", "x = (a;", "x = a",
+    "x = 1 + 2 * 3 - 4 / 5 % 6 << 7 < 8 == 9 & 10 ^ 11 | 12 && 13 || 14;",
+    "x = -a++ + !b[1]-- * ++c.m - d->n();",
+]
+
+# 嵌套几千层的括号、下标、前缀运算符和 ?:，Pratt 用显式栈，不受递归上限限制
+DEEP_CASES = [
+    f"x = {'(' * DEEP}a{')' * DEEP};", f"x = {'- ' * DEEP}a;", f"x = {'!(' * DEEP}a{')' * DEEP}++;",
+    f"x = a{'[b' * DEEP}{']' * DEEP};", f"x = {'a ? ' * DEEP}b{' : c' * DEEP};", f"x = {'a ? b : ' * DEEP}c;",
+    f"x = {' + '.join(['a'] * DEEP)};", f"x = {'(' * DEEP}a;", f"x = {'(' * DEEP}a{')' * (DEEP + 1)};",
+]
+
+
+@pytest.mark.parametrize('text', HANDWRITTEN + [source(500, seed=1)])
+def test_handwritten(parsers, text):
+    lalr, pratt = parsers
+    assert outcome(pratt, text) == outcome(lalr, text)
+
+
+@pytest.mark.parametrize('index', range(len(DEEP_CASES)))
+def test_deep_nesting(parsers, index):
+    lalr, pratt = parsers
+    text = DEEP_CASES[index]
+    assert outcome(pratt, text) == outcome(lalr, text)
+
+
+def test_generated_programs(parsers):
+    lalr, pratt = parsers
+    rng = random.Random(20)
+    gen = SyntaxGenerator(rng)
+    for _ in range(1000):
+        text = gen.program(rng.randint(1, 6))
+        assert outcome(pratt, text) == outcome(lalr, text), text
+
+
+def test_mutated_programs(parsers):
+    # 树的形状和 p_error 的输出（包括出错后重新开始、不再重复报告的行为）都一致
+    lalr, pratt = parsers
+    rng = random.Random(21)
+    gen = SyntaxGenerator(rng)
+    errors = 0
+    for _ in range(1000):
+        text = mutate(rng, gen.program(rng.randint(1, 4)))
+        expected = outcome(lalr, text)
+        assert outcome(pratt, text) == expected, text
+        errors += bool(expected[1])
+    assert errors > 500
+
+
+def test_statements_through_tokenfunc(parsers):
+    lalr, pratt = parsers
+    rng = random.Random(22)
+    gen = SyntaxGenerator(rng)
+    data = "\n".join(HANDWRITTEN[2:] + [gen.program(3) for _ in range(200)]).encode()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [shape(t) for t in streamlex.parse_statements(data, lalr)]
+        assert [shape(t) for t in streamlex.parse_statements(data, pratt)] == expected
@@ -0,0 +1,50 @@
+import ast
+
+import pytest
+
+import gramma
+import pycode
+from evaluator import EvalError, evaluate
+
+
+def chain(op, term, n):
+    return f" {op} ".join([term] * n)
+
+
+@pytest.mark.parametrize('n', [49, 50, 51, 300, 5000])
+@pytest.mark.parametrize('op', ['+', '-', '*', '&&', '||', '<', '|', '/'])
+def test_long_left_chains(n, op):
+    # 链长跨过截断点；g 的链在 double 上做，每段的值都要先转换
+    text = f"int a[1] = 3; int x = a[0], y; double g; y = {chain(op, 'x', n)}; g = 0.5 - {chain('-', 'x', n)};"
+    program = pycode.Program(gramma.get_parser().parse(text))
+    assert program.values(program.run()[1]) == evaluate(text)
+    ast.parse(program.source)
+
+
+def test_int_chain_wraps_once():
+    # 链里的 + - * 只在最外层回绕，中间结果超出 int 范围时结果仍与逐步回绕相同
+    text = f"int x = 2147483647, y; y = {chain('*', 'x', 20)} + {chain('-', 'x', 20)} * x;"
+    program = pycode.Program(gramma.get_parser().parse(text))
+    assert program.values(program.run()[1]) == evaluate(text)
+    assert program.source.count('2147483648') == 2
+
+
+def test_long_chain_keeps_evaluation_order_and_errors():
+    text = f"int i = 0, s; s = {chain('+', 'i++ * 2', 700)};"
+    assert pycode.evaluate(text) == evaluate(text) == {'i': 700, 's': 699 * 700}
+    with pytest.raises(EvalError, match="division by zero"):
+        pycode.evaluate(f"int x = 0; x = {chain('+', '1', 300)} + 1 / x;")
+
+
+def test_compile_expression_long_chain():
+    node = pycode.parse_expression(chain('+', 'a', 2000))
+    fn, ctype = pycode.compile_expression(node, {'a': pycode.Variable('a', 'int', 0)})
+    assert ctype == 'int' and fn([7]) == 14000
+
+
+def test_deep_nesting_raises_eval_error():
+    tree = gramma.get_parser().parse(f"int x; x = {'-(' * 2000}1{')' * 2000};")
+    with pytest.raises(EvalError, match="nested too deeply"):
+        pycode.Program(tree)
+    with pytest.raises(EvalError, match="nested too deeply"):
+        pycode.compile_expression(pycode.parse_expression(f"{'-(' * 2000}1{')' * 2000}"))
@@ -0,0 +1,45 @@
+import pytest
+
+import semantic
+from evaluator import EvalError, Program, evaluate
+from gramma import get_parser
+
+
+def messages(text):
+    return [str(d) for d in semantic.check(text).diagnostics]
+
+
+@pytest.mark.parametrize('index, k', [('-1', -1), ('+3', 3), ('- -3', 3), ('-(+5)', -5), ('4294967296', 0)])
+def test_signed_constant_subscripts(index, k):
+    # 常量下标按 evaluator 执行时的值检查
+    text = f"int a[3]; int b = a[{index}];"
+    expected = [] if 0 <= k < 3 else [f"statement 2: error: index {k} out of bounds for 'a[3]'"]
+    assert messages(text) == expected
+    if expected:
+        with pytest.raises(EvalError, match=f"index {k} out of bounds"):
+            evaluate(text)
+    else:
+        evaluate(text)
+
+
+@pytest.mark.parametrize('op', ['+', '-', '*', '&&', '<', '|'])
+def test_long_left_chains(op):
+    assert messages(f"int x; x = {f' {op} '.join(['1'] * 5000)};") == []
+    result = semantic.check(f"double g; g = {f' {op} '.join(['1'] * 1500)} + 0.5 + y;")
+    assert result.types == ['double', 'double']
+    assert [str(d) for d in result.diagnostics] == ["statement 2: error: 'y' undeclared"]
+
+
+def test_deep_nesting_is_a_diagnostic():
+    # 太深的嵌套只让这一条语句出错，后面的语句照常分析
+    text = f"int x; x = {'-(' * 2000}1{')' * 2000}; x = A;"
+    assert messages(text) == ["statement 2: error: expression nested too deeply", "statement 3: error: 'A' undeclared"]
+    with pytest.raises(EvalError, match="nested too deeply"):
+        Program(get_parser().parse(text))
+
+
+def test_symbols_in_declaration_order():
+    result = semantic.check("int b; char a[2]; c = 1; int b;")
+    assert [repr(s) for s in result.symbols] == ['Symbol(int b)', 'Symbol(char a[2])', 'Symbol(int c)']
+    assert len(result.symbols) == 3 and 'c' in result.symbols and result.symbols['c'].implicit
+    assert [d.kind for d in result.diagnostics] == ['implicit', 'redeclared']
@@ -0,0 +1,21 @@
+import pytest
+
+import gramma
+import vm
+from evaluator import EvalError, evaluate
+
+
+@pytest.mark.parametrize('optimized', [False, True])
+@pytest.mark.parametrize('superinstructions', [False, True])
+def test_long_left_chains(optimized, superinstructions):
+    terms = 3000
+    text = (f"int a[1] = 3; int x = a[0], y, z, b; y = {' + '.join(['x'] * terms)};"
+            f" z = {' - '.join(['y * x'] * terms)}; b = {' && '.join(['x'] * 50)} || 0;")
+    bytecode = vm.compile_source(text, optimized=optimized, superinstructions=superinstructions)
+    assert bytecode.values(bytecode.run()) == evaluate(text)
+
+
+def test_deep_nesting_raises_eval_error():
+    tree = gramma.get_parser().parse(f"int x; x = {'-(' * 2000}1{')' * 2000};")
+    with pytest.raises(EvalError, match="nested too deeply"):
+        vm.compile_tree(tree)
@@ -0,0 +1,217 @@
+from array import array
+
+import define
+from fastlex import _CALL, _FLOAT, _INT, _KEYWORD, _NEWLINE, build_tables
+from streamlex import StreamLexer, open_source
+
+# 数组化的 token 缓冲区：每个 token 只占四个平行数组中的一行
+#
+#   kind    array('B')  token 种类编号，查 kinds 表得到 (类型名, 数值转换函数)
+#   start   array('I')  在源码中的字节偏移
+#   length  array('I')  字节长度
+#   line    array('I')  行号
+#
+# 不为每个 token 建对象，也不切出 value 字符串；raw(i) 是源码的 memoryview 切片，
+# value(i) 在真正用到时才解码或转换成 int / float。词法规则与 streamlex 完全相同，
+# lexpos 同样按字节计算。
+
+
+class TokenBuffer:
+    def __init__(self, data, module=define, _close=None, lineno=1, offset=0):
+        # data 是 str（按 UTF-8 编码一次）、bytes 或 mmap；文件用 TokenBuffer.from_file(path)。
+        # data 也可以是大源码中的一段：offset 是它在整个源码中的起始字节，lineno 是起始行号，
+        # 记录下来的 start / line 都是相对整个源码的
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._setup(data, module, _close, offset)
+        self._scan(lineno)
+
+    def _setup(self, data, module, close, offset):
+        self.module = module
+        self.data = data
+        self.offset = offset
+        self._close = close
+        self.view = memoryview(data)
+        self.kinds = []             # 编号 -> (类型名, 转换函数；None 表示按 UTF-8 解码成 str)
+        self._kind_ids = {}
+        self.kind = array('B')
+        self.start = array('I')
+        self.length = array('I')
+        self.line = array('I')
+        self.lineno = 1
+
+    def _kind(self, type, convert):
+        key = (type, convert)
+        if key not in self._kind_ids:
+            self._kind_ids[key] = len(self.kinds)
+            self.kinds.append(key)
+        return self._kind_ids[key]
+
+    def _scan(self, lineno):
+        module = self.module
+        master, dispatch, single = build_tables(module, binary=True)
+        ignore = getattr(module, 't_ignore', '').encode('ascii')
+        reserved = {word.encode('ascii'): self._kind(type, None)
+                    for word, type in getattr(module, 'reserved', {}).items()}
+        converters = {_INT: int, _FLOAT: float}
+        # 规则名 -> 种类编号；关键字另查 reserved
+        rule_kinds = {}
+        for entry in dispatch.values():
+            if entry is not None:
+                for action in entry[1]:
+                    if action is not None and action[1] != _NEWLINE:
+                        name, kind, _ = action
+                        rule_kinds[name] = self._kind(name, converters.get(kind))
+        single = {c: rule_kinds[name] for c, name in single.items()}
+
+        buf = self.data
+        end = len(buf)
+        kind_append = self.kind.append
+        start_append = self.start.append
+        length_append = self.length.append
+        line_append = self.line.append
+        slow = None
+        offset = self.offset
+        pos = 0
+        while pos < end:
+            c = buf[pos]
+            if c in ignore:
+                pos += 1
+                continue
+            kind = single.get(c)
+            if kind is not None:
+                kind_append(kind)
+                start_append(pos + offset)
+                length_append(1)
+                line_append(lineno)
+                pos += 1
+                continue
+            entry = dispatch.get(c)
+            m = entry[0](buf, pos) if entry is not None else None
+            if m is not None:
+                index = m.lastindex
+                name, action, _ = entry[1][index]
+                stop = m.end()
+                # 非 ASCII 字符、需要调用规则函数、以及出错的情况交给 StreamLexer 处理
+                if action != _CALL and not (stop < end and buf[stop] >= 0x80):
+                    if action == _NEWLINE:
+                        lineno += stop - pos
+                        pos = stop
+                        continue
+                    kind = rule_kinds[name]
+                    if action == _KEYWORD:
+                        kind = reserved.get(m.group(index), kind)
+                    kind_append(kind)
+                    start_append(pos + offset)
+                    length_append(stop - pos)
+                    line_append(lineno)
+                    pos = stop
+                    continue
+            if slow is None:
+                slow = StreamLexer(module)
+                slow.input(buf)
+            slow.seek(pos, lineno)
+            tok = slow.token()
+            if tok is None:
+                break
+            value = tok.value
+            kind_append(self._kind(tok.type, type(value) if isinstance(value, (int, float)) else None))
+            start_append(tok.lexpos + offset)
+            length_append(slow.lexpos - tok.lexpos)
+            line_append(tok.lineno)
+            pos = slow.lexpos
+            lineno = slow.lineno
+        self.lineno = lineno
+
+    @classmethod
+    def from_file(cls, path, module=define):
+        data, close = open_source(path)
+        return cls(data, module, close)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def type(self, i):
+        return self.kinds[self.kind[i]][0]
+
+    def raw(self, i):
+        start = self.start[i] - self.offset
+        return self.view[start:start + self.length[i]]
+
+    def value(self, i):
+        convert = self.kinds[self.kind[i]][1]
+        raw = self.raw(i).tobytes().decode('utf-8', 'replace')
+        return raw if convert is None else convert(raw)
+
+    def token(self, i):
+        return BufferToken(self, i)
+
+    def __iter__(self):
+        return map(self.token, range(len(self)))
+
+    def dump(self):
+        # 紧凑的可 pickle 表示（不含源码），供 join 拼接
+        return (self.kinds, self.kind.tobytes(), self.start.tobytes(),
+                self.length.tobytes(), self.line.tobytes(), self.lineno)
+
+    @classmethod
+    def join(cls, data, dumps, module=define, _close=None):
+        # 把按顺序排列的若干段 dump() 拼成整个 data 的缓冲区，种类编号重新映射
+        self = cls.__new__(cls)
+        self._setup(data, module, _close, 0)
+        for kinds, kind, start, length, line, lineno in dumps:
+            table = bytes(self._kind(*k) for k in kinds)
+            self.kind.frombytes(kind.translate(table + bytes(256 - len(table))))
+            self.start.frombytes(start)
+            self.length.frombytes(length)
+            self.line.frombytes(line)
+            self.lineno = lineno
+        return self
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.kind, self.start, self.length, self.line))
+
+    def lexer(self):
+        return BufferLexer(self)
+
+    def close(self):
+        # 外面还拿着 raw() 切片时 mmap 关不掉，需要先释放那些切片
+        self.view.release()
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+
+class BufferToken:
+    # 交给 parser 的 token；value 在语法动作读取时才转换
+    __slots__ = ('buffer', 'index', 'type', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+        self.type = buffer.kinds[buffer.kind[index]][0]
+        self.lineno = buffer.line[index]
+        self.lexpos = buffer.start[index]
+
+    @property
+    def value(self):
+        return self.buffer.value(self.index)
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class BufferLexer:
+    # 让 parser.parse(lexer=buffer.lexer()) 从缓冲区按顺序取 token
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.index = 0
+        self.lineno = buffer.lineno
+
+    def token(self):
+        i = self.index
+        if i >= len(self.buffer):
+            return None
+        self.index = i + 1
+        return BufferToken(self.buffer, i)
+
@@ -1,21 +1,17 @@
+import queue
+import time
 import tkinter as tk
+from collections import deque
 from tkinter import scrolledtext, filedialog
-from graphviz import Digraph
-from gramma import parser
-
-class ASTNode:
-    def __init__(self, node_type, children=None, value=None):
-        self.node_type = node_type
-        self.children = children if children is not None else []
-        self.value = value
-
-    def __str__(self, indent=0):
-        result = "  " * indent + f"{self.node_type}"
-        if self.value is not None:
-            result += f"\n{'  ' * (indent + 1)}Value: {self.value}"
-        for child in self.children:
-            result += "\n" + child.__str__(indent + 1)
-        return result
+import graphviz
+import astgraph
+from analysis import AnalysisWorker
+from gramma import parser, iter_ast_chunks
+from parse_cache import ParseCache
+
+DEBOUNCE_MS = 300   # 停止输入多久后自动重新分析
+POLL_MS = 20        # 轮询后台结果的间隔
+HEARTBEAT_MS = 10   # 卡顿监测的心跳间隔
 
 class GUIApp:
     def __init__(self, root):
@@ -56,70 +52,145 @@ class GUIApp:
         self.save_ast_button = tk.Button(root, text="保存AST图", command=self.save_ast)
         self.save_ast_button.pack(pady=5)
 
-        # 初始化AST图
-        self.ast_graph = Digraph('AST')
+        # AST 图按 AST 的哈希缓存：只改了空白的代码不用重新调用 dot
+        self.render_cache = astgraph.RenderCache()
+
+        # 解析结果缓存：编辑器内容不变时，三个按钮共用同一次解析和渲染
+        self.parse_cache = ParseCache(parser.parse)
+
+        # 解析、AST 文本和渲染都在后台线程完成，主线程只轮询结果
+        self.worker = AnalysisWorker(self.parse_cache, render=self.render_ast)
+        self.pending_chunks = deque()
+        self.pending_message = None
+        self.debounce_id = None
+        self.max_stall = 0.0
+        self.busy = False
+        self.code_entry.bind("<<Modified>>", self.on_modified)
+        self.root.after(POLL_MS, self.poll)
+        self.heartbeat(time.perf_counter())
+
+    def render_ast(self, entry):
+        # 在工作线程上调用
+        image = entry.images.get('png')
+        if image is None:
+            image = astgraph.render(entry.tree, 'png', cache=self.render_cache)
+            entry.images['png'] = image
+        return image
+
+    def report(self, message):
+        self.status_bar.config(text=f"{message}（{self.parse_cache.stats()}，最长卡顿 {self.max_stall * 1000:.0f} ms）")
+
+    def heartbeat(self, expected):
+        # 记录事件循环实际比预期晚了多久，用来检验“主线程卡顿不超过 50 ms”
+        now = time.perf_counter()
+        if self.busy:
+            self.max_stall = max(self.max_stall, now - expected)
+        self.root.after(HEARTBEAT_MS, self.heartbeat, now + HEARTBEAT_MS / 1000)
+
+    def start(self, kind, **options):
+        self.pending_chunks.clear()
+        self.pending_message = None
+        self.max_stall = 0.0
+        self.busy = True
+        self.worker.submit(kind, self.code_entry.get("1.0", tk.END), **options)
+        self.status_bar.config(text="正在分析…")
+
+    def on_modified(self, event=None):
+        # edit_modified(False) 本身也会触发 <<Modified>>，此时标志为假，直接忽略
+        if not self.code_entry.edit_modified():
+            return
+        self.code_entry.edit_modified(False)
+        # 作废的分析还没插完的 AST 文本不再插入；防抖结束、新的分析开始之前不算忙，这段时间不计卡顿
+        self.worker.cancel()
+        self.pending_chunks.clear()
+        self.pending_message = None
+        self.busy = False
+        if self.debounce_id is not None:
+            self.root.after_cancel(self.debounce_id)
+        self.debounce_id = self.root.after(DEBOUNCE_MS, self.run_syntax_analysis)
 
     def run_syntax_analysis(self):
-        input_code = self.code_entry.get("1.0", tk.END)
-
-        result = parser.parse(input_code)
-
-        self.result_text.config(state=tk.NORMAL)
-        self.result_text.delete("1.0", tk.END)
-
-        if result:
-            self.result_text.insert(tk.END, "语法分析成功！\n")
-            self.result_text.insert(tk.END, print_ast(result))
-        else:
-            self.result_text.insert(tk.END, "语法分析失败！\n")
-
-        self.result_text.config(state=tk.DISABLED)
-        self.status_bar.config(text="分析完成")
+        self.debounce_id = None
+        self.start('analyze')
 
     def show_ast(self):
-        input_code = self.code_entry.get("1.0", tk.END)
-        result = parser.parse(input_code)
-
-        if result:
-            self.ast_graph.clear()
-            self.build_ast_graph(result)
-            self.ast_graph.view()
-            self.status_bar.config(text="AST图已生成")
+        self.start('show')
 
     def save_ast(self):
-        input_code = self.code_entry.get("1.0", tk.END)
-        result = parser.parse(input_code)
-
-        if result:
-            self.ast_graph.clear()
-            self.build_ast_graph(result)
-            file_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG files", "*.png")])
-
-            if file_path:
-                self.ast_graph.format = 'png'
-                self.ast_graph.render(filename=file_path, cleanup=True, format='png', engine='dot')
-                self.status_bar.config(text=f"AST图已保存至 {file_path}")
-
-    def build_ast_graph(self, node, parent=None):
-        if node:
-            current_node_label = f"{node.node_type}\n{str(node.value)}" if node.value is not None else f"{node.node_type}"
-
-            if parent:
-                self.ast_graph.edge(parent, current_node_label)
-
-            for child in node.children:
-                self.build_ast_graph(child, current_node_label)
+        file_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG files", "*.png")])
+
+        if file_path:
+            self.start('save', path=file_path)
+
+    def poll(self):
+        while True:
+            try:
+                status, generation, kind, payload = self.worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if self.worker.stale(generation):
+                continue
+            if status == 'progress':
+                self.status_bar.config(text=payload)
+            elif status == 'error':
+                self.busy = False
+                self.status_bar.config(text=f"分析出错：{payload}")
+            else:
+                self.finish(kind, payload)
+
+        # AST 文本每轮只插入一块，避免一次性插入大段文本卡住界面
+        if self.pending_chunks:
+            self.result_text.config(state=tk.NORMAL)
+            self.result_text.insert(tk.END, self.pending_chunks.popleft())
+            self.result_text.config(state=tk.DISABLED)
+            if not self.pending_chunks:
+                self.busy = False
+                self.report(self.pending_message)
+        self.root.after(POLL_MS, self.poll)
+
+    def finish(self, kind, payload):
+        if kind == 'analyze':
+            entry, chunks = payload
+            self.result_text.config(state=tk.NORMAL)
+            self.result_text.delete("1.0", tk.END)
+            if entry.tree:
+                self.result_text.insert(tk.END, "语法分析成功！\n")
+                self.result_text.insert(tk.END, semantic_report(entry.semantics))
+            else:
+                self.result_text.insert(tk.END, "语法分析失败！\n")
+            self.result_text.config(state=tk.DISABLED)
+            self.pending_message = "分析完成"
+            self.pending_chunks.extend(chunks)
+            if chunks:
+                return
+        elif kind == 'show':
+            if payload:
+                graphviz.view(payload)
+                self.busy = False
+                self.report("AST图已生成")
+                return
+        elif kind == 'save':
+            if payload:
+                self.busy = False
+                self.report(f"AST图已保存至 {payload}")
+                return
+        self.busy = False
+        self.report(self.pending_message or "语法分析失败")
+
+def semantic_report(result, limit=50):
+    errors, warnings = len(result.errors), len(result.warnings)
+    if not result.diagnostics:
+        return "语义分析通过。\n"
+    lines = [f"语义分析：{errors} 个错误，{warnings} 个警告"]
+    lines += [str(d) for d in result.diagnostics[:limit]]
+    if len(result.diagnostics) > limit:
+        lines.append(f"……另有 {len(result.diagnostics) - limit} 条未列出")
+    return "\n".join(lines) + "\n"
 
 def print_ast(node, indent=0):
-    result = ""
-    if node:
-        result += "  " * indent + f"{node.node_type}"
-        if node.value is not None:
-            result += f"\n{'  ' * (indent + 1)}Value: {node.value}"
-        for child in node.children:
-            result += "\n" + print_ast(child, indent + 1)
-    return result
-
-root = tk.Tk()
-app = GUIApp(root)
-root.mainloop()
\ No newline at end of file
+    return "".join(iter_ast_chunks(node, indent=indent))[:-1]
+
+if __name__ == '__main__':
+    root = tk.Tk()
+    app = GUIApp(root)
+    root.mainloop()
@@ -0,0 +1,397 @@
+import numpy as np
+
+from evaluator import BINARY_NODES, INTEGRAL, EvalError, common_type, parse_expression, promote, wrap_char, wrap_int
+
+# 批量求值：同一个表达式对很多组变量取值求值。
+#
+# 表达式编译成 NumPy 数组运算，每个运算符对整列数据只调用一次，而不是每行遍历一次 AST。
+# 语义与 evaluator 相同：int 用 int32、char 用 int8 存储，溢出按补码回绕，float 运算保持单精度。
+# ?: && || 变成按掩码选择：两边都按整列计算，但只有掩码选中的行才算“执行”了——
+# 除以零、移位越界、下标越界只在这些行上报 EvalError，赋值和 ++ 也只改这些行。
+#
+#   expr = compile_batch(parse_expression("a * 2 + (b > 0 ? c : -c)"))
+#   result = expr({'a': a_column, 'b': b_column, 'c': c_column})
+#
+# 列的类型决定变量的 C 类型：int8 为 char，float32 为 float，其它浮点为 double，其它整数为 int。
+# 二维的列是数组变量，每行一个数组。
+
+DTYPES = {'char': np.int8, 'int': np.int32, 'float': np.float32, 'double': np.float64}
+
+
+def column_type(column):
+    dtype = np.asarray(column).dtype
+    if dtype == np.int8:
+        return 'char'
+    if dtype == np.float32:
+        return 'float'
+    if dtype.kind == 'f':
+        return 'double'
+    if dtype.kind in 'biu':
+        return 'int'
+    raise EvalError(f"unsupported column type {dtype}")
+
+
+def _active(mask, condition):
+    return condition if mask is None else mask & condition
+
+
+def _check(bad, mask, message):
+    if mask is not None:
+        bad = bad & mask
+    if bad.any():
+        raise EvalError(message(np.flatnonzero(bad)[0]))
+
+
+def to_int(values, mask):
+    # 浮点转 int：向零取整后按 2**32 取模回绕，与 evaluator.truncate 一致
+    _check(~np.isfinite(values), mask, lambda row: f"cannot convert {values[row]} to an integer (row {row})")
+    values = np.fmod(np.trunc(np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)), 2.0 ** 32)
+    return values.astype(np.int64).astype(np.int32)
+
+
+def cast(fn, src, dst):
+    # 整数值在表达式里一律是 int32（char 读出来时已经提升），只有存回 char 变量时才截成 int8
+    if src == dst or (src in INTEGRAL and dst in INTEGRAL):
+        return fn
+    if dst in INTEGRAL:
+        return lambda env, mask: to_int(fn(env, mask), mask)
+    dtype = DTYPES[dst]
+    return lambda env, mask: fn(env, mask).astype(dtype)
+
+
+def store_value(values, ctype, mask):
+    if ctype == 'char':
+        return (to_int(values, mask) if values.dtype.kind == 'f' else values).astype(np.int8)
+    if ctype == 'int':
+        return to_int(values, mask) if values.dtype.kind == 'f' else values.astype(np.int32)
+    return values.astype(DTYPES[ctype])
+
+
+def c_div(a, b, mask):
+    _check(b == 0, mask, lambda row: f"integer division by zero (row {row})")
+    a = a.astype(np.int64)
+    b = np.where(b == 0, 1, b).astype(np.int64)
+    q = np.abs(a) // np.abs(b)
+    return np.where((a < 0) != (b < 0), -q, q).astype(np.int32)
+
+
+def c_mod(a, b, mask):
+    _check(b == 0, mask, lambda row: f"integer division by zero (row {row})")
+    a = a.astype(np.int64)
+    r = np.abs(a) % np.abs(np.where(b == 0, 1, b).astype(np.int64))
+    return np.where(a < 0, -r, r).astype(np.int32)
+
+
+def c_shift(op, a, b, mask):
+    bad = (b < 0) | (b > 31)
+    _check(bad, mask, lambda row: f"shift count {b[row]} out of range (row {row})")
+    b = np.where(bad, 0, b).astype(np.int64)
+    a = a.astype(np.int64)
+    return (a << b if op == '<<' else a >> b).astype(np.int32)
+
+
+_ARITHMETIC = {
+    '+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide,
+    '&': np.bitwise_and, '|': np.bitwise_or, '^': np.bitwise_xor,
+}
+_COMPARE = {
+    '<': np.less, '>': np.greater, '<=': np.less_equal, '>=': np.greater_equal,
+    '==': np.equal, '!=': np.not_equal,
+}
+
+
+def compile_binary(op, left, right):
+    (lf, lt), (rf, rt) = left, right
+    if op == '&&':
+        def both(env, mask):
+            lv = lf(env, mask) != 0
+            return (lv & (rf(env, _active(mask, lv)) != 0)).astype(np.int32)
+        return both, 'int'
+    if op == '||':
+        def either(env, mask):
+            lv = lf(env, mask) != 0
+            return (lv | (rf(env, _active(mask, ~lv)) != 0)).astype(np.int32)
+        return either, 'int'
+    if op == ',':
+        def comma(env, mask):
+            lf(env, mask)
+            return rf(env, mask)
+        return comma, rt
+    if op in ('<<', '>>'):
+        if lt not in INTEGRAL or rt not in INTEGRAL:
+            raise EvalError(f"invalid operands to {op}: {lt} and {rt}")
+        return (lambda env, mask: c_shift(op, lf(env, mask), rf(env, mask), mask)), 'int'
+    t = common_type(lt, rt)
+    lf = cast(lf, lt, t)
+    rf = cast(rf, rt, t)
+    if op in _COMPARE:
+        ufunc = _COMPARE[op]
+        return (lambda env, mask: ufunc(lf(env, mask), rf(env, mask)).astype(np.int32)), 'int'
+    if t == 'int' and op in ('/', '%'):
+        divide = c_div if op == '/' else c_mod
+        return (lambda env, mask: divide(lf(env, mask), rf(env, mask), mask)), t
+    if op not in _ARITHMETIC or (t not in INTEGRAL and op in '&|^'):
+        raise EvalError(f"invalid operands to {op}: {lt} and {rt}")
+    # int32 的加减乘本身就按补码回绕；float32 之间的运算结果仍是 float32
+    ufunc = _ARITHMETIC[op]
+    return (lambda env, mask: ufunc(lf(env, mask), rf(env, mask))), t
+
+
+class _Env:
+    __slots__ = ('columns', 'rows', 'arange')
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.arange = None
+
+
+class Compiler:
+    # types: 变量名 -> (C 类型, 数组长度或 None)
+    def __init__(self, types):
+        self.types = types
+
+    def lookup(self, name):
+        if name not in self.types:
+            raise EvalError(f"'{name}' undeclared")
+        return self.types[name]
+
+    def expression(self, node):
+        # 返回 (闭包 (env, mask) -> 整列结果, C 类型)
+        if node is None:
+            raise EvalError("missing expression")
+        kind = node.node_type
+        if kind in ('PrimaryExpression', 'Constant', 'IntegerConstant', 'FloatConstant'):
+            return self.primary(node)
+        if kind in ('NegativeIntegerConstant', 'NegativeFloatConstant'):
+            return self.unary('-', node.children[0])
+        if kind in BINARY_NODES:
+            c = node.children
+            return compile_binary(c[1].value, self.expression(c[0]), self.expression(c[2]))
+        if kind == 'ConditionalExpression':
+            return self.conditional(node)
+        if kind == 'UnaryExpression':
+            return self.unary(node.children[0].value, node.children[1])
+        if kind == 'PostfixExpression':
+            return self.increment(node.children[0], node.children[1].value, prefix=False)
+        if kind == 'AssignmentExpression':
+            return self.assign(node.children[0], self.expression(node.children[2]), node.children[1].value)
+        if kind == 'ArrayAccess':
+            get, _, t = self.element(node.children[0], node.children[1])
+            return get, t
+        raise EvalError(f"cannot evaluate {kind}")
+
+    def primary(self, node):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise EvalError(f"bad primary expression {value!r}")
+        if isinstance(value, (int, float)):
+            t = 'int' if isinstance(value, int) else 'double'
+            v = wrap_int(value) if t == 'int' else value
+            dtype = DTYPES[t]
+            return (lambda env, mask: np.full(env.rows, v, dtype)), t
+        if value.startswith('"'):
+            raise EvalError("a string constant can only be subscripted")
+        ctype, length = self.lookup(value)
+        if length is not None:
+            raise EvalError(f"array '{value}' used as a value")
+        if ctype == 'char':
+            return (lambda env, mask: env.columns[value].astype(np.int32)), ctype
+        return (lambda env, mask: env.columns[value]), ctype
+
+    def conditional(self, node):
+        c = node.children
+        test, _ = self.expression(c[0])
+        then, tt = self.expression(c[2])
+        other, et = self.expression(c[3])
+        t = common_type(tt, et)
+        then = cast(then, tt, t)
+        other = cast(other, et, t)
+
+        def select(env, mask):
+            chosen = test(env, mask) != 0
+            return np.where(chosen, then(env, _active(mask, chosen)), other(env, _active(mask, ~chosen)))
+        return select, t
+
+    def unary(self, op, operand):
+        if op in ('++', '--'):
+            return self.increment(operand, op, prefix=True)
+        f, t = self.expression(operand)
+        if op == '!':
+            return (lambda env, mask: (f(env, mask) == 0).astype(np.int32)), 'int'
+        if op == '+':
+            return f, promote(t)
+        if op == '-':
+            return (lambda env, mask: np.negative(f(env, mask))), promote(t)
+        if op == '~':
+            if t not in INTEGRAL:
+                raise EvalError(f"invalid operand to ~: {t}")
+            return (lambda env, mask: np.invert(f(env, mask))), 'int'
+        raise EvalError(f"unsupported unary operator {op}")
+
+    def lvalue(self, node):
+        # 返回 (取值闭包, 存值闭包 (env, mask, 新值) -> 存入后的值, 类型)
+        # 存值时换成新数组而不是原地修改，之前读出的列不受影响
+        if node is not None and node.node_type == 'PrimaryExpression' and isinstance(node.value, str) \
+                and not node.value.startswith('"'):
+            name = node.value
+            get, t = self.primary(node)
+
+            def store(env, mask, values):
+                values = store_value(values, t, mask)
+                old = env.columns[name]
+                env.columns[name] = values if mask is None else np.where(mask, values, old)
+                return values.astype(np.int32) if t == 'char' else values
+            return get, store, t
+        if node is not None and node.node_type == 'ArrayAccess':
+            return self.element(node.children[0], node.children[1])
+        raise EvalError("lvalue required")
+
+    def element(self, base, index):
+        if base is None or base.node_type != 'PrimaryExpression' or not isinstance(base.value, str):
+            raise EvalError("subscripted value is not an array")
+        at, it = self.expression(index)
+        if it not in INTEGRAL:
+            raise EvalError("array subscript is not an integer")
+        if base.value.startswith('"'):
+            data = np.array([wrap_char(b) for b in base.value[1:-1].encode('utf-8')] + [0], np.int32)
+            length, name = len(data), 'string'
+
+            def get(env, mask):
+                return data[self._index(at(env, mask), length, name, mask)]
+            return get, None, 'char'
+        name = base.value
+        ctype, length = self.lookup(name)
+        if length is None:
+            raise EvalError(f"subscripted value '{name}' is not an array")
+        index_of = self._index
+
+        def rows(env):
+            if env.arange is None:
+                env.arange = np.arange(env.rows)
+            return env.arange
+
+        def get(env, mask, k=None):
+            k = index_of(at(env, mask), length, name, mask) if k is None else k
+            values = env.columns[name][rows(env), k]
+            return values.astype(np.int32) if ctype == 'char' else values
+
+        def store(env, mask, values, k=None):
+            k = index_of(at(env, mask), length, name, mask) if k is None else k
+            values = store_value(values, ctype, mask)
+            column = env.columns[name].copy()
+            selected = rows(env) if mask is None else np.flatnonzero(mask)
+            column[selected, k[selected]] = values[selected]
+            env.columns[name] = column
+            return values.astype(np.int32) if ctype == 'char' else values
+        get.index = store.index = lambda env, mask: index_of(at(env, mask), length, name, mask)
+        return get, store, ctype
+
+    @staticmethod
+    def _index(k, length, name, mask):
+        bad = (k < 0) | (k >= length)
+        _check(bad, mask, lambda row: f"index {k[row]} out of bounds for '{name}[{length}]' (row {row})")
+        return np.where(bad, 0, k)
+
+    def increment(self, operand, op, prefix):
+        get, store, t = self.lvalue(operand)
+        if store is None:
+            raise EvalError("lvalue required as increment operand")
+        one = 1 if op == '++' else -1
+        if operand.node_type == 'ArrayAccess':
+            # 下标只求值一次
+            def step(env, mask):
+                k = get.index(env, mask)
+                old = get(env, mask, k)
+                new = store(env, mask, old + np.asarray(one, old.dtype), k)
+                return new if prefix else old
+            return step, t
+
+        def step(env, mask):
+            old = get(env, mask)
+            new = store(env, mask, old + np.asarray(one, old.dtype))
+            return new if prefix else old
+        return step, t
+
+    def assign(self, target, value, op='='):
+        get, store, t = self.lvalue(target)
+        if store is None:
+            raise EvalError("assignment to a string constant")
+        f, vt = value
+        if op != '=':
+            f, vt = compile_binary(op[:-1], (get, t), (f, vt))
+        return (lambda env, mask: store(env, mask, f(env, mask))), t
+
+
+def variable_names(node):
+    # 表达式中出现的变量名，按第一次出现的顺序
+    names = {}
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if n is None:
+            continue
+        if n.node_type == 'PrimaryExpression' and isinstance(n.value, str) and not n.value.startswith('"'):
+            names.setdefault(n.value)
+        stack.extend(reversed(n.children))
+    return list(names)
+
+
+class BatchExpression:
+    # types 可以给出变量的 C 类型（名字 -> 'int' 等），不给时按第一次传入的列推断
+    def __init__(self, node, types=None):
+        self.node = node
+        self.names = variable_names(node)
+        self.types = dict(types or {})
+        self._compiled = {}      # 各变量的 (类型, 数组长度) -> (闭包, 结果类型)
+
+    def _columns(self, columns):
+        prepared = {}
+        signature = []
+        rows = None
+        for name in self.names:
+            if name not in columns:
+                raise EvalError(f"'{name}' undeclared")
+            column = np.asarray(columns[name])
+            ctype = self.types.get(name) or column_type(column)
+            if column.ndim not in (1, 2):
+                raise EvalError(f"column '{name}' must be one or two dimensional")
+            if rows is not None and len(column) != rows:
+                raise EvalError(f"column '{name}' has {len(column)} rows, expected {rows}")
+            rows = len(column)
+            if column.dtype != DTYPES[ctype]:
+                column = store_value(column, ctype, None)
+            prepared[name] = column
+            signature.append((name, ctype, column.shape[1] if column.ndim == 2 else None))
+        return prepared, tuple(signature), rows
+
+    def compile(self, signature):
+        if signature not in self._compiled:
+            types = {name: (ctype, length) for name, ctype, length in signature}
+            self._compiled[signature] = Compiler(types).expression(self.node)
+        return self._compiled[signature]
+
+    def run(self, columns, rows=None):
+        # 返回 (结果列, 求值后的各列)；表达式里的赋值和 ++ 会体现在返回的列中，传入的列不变
+        prepared, signature, n = self._columns(columns)
+        if n is None:
+            n = 1 if rows is None else rows
+        fn, ctype = self.compile(signature)
+        env = _Env(prepared, n)
+        with np.errstate(all='ignore'):
+            result = fn(env, None)
+        result = np.asarray(result)
+        if ctype == 'char':
+            result = result.astype(np.int8)
+        return result, env.columns
+
+    def __call__(self, columns, rows=None):
+        return self.run(columns, rows)[0]
+
+
+def compile_batch(node, types=None):
+    return BatchExpression(node, types)
+
+
+def evaluate_batch(text, columns, parser=None):
+    return compile_batch(parse_expression(text, parser))(columns)
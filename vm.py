@@ -0,0 +1,358 @@
+from array import array
+
+import evaluator
+import ir
+from evaluator import EvalError, c_div, c_fdiv, c_mod, c_shl, c_shr, to_float32
+from gramma import get_parser
+
+# 寄存器字节码虚拟机：三地址码的每个变量、临时变量和常量各占一个寄存器，
+# 指令定长 4 个 int（操作码, a, b, c），整段代码存在一个 array('i') 里，由一个循环逐条分派执行。
+#
+# 指令按类型特化（ADD_I 按 int 回绕、ADD_F 舍入到单精度、ADD_D 直接相加），执行时不再查类型。
+# 超级指令把常见的指令组合合成一条：
+#   ADDK_I / MULK_I   加、乘一个 int 常量，常量直接写在指令里，省一次寄存器读取
+#   JN<比较>          比较后立即 iffalse（?: && || 的条件），不再写出 0/1 的中间结果
+#
+#   bytecode = compile_source("int a = 2, b = a * 3 + 1;")
+#   registers = bytecode.run()
+#   bytecode.values(registers)    # {'a': 2, 'b': 7}
+
+OPNAMES = (
+    'MOVE', 'ADD_I', 'ADDK_I', 'SUB_I', 'MUL_I', 'MULK_I', 'DIV_I', 'MOD_I', 'SHL', 'SHR', 'AND', 'OR', 'XOR',
+    'ADD_F', 'SUB_F', 'MUL_F', 'DIV_F', 'ADD_D', 'SUB_D', 'MUL_D', 'DIV_D',
+    'LT', 'GT', 'LE', 'GE', 'EQ', 'NE', 'NEG_I', 'NEG', 'NOT', 'INV',
+    'CAST_C', 'CAST_I', 'CAST_F', 'CAST_D', 'LOAD', 'STORE', 'ARRAY',
+    'JUMP', 'JUMPF', 'JNLT', 'JNGT', 'JNLE', 'JNGE', 'JNEQ', 'JNNE',
+)
+(MOVE, ADD_I, ADDK_I, SUB_I, MUL_I, MULK_I, DIV_I, MOD_I, SHL, SHR, AND, OR, XOR,
+ ADD_F, SUB_F, MUL_F, DIV_F, ADD_D, SUB_D, MUL_D, DIV_D,
+ LT, GT, LE, GE, EQ, NE, NEG_I, NEG, NOT, INV,
+ CAST_C, CAST_I, CAST_F, CAST_D, LOAD, STORE, ARRAY,
+ JUMP, JUMPF, JNLT, JNGT, JNLE, JNGE, JNEQ, JNNE) = range(len(OPNAMES))
+
+_INT_OPS = {'+': ADD_I, '-': SUB_I, '*': MUL_I, '/': DIV_I, '%': MOD_I,
+            '<<': SHL, '>>': SHR, '&': AND, '|': OR, '^': XOR}
+_FLOAT_OPS = {'+': ADD_F, '-': SUB_F, '*': MUL_F, '/': DIV_F}
+_DOUBLE_OPS = {'+': ADD_D, '-': SUB_D, '*': MUL_D, '/': DIV_D}
+_COMPARE_OPS = {'<': LT, '>': GT, '<=': LE, '>=': GE, '==': EQ, '!=': NE}
+_BRANCH_OPS = {'<': JNLT, '>': JNGT, '<=': JNLE, '>=': JNGE, '==': JNEQ, '!=': JNNE}
+_CASTS = {'char': CAST_C, 'int': CAST_I, 'float': CAST_F, 'double': CAST_D}
+_JUMPS = frozenset((JUMP, JUMPF, JNLT, JNGT, JNLE, JNGE, JNEQ, JNNE))
+_INT_MIN, _INT_MAX = -0x80000000, 0x7FFFFFFF
+_TO_CHAR, _TO_INT, _TO_FLOAT = evaluator.STORE['char'], evaluator.STORE['int'], evaluator.STORE['float']
+
+
+class Bytecode:
+    def __init__(self, code, registers, variables, names, fused=0):
+        self.code = code                # array('i')，每条指令 4 个 int
+        self.registers = registers      # 寄存器初值：常量、变量置零，临时变量为 None
+        self.variables = variables      # 变量名 -> 寄存器号
+        self.names = names              # 寄存器号 -> 名字或常量，用于反汇编
+        self.fused = fused              # 生成的超级指令条数
+
+    def __len__(self):
+        return len(self.code) // 4
+
+    def values(self, registers):
+        return {name: list(registers[reg]) if isinstance(registers[reg], list) else registers[reg]
+                for name, reg in self.variables.items()}
+
+    def disassemble(self):
+        lines = []
+        code = self.code
+        for pc in range(0, len(code), 4):
+            op, a, b, c = code[pc:pc + 4]
+            if op in _JUMPS:
+                args = ([] if op == JUMP else [self.names[a]] + ([] if op == JUMPF else [self.names[b]])) + [f"@{c // 4}"]
+            elif op in (ADDK_I, MULK_I):
+                args = [self.names[a], str(b), self.names[c]]
+            elif op == ARRAY:
+                args = [str(a), self.names[b], self.names[c]]
+            elif op in (MOVE, NEG_I, NEG, NOT, INV, CAST_C, CAST_I, CAST_F, CAST_D):
+                args = [self.names[a], self.names[c]]
+            else:
+                args = [self.names[a], self.names[b], self.names[c]]
+            lines.append(f"{pc // 4:5d}  {OPNAMES[op]:<8}{', '.join(map(str, args))}")
+        return '\n'.join(lines)
+
+    def run(self, registers=None):
+        # 返回执行后的寄存器；分支按出现频率排列，代码先转成 list（下标访问比 array 快）
+        r = list(self.registers) if registers is None else registers
+        code = self.code.tolist()
+        pc = 0
+        end = len(code)
+        while pc < end:
+            op = code[pc]
+            if op == MOVE:
+                r[code[pc + 3]] = r[code[pc + 1]]
+            elif op == ADDK_I:
+                x = r[code[pc + 1]] + code[pc + 2]
+                r[code[pc + 3]] = x if _INT_MIN <= x <= _INT_MAX else ((x + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == ADD_I:
+                x = r[code[pc + 1]] + r[code[pc + 2]]
+                r[code[pc + 3]] = x if _INT_MIN <= x <= _INT_MAX else ((x + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == SUB_I:
+                x = r[code[pc + 1]] - r[code[pc + 2]]
+                r[code[pc + 3]] = x if _INT_MIN <= x <= _INT_MAX else ((x + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == MUL_I:
+                x = r[code[pc + 1]] * r[code[pc + 2]]
+                r[code[pc + 3]] = x if _INT_MIN <= x <= _INT_MAX else ((x + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == MULK_I:
+                x = r[code[pc + 1]] * code[pc + 2]
+                r[code[pc + 3]] = x if _INT_MIN <= x <= _INT_MAX else ((x + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op >= JUMP:
+                if op == JUMP:
+                    pc = code[pc + 3]
+                    continue
+                a = r[code[pc + 1]]
+                if op == JUMPF:
+                    taken = not a
+                else:
+                    b = r[code[pc + 2]]
+                    if op == JNLT:
+                        taken = not a < b
+                    elif op == JNGT:
+                        taken = not a > b
+                    elif op == JNLE:
+                        taken = not a <= b
+                    elif op == JNGE:
+                        taken = not a >= b
+                    elif op == JNEQ:
+                        taken = a != b
+                    else:
+                        taken = a == b
+                if taken:
+                    pc = code[pc + 3]
+                    continue
+            elif op <= NE and op >= LT:
+                a = r[code[pc + 1]]
+                b = r[code[pc + 2]]
+                if op == LT:
+                    x = a < b
+                elif op == GT:
+                    x = a > b
+                elif op == LE:
+                    x = a <= b
+                elif op == GE:
+                    x = a >= b
+                elif op == EQ:
+                    x = a == b
+                else:
+                    x = a != b
+                r[code[pc + 3]] = 1 if x else 0
+            elif op <= XOR:
+                a = r[code[pc + 1]]
+                b = r[code[pc + 2]]
+                if op == AND:
+                    x = a & b
+                elif op == OR:
+                    x = a | b
+                elif op == XOR:
+                    x = a ^ b
+                elif op == DIV_I:
+                    x = c_div(a, b)
+                elif op == MOD_I:
+                    x = c_mod(a, b)
+                elif op == SHL:
+                    x = c_shl(a, b)
+                else:
+                    x = c_shr(a, b)
+                r[code[pc + 3]] = x
+            elif op <= DIV_D:
+                a = r[code[pc + 1]]
+                b = r[code[pc + 2]]
+                if op == ADD_F:
+                    x = to_float32(a + b)
+                elif op == SUB_F:
+                    x = to_float32(a - b)
+                elif op == MUL_F:
+                    x = to_float32(a * b)
+                elif op == DIV_F:
+                    x = to_float32(c_fdiv(a, b))
+                elif op == ADD_D:
+                    x = a + b
+                elif op == SUB_D:
+                    x = a - b
+                elif op == MUL_D:
+                    x = a * b
+                else:
+                    x = c_fdiv(a, b)
+                r[code[pc + 3]] = x
+            elif op <= CAST_D:
+                a = r[code[pc + 1]]
+                if op == NEG_I:
+                    x = -a if a != _INT_MIN else a
+                elif op == NEG:
+                    x = -a
+                elif op == NOT:
+                    x = 0 if a else 1
+                elif op == INV:
+                    x = ~a
+                elif op == CAST_C:
+                    x = _TO_CHAR(a)
+                elif op == CAST_I:
+                    x = _TO_INT(a)
+                elif op == CAST_F:
+                    x = _TO_FLOAT(a)
+                else:
+                    x = float(a)
+                r[code[pc + 3]] = x
+            elif op == LOAD:
+                data = r[code[pc + 1]]
+                k = r[code[pc + 2]]
+                if not 0 <= k < len(data):
+                    raise EvalError(f"index {k} out of bounds for '{self.names[code[pc + 1]]}[{len(data)}]'")
+                r[code[pc + 3]] = data[k]
+            elif op == STORE:
+                data = r[code[pc + 1]]
+                k = r[code[pc + 2]]
+                if not 0 <= k < len(data):
+                    raise EvalError(f"index {k} out of bounds for '{self.names[code[pc + 1]]}[{len(data)}]'")
+                data[k] = r[code[pc + 3]]
+            else:
+                r[code[pc + 3]] = [r[code[pc + 2]]] * code[pc + 1]
+            pc += 4
+        return r
+
+
+def _fits(k):
+    return isinstance(k, int) and _INT_MIN <= k <= _INT_MAX
+
+
+def _coalesce(quads, types):
+    # 临时变量算出来马上复制给变量（t = ...; v = t）时直接写到变量的寄存器里，省掉一条 MOVE
+    uses = {}
+    defs = {}
+    for q in quads:
+        for x in ir.uses(q):
+            uses[x] = uses.get(x, 0) + 1
+        x = ir.defines(q)
+        defs[x] = defs.get(x, 0) + 1
+    out = []
+    i = 0
+    while i < len(quads):
+        op, a, b, c = quads[i]
+        following = quads[i + 1] if i + 1 < len(quads) else None
+        if following is not None and following[0] == 'copy' and following[1] == c and ir.is_temp(c) \
+                and uses[c] == 1 and defs[c] == 1 and types.get(c) == types.get(following[3]):
+            out.append((op, a, b, following[3]))
+            i += 2
+            continue
+        out.append(quads[i])
+        i += 1
+    return out
+
+
+def compile_ir(code, superinstructions=True):
+    # 三地址码 -> 字节码；code 为 ir.IR
+    types = code.types
+    quads = _coalesce(code.code, types)
+    registers = []
+    names = []
+    index = {}
+
+    def reg(x):
+        key = x if isinstance(x, str) else (type(x), repr(x))
+        if key not in index:
+            index[key] = len(registers)
+            if isinstance(x, str) and x.startswith('"'):
+                registers.append(ir.string_data(x))
+            elif isinstance(x, str):
+                registers.append(evaluator.STORE[types[x]](0) if x in code.variables and x not in code.arrays else None)
+            else:
+                registers.append(x)
+            names.append(x)
+        return index[key]
+
+    for name in code.variables:
+        reg(name)
+    uses = {}
+    for q in quads:
+        for x in ir.uses(q):
+            if ir.is_temp(x):
+                uses[x] = uses.get(x, 0) + 1
+
+    words = array('i')
+    labels = {}
+    patches = []            # (words 中的位置, 标签)
+    fused = 0
+    i = 0
+    while i < len(quads):
+        op, a, b, c = quads[i]
+        i += 1
+        if op == 'label':
+            labels[c] = len(words)
+            continue
+        if op == 'goto':
+            patches.append((len(words) + 3, c))
+            words.extend((JUMP, 0, 0, 0))
+            continue
+        if op == 'iffalse':
+            patches.append((len(words) + 3, c))
+            words.extend((JUMPF, reg(a), 0, 0))
+            continue
+        if op in _COMPARE_OPS:
+            following = quads[i] if i < len(quads) else None
+            if superinstructions and following is not None and following[0] == 'iffalse' \
+                    and following[1] == c and ir.is_temp(c) and uses.get(c) == 1:
+                patches.append((len(words) + 3, following[3]))
+                words.extend((_BRANCH_OPS[op], reg(a), reg(b), 0))
+                fused += 1
+                i += 1
+                continue
+            words.extend((_COMPARE_OPS[op], reg(a), reg(b), reg(c)))
+            continue
+        ctype = types.get(c)
+        if op in ir.BINARY_OPS:
+            if ctype in ('int', 'char'):
+                if superinstructions and op in ('+', '*') and _fits(a) and not _fits(b):
+                    a, b = b, a
+                if superinstructions and op in ('+', '*') and _fits(b):
+                    words.extend((ADDK_I if op == '+' else MULK_I, reg(a), b, reg(c)))
+                    fused += 1
+                    continue
+                if superinstructions and op == '-' and _fits(b) and _fits(-b):
+                    words.extend((ADDK_I, reg(a), -b, reg(c)))
+                    fused += 1
+                    continue
+                opcode = _INT_OPS.get(op)
+            else:
+                opcode = (_FLOAT_OPS if ctype == 'float' else _DOUBLE_OPS).get(op)
+            if opcode is None:
+                raise EvalError(f"invalid operands to {op}: {ctype}")
+            words.extend((opcode, reg(a), reg(b), reg(c)))
+        elif op == 'copy':
+            words.extend((MOVE, reg(a), 0, reg(c)))
+        elif op == 'neg':
+            words.extend((NEG_I if ctype in ('int', 'char') else NEG, reg(a), 0, reg(c)))
+        elif op == 'not':
+            words.extend((NOT, reg(a), 0, reg(c)))
+        elif op == 'inv':
+            words.extend((INV, reg(a), 0, reg(c)))
+        elif op == 'cast':
+            words.extend((_CASTS[ctype], reg(a), 0, reg(c)))
+        elif op == 'load':
+            words.extend((LOAD, reg(a), reg(b), reg(c)))
+        elif op == 'store':
+            words.extend((STORE, reg(a), reg(b), reg(c)))
+        elif op == 'array':
+            words.extend((ARRAY, a, reg(b), reg(c)))
+        else:
+            raise EvalError(f"unknown operation {op}")
+    end = len(words)
+    for at, label in patches:
+        words[at] = labels.get(label, end)
+    variables = {name: index[name] for name in code.variables}
+    return Bytecode(words, registers, variables, names, fused)
+
+
+def compile_tree(tree, optimized=True, superinstructions=True):
+    code = ir.lower(tree)
+    if optimized:
+        code = ir.optimize(code)
+    return compile_ir(code, superinstructions)
+
+
+def compile_source(text, parser=None, optimized=True, superinstructions=True):
+    parser = parser or get_parser()
+    return compile_tree(parser.parse(text), optimized, superinstructions)
@@ -1,34 +1,8 @@
-def generate_ast_graph(node, graph=None):
+import graphviz
 
-    if graph is None:
-        graph = graphviz.Digraph(format='png')
+from gramma import generate_ast_graph, get_parser
 
-    node_id = str(id(node))
+# AST 图与 gramma 共用 astgraph 的流式 DOT 输出，这里只负责解析并打开渲染出的图片
 
-    if node.value is not None:
-        if isinstance(node.value, ASTNode):
-            value_id = str(id(node.value))
-            graph.node(value_id, label=f"{node.value.node_type}")
-            graph.edge(node_id, value_id)
-            generate_ast_graph(node.value, graph)
-        else:
-            graph.node(node_id, label=f"{node.node_type}\n{node.value}")
-    else:
-        graph.node(node_id, label=f"{node.node_type}")
-
-    for child in node.children:
-        if child is not None:
-            child_id = str(id(child))
-
-            if isinstance(child, ASTNode):
-                graph.edge(node_id, child_id)
-                generate_ast_graph(child, graph)
-            else:
-                graph.node(child_id, label=f"{child}")
-        else:
-            pass
-
-    return graph
-
-
-generate_ast_graph(result).view()
\ No newline at end of file
+result = get_parser().parse("int a=10, b=20, c; c=a<40? A+b,a-b;")
+graphviz.view(graphviz.render('dot', 'png', generate_ast_graph(result)))